@@ -0,0 +1,73 @@
+"""Compare BeautifulSoup parsing with the cached document model.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_docmodel --sections 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.docmodel import DocumentModel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100)
+    args = parser.parse_args()
+
+    html = make_document(sections=args.sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        html_file = Path(tmp) / "doc.html"
+        html_file.write_text(html, encoding="utf-8")
+        cache_file = Path(tmp) / "doc.docmodel"
+
+        soup, parse_time = _timed(lambda: BeautifulSoup(html, "html.parser"))
+        model, build_time = _timed(lambda: DocumentModel.from_soup(soup))
+        model.save(cache_file)
+        _, load_time = _timed(lambda: DocumentModel.load(cache_file))
+        soup_bytes = _retained(lambda: BeautifulSoup(html, "html.parser"))
+        model_bytes = _retained(lambda: DocumentModel.load(cache_file))
+
+        converter = HTMLtoTeXConverter(str(html_file), str(Path(tmp) / "doc.tex"))
+        logging.disable(logging.CRITICAL)
+        from_soup = converter.process_content(soup)
+        from_model = converter.process_content(model.root)
+
+    nodes = len(model)
+    print(f"nodes:              {nodes}")  # noqa: T201
+    print(f"bs4 parse:          {parse_time * 1000:8.1f} ms")  # noqa: T201
+    print(f"model build:        {build_time * 1000:8.1f} ms")  # noqa: T201
+    print(f"model cache load:   {load_time * 1000:8.1f} ms")  # noqa: T201
+    print(f"bs4 bytes/node:     {soup_bytes / nodes:8.0f}")  # noqa: T201
+    print(f"model bytes/node:   {model_bytes / nodes:8.0f}")  # noqa: T201
+    print(f"identical output:   {from_soup == from_model}")  # noqa: T201
+
+
+def _timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def _retained(func) -> int:
+    """Return the bytes still allocated by func's result."""
+    tracemalloc.start()
+    value = func()  # noqa: F841 - keep the result alive while measuring
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Cost of image metadata lookups: cold index, warm index and full decoding.
+
+Cold lookups hash each file and read its header; warm lookups, from a
+reloaded index, only stat the file. Decoding every image, as a
+measurement without header-only reads would, is shown for reference.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_image_index --images 200 --size 2400
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+from PIL import Image
+
+from src.utils.image_index import ImageIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--size", type=int, default=2400, help="Edge length in pixels")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.images):
+            path = Path(tmp) / f"img{i}.jpg"
+            Image.new("RGB", (args.size, args.size * 3 // 4), (i % 256, 80, 160)).save(path, quality=90)
+            paths.append(path)
+        index_file = Path(tmp) / "index.json"
+
+        cold = ImageIndex(index_file)
+        elapsed = _timed(lambda: [cold.lookup(p) for p in paths])
+        cold.save()
+        print(f"cold index   {elapsed * 1000 / args.images:8.3f} ms/image")  # noqa: T201
+
+        warm = ImageIndex(index_file)
+        elapsed = _timed(lambda: [warm.lookup(p) for p in paths])
+        print(f"warm index   {elapsed * 1000 / args.images:8.3f} ms/image")  # noqa: T201
+
+        elapsed = _timed(lambda: [_decode(p) for p in paths])
+        print(f"full decode  {elapsed * 1000 / args.images:8.3f} ms/image")  # noqa: T201
+
+
+def _decode(path: Path) -> None:
+    with Image.open(path) as img:
+        img.load()
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
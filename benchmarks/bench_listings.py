@@ -0,0 +1,69 @@
+"""Measure .tex size and build time with inline versus externalized listings.
+
+Run from the repository root (``--compile`` needs xelatex)::
+
+    python -m benchmarks.bench_listings --blocks 2000 --distinct 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import tempfile
+import time
+
+from src.enhanced_converter import HTMLtoTeXConverter
+
+CODE_LINE = "    result = compute(value_{n}, factor={n}) if value_{n} > threshold else fallback({n})\n"
+
+
+def make_document(blocks: int, distinct: int, lines: int) -> str:
+    """Build a document with many large, partly repeated code blocks."""
+    parts = ["<html><body><h1>Listings</h1>"]
+    for i in range(blocks):
+        code = "".join(CODE_LINE.format(n=i % distinct) for _ in range(lines))
+        parts.append(f"<p>Sample {i}</p><pre><code class='language-python'>{code}</code></pre>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def run(html: str, externalize: bool, compile_pdf: bool) -> tuple[int, float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        html_file = Path(tmp) / "doc.html"
+        html_file.write_text(html, encoding="utf-8")
+        converter = HTMLtoTeXConverter(str(html_file), str(Path(tmp) / "doc.tex"))
+        converter.externalize_listings = externalize
+
+        start = time.perf_counter()
+        converter.save_tex_file(converter.process_content(converter.load_document()))
+        generate = time.perf_counter() - start
+
+        compile_time = 0.0
+        if compile_pdf:
+            start = time.perf_counter()
+            converter.compile_pdf()
+            compile_time = time.perf_counter() - start
+        return converter.tex_file.stat().st_size, generate, compile_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--compile", action="store_true", help="Also time xelatex")
+    args = parser.parse_args()
+
+    html = make_document(args.blocks, args.distinct, args.lines)
+    logging.disable(logging.CRITICAL)
+    for label, externalize in (("inline", False), ("externalized", True)):
+        size, generate, compile_time = run(html, externalize, args.compile)
+        line = f"{label:13} .tex {size / 1024:9.0f} KiB  generate {generate * 1000:8.1f} ms"
+        if args.compile:
+            line += f"  compile {compile_time:7.1f} s"
+        print(line)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure logging overhead of a body conversion at INFO versus DEBUG.
+
+Each level is timed with the queue pipeline and, for comparison, with
+synchronous file and stream handlers. Console output goes to a null
+stream so terminal speed does not skew the numbers.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_logging --sections 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.log_pipeline import FORMAT, configure_logging, log_to_file, stop_logging
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = make_document(sections=args.sections)
+    soup = BeautifulSoup(html, "html.parser")
+    print(f"document: {len(html) / 1024:.0f} KiB, {args.sections} sections")  # noqa: T201
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w", encoding="utf-8") as null:
+        html_file = Path(tmp) / "doc.html"
+        html_file.write_text(html, encoding="utf-8")
+        tex_file = Path(tmp) / "doc.tex"
+        converter = HTMLtoTeXConverter(str(html_file), str(tex_file), log_level=None)
+
+        results: dict[tuple[str, str], float] = {}
+        for level in ("INFO", "DEBUG"):
+            configure_logging(level, stream=null)
+            with log_to_file(tex_file.with_suffix(f".{level}.log"), level):
+                results["queue", level] = _best(converter, soup, args.repeat)
+            stop_logging()
+
+            root = logging.getLogger()
+            handlers = [logging.FileHandler(tex_file.with_suffix(f".{level}.sync.log")), logging.StreamHandler(null)]
+            for handler in handlers:
+                handler.setFormatter(logging.Formatter(FORMAT))
+                root.addHandler(handler)
+            results["sync", level] = _best(converter, soup, args.repeat)
+            for handler in handlers:
+                root.removeHandler(handler)
+                handler.close()
+
+    base = results["queue", "INFO"]
+    for (mode, level), elapsed in results.items():
+        print(f"{mode:5} {level:5}  {elapsed * 1000:8.1f} ms  ({elapsed / base:5.2f}x queue INFO)")  # noqa: T201
+
+
+def _best(converter: HTMLtoTeXConverter, soup: BeautifulSoup, repeat: int) -> float:
+    """Return the fastest of repeat conversions."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.process_content(soup)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    main()
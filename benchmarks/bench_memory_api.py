@@ -0,0 +1,62 @@
+"""Throughput of in-memory conversion for small documents.
+
+The file-based path (write the HTML, build a converter with its logging
+pipeline, parse, convert, save the TeX) is timed on the same documents for
+reference. Thread counts above one show how calls on a shared
+MemoryConverter overlap; with the GIL the gain is bounded by the time
+spent outside Python bytecode.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_memory_api --documents 500 --threads 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import tempfile
+import time
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.memory_api import MemoryConverter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=5)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    html = make_document(sections=1, paragraphs=args.paragraphs)
+    print(f"document: {len(html.encode()) / 1024:.1f} KiB, {args.documents} conversions")  # noqa: T201
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = _timed(lambda: [_convert_files(Path(tmp), html, i) for i in range(args.documents)])
+        print(f"file-based        {args.documents / elapsed:8.0f} docs/s")  # noqa: T201
+
+    converter = MemoryConverter()
+    for threads in args.threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            elapsed = _timed(lambda: list(pool.map(converter.convert, [html] * args.documents)))
+        print(f"in-memory {threads:2d} thr  {args.documents / elapsed:8.0f} docs/s")  # noqa: T201
+
+
+def _convert_files(directory: Path, html: str, index: int) -> None:
+    html_file = directory / f"doc{index}.html"
+    html_file.write_text(html, encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(html_file), str(html_file.with_suffix(".tex")), log_level="CRITICAL")
+    converter.save_tex_file(converter.process_content(converter.read_html_file()))
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Scaling of parallel body conversion from 1 to N worker processes.
+
+Every parallel run is checked to be byte-identical to the serial output.
+Timings include starting the pool and loading the document model in each
+worker, but not parsing the HTML.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parallel_convert --sections 400 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *(2**i for i in range(1, cpus.bit_length())), cpus})
+
+    html = make_document(sections=args.sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        html_file = Path(tmp) / "doc.html"
+        html_file.write_text(html, encoding="utf-8")
+        print(f"document: {len(html) / 1024:.0f} KiB, {args.sections} sections, {cpus} CPUs")  # noqa: T201
+
+        baseline, serial = _run(html_file, 1)
+        print(f"serial     {serial:7.2f} s")  # noqa: T201
+        for count in workers:
+            if count == 1:
+                continue
+            output, elapsed = _run(html_file, count)
+            status = "identical" if output == baseline else "DIFFERENT"
+            print(f"{count:2d} workers {elapsed:7.2f} s  speedup {serial / elapsed:5.2f}x  {status}")  # noqa: T201
+
+
+def _run(html_file: Path, workers: int) -> tuple[str, float]:
+    converter = HTMLtoTeXConverter(str(html_file), str(html_file.with_suffix(".tex")), log_level="CRITICAL")
+    converter.parallel_convert = workers > 1
+    converter.max_workers = workers
+    document = converter.load_document()
+    start = time.perf_counter()
+    output = converter.process_content(document)
+    return output, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
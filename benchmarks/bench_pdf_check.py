@@ -0,0 +1,62 @@
+"""Time structural PDF validation on multi-gigabyte files.
+
+The files are generated with sparse padding, so they take little disk
+space while still being their full size to the validator. pypdf opening
+the same file and counting pages is shown for reference when installed.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_pdf_check --size-gb 1 4 --pages 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+from benchmarks.corpus import make_pdf
+from src.utils.pdf_check import check_pdf
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # Optional: reference timing only
+    PdfReader = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-gb", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.size_gb:
+            for xref_stream in (False, True):
+                path = Path(tmp) / "big.pdf"
+                make_pdf(path, pages=args.pages, padding=int(size * 2**30), xref_stream=xref_stream)
+                report = check_pdf(path, expected_pages=args.pages, required_fonts=["Amiri"])
+                assert report.ok, report.errors
+
+                elapsed = min(
+                    _timed(lambda path=path: check_pdf(path, args.pages, ["Amiri"])) for _ in range(args.repeat)
+                )
+                kind = "xref stream" if xref_stream else "xref table "
+                line = f"{size:5.1f} GB  {kind}  check_pdf {elapsed * 1000:7.2f} ms"
+                if PdfReader is not None:
+                    reference = _timed(lambda path=path: len(PdfReader(path).pages))
+                    line += f"   pypdf page count {reference * 1000:8.1f} ms"
+                print(line)  # noqa: T201
+                path.unlink()
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
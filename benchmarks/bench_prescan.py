@@ -0,0 +1,53 @@
+"""Compare the feature pre-scan against a full body conversion.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_prescan --sections 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.features import scan_features
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = make_document(sections=args.sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        html_file = Path(tmp) / "doc.html"
+        html_file.write_text(html, encoding="utf-8")
+        converter = HTMLtoTeXConverter(str(html_file), str(Path(tmp) / "doc.tex"))
+        logging.disable(logging.CRITICAL)
+        soup = BeautifulSoup(html, "html.parser")
+
+        scan = min(_timed(lambda: scan_features(soup)) for _ in range(args.repeat))
+        full = min(_timed(lambda: converter.process_content(soup)) for _ in range(args.repeat))
+
+    print(f"document: {len(html) / 1024:.0f} KiB, {args.sections} sections")  # noqa: T201
+    print(f"pre-scan:        {scan * 1000:8.1f} ms")  # noqa: T201
+    print(f"full conversion: {full * 1000:8.1f} ms")  # noqa: T201
+    print(f"pre-scan share:  {scan / full:8.1%}")  # noqa: T201
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare single-process and split parallel compilation of a TeX file.
+
+Requires xelatex and pypdf. Run from the repository root::
+
+    python -m benchmarks.bench_split_compile path/to/book.tex --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from src.enhanced_converter import HTMLtoTeXConverter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tex_file", type=Path)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tex_file = Path(tmp) / args.tex_file.name
+        shutil.copy2(args.tex_file, tex_file)
+        converter = HTMLtoTeXConverter(str(tex_file.with_suffix(".html")), str(tex_file))
+        converter.max_workers = args.workers
+
+        start = time.perf_counter()
+        converter.compile_pdf()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        converter.compile_pdf_split()
+        split = time.perf_counter() - start
+
+    print(f"single-process: {single:8.1f} s")  # noqa: T201
+    print(f"split x{args.workers}:      {split:8.1f} s")  # noqa: T201
+    print(f"speedup:        {single / split:8.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark TomlFixer list normalization on large generated TOML files.
+
+Compares the structural-hash engine with the previous serialize-per-element
+approach (reproduced below). The previous approach is quadratic in tomlkit
+array appends, so it only runs up to --legacy-max entries.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_toml_normalize --entries 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Mapping
+import time
+from typing import Any, cast
+
+from tomlkit import array, dumps, parse, table
+from tomlkit.items import Array, Item, Table
+
+from toml_fixer import TomlFixer
+
+
+def make_toml(entries: int) -> str:
+    """Build TOML with large scalar, inline-table and table arrays, half duplicates."""
+    distinct = max(entries // 2, 1)
+    scalars = ", ".join(f'"value-{i % distinct}"' for i in range(entries))
+    inline = ", ".join(f'{{name = "dep-{i % distinct}", version = "1.{i % 7}"}}' for i in range(entries // 2))
+    tables = "".join(
+        f'[[package]]\nname = "pkg-{i % (distinct // 10 or 1)}"\nversion = "2.0"\n' for i in range(entries // 10)
+    )
+    return f"[tool.matrix]\nvalues = [{scalars}]\ndeps = [{inline}]\n\n{tables}"
+
+
+def legacy_normalize(doc: Any) -> None:
+    """Previous _normalize_lists and _sort_keys_recursive, applied to every top-level value."""
+
+    def process_item(item: Item) -> Item:
+        if isinstance(item, Table):
+            new_table = table()
+            for k in sorted(item.keys()):
+                new_table[k] = process_item(item[k])
+            return new_table
+        if isinstance(item, Array):
+            seen: set[str] = set()
+            new_array = array()
+            for element in item:
+                processed = process_item(element)
+                key = dumps(cast(Mapping[str, Any], processed), sort_keys=True)
+                if key not in seen:
+                    seen.add(key)
+                    new_array.append(processed)
+            return new_array
+        return item
+
+    def sort_keys(node: Item) -> None:
+        if isinstance(node, Table):
+            for key in sorted(node.keys()):
+                sort_keys(node[key])
+                node[key] = node.pop(key)
+        elif isinstance(node, Array):
+            for item in node:
+                sort_keys(item)
+
+    for key in list(doc.keys()):
+        doc[key] = process_item(doc[key])
+        sort_keys(doc[key])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for entries in args.entries:
+        source = make_toml(entries)
+
+        fixer = TomlFixer("bench.toml")
+        fixer.doc = parse(source)
+        start = time.perf_counter()
+        fixer._normalize_lists()  # noqa: SLF001
+        engine = time.perf_counter() - start
+        line = f"{entries:>8} entries  engine {engine:8.2f} s"
+
+        if entries <= args.legacy_max:
+            doc = parse(source)
+            start = time.perf_counter()
+            legacy_normalize(doc)
+            legacy = time.perf_counter() - start
+            line += f"  legacy {legacy:8.2f} s  speedup {legacy / engine:6.1f}x"
+        print(line)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Synthetic HTML documents for benchmarks."""
+
+from __future__ import annotations
+
+PARAGRAPH = (
+    "<p>هذا نص عربي للتجربة مع <strong>تأكيد</strong> و <em>ميل</em> "
+    'and some English with a <a href="https://example.com">link</a>.</p>'
+)
+CODE_BLOCK = '<pre><code class="language-python">def f(x):\n    return x * {n}\n</code></pre>'
+LIST_BLOCK = "<ul><li>أول</li><li>second</li><li>ثالث</li></ul>"
+
+
+def make_document(sections: int = 50, paragraphs: int = 20) -> str:
+    """Build an HTML document with headings, paragraphs, lists and code."""
+    parts = ["<html><body>"]
+    for i in range(sections):
+        parts.append(f"<h1>الفصل {i}</h1>")
+        for j in range(paragraphs):
+            parts.append(PARAGRAPH)
+            if j % 5 == 0:
+                parts.append(CODE_BLOCK.format(n=j))
+            if j % 7 == 0:
+                parts.append(LIST_BLOCK)
+        parts.append('<p class="highlighted">ملاحظة مهمة</p>')
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def make_pdf(
+    path,
+    pages: int = 3,
+    font: str = "ABCDEF+Amiri-Regular",
+    padding: int = 0,
+    xref_stream: bool = False,
+) -> None:
+    """Write a minimal PDF with a flat page tree and one font.
+
+    padding adds a stream of that many zero bytes, written sparsely, to
+    stand in for large embedded images. With xref_stream the page objects
+    go into a compressed object stream and the cross-reference section is a
+    PNG-predicted xref stream, as PDF 1.5 writers produce.
+    """
+    import zlib
+
+    first_page = 5
+    objects: dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            b"<< /Type /Pages /Count %d /Kids [%s] /Resources << /Font << /F1 3 0 R >> >> >>"
+            % (pages, b" ".join(b"%d 0 R" % (first_page + i) for i in range(pages)))
+        ),
+        3: b"<< /Type /Font /Subtype /Type0 /BaseFont /%s /Encoding /Identity-H >>" % font.encode(),
+    }
+    for i in range(pages):
+        objects[first_page + i] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>"
+    stream_num = first_page + pages
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+        offsets: dict[int, tuple[int, int, int]] = {}
+
+        def write_object(num: int, body: bytes) -> None:
+            offsets[num] = (1, f.tell(), 0)
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+
+        offsets[4] = (1, f.tell(), 0)
+        f.write(b"4 0 obj\n<< /Length %d >>\nstream\n" % padding)
+        f.seek(padding, 1)  # leaves a hole: zero bytes without writing them
+        f.write(b"\nendstream\nendobj\n")
+
+        if not xref_stream:
+            for num, body in objects.items():
+                write_object(num, body)
+            size = stream_num
+            start = f.tell()
+            f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+            for num in range(1, size):
+                f.write(b"%010d 00000 n \n" % offsets[num][1])
+            f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, start))
+            return
+
+        packed = list(objects.items())
+        header, body = [], b""
+        for index, (num, data) in enumerate(packed):
+            header.append(b"%d %d" % (num, len(body)))
+            offsets[num] = (2, stream_num, index)
+            body += data + b"\n"
+        head = b" ".join(header) + b"\n"
+        content = zlib.compress(head + body)
+        offsets[stream_num] = (1, f.tell(), 0)
+        f.write(
+            b"%d 0 obj\n<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n"
+            % (stream_num, len(packed), len(head), len(content)),
+        )
+        f.write(content + b"\nendstream\nendobj\n")
+
+        xref_num = stream_num + 1
+        offsets[xref_num] = (1, f.tell(), 0)
+        rows, previous = b"", bytes(8)
+        for num in range(xref_num + 1):
+            kind, f2, f3 = offsets.get(num, (0, 0, 0))
+            row = bytes([kind]) + f2.to_bytes(5, "big") + f3.to_bytes(2, "big")
+            rows += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))
+            previous = row
+        data = zlib.compress(rows)
+        f.write(
+            b"%d 0 obj\n<< /Type /XRef /Size %d /Root 1 0 R /W [1 5 2] /Filter /FlateDecode "
+            b"/DecodeParms << /Columns 8 /Predictor 12 >> /Length %d >>\nstream\n"
+            % (xref_num, xref_num + 1, len(data)),
+        )
+        f.write(data + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % offsets[xref_num][1])
@@ -0,0 +1,262 @@
+"""Load-test concurrent conversions and report throughput, latency percentiles, CPU and memory.
+
+Each job converts one generated document in its own directory, running
+the selected pipeline stages one at a time so every stage gets its own
+latency distribution. Jobs run in a pool of worker processes, one per
+concurrent conversion, as they would on a conversion host.
+
+By default xelatex is replaced with a stub that sleeps (or, with
+--stub-busy, spins the CPU) for a time that grows with the TeX size and
+writes a small valid PDF, so the harness runs anywhere and compile timing
+is reproducible. --real-xelatex uses whatever xelatex is on PATH.
+
+The report is JSON, on stdout or in --output, so runs on different
+revisions can be compared with a script. Run from the repository root::
+
+    python -m benchmarks.loadtest --documents 200 --concurrency 1 4 8 --output load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import random
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from PIL import Image
+
+from benchmarks.corpus import make_document
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.stages import STAGES
+
+try:
+    import resource
+except ImportError:  # Windows: CPU and memory figures are omitted
+    resource = None
+
+REPORT_VERSION = 1
+REPO = Path(__file__).resolve().parent.parent
+
+# Per-worker directory jobs are created in, set by the pool initializer.
+_run_dir: Path | None = None
+
+STUB_XELATEX = """\
+import os, sys, time
+sys.path.insert(0, {repo!r})
+from benchmarks.corpus import make_pdf
+out = next(a.split("=", 1)[1] for a in sys.argv if a.startswith("-output-directory="))
+source = sys.argv[-1]
+kib = os.path.getsize(source) / 1024
+deadline = time.monotonic() + {base} + {per_kib} * kib
+if {busy}:
+    while time.monotonic() < deadline:
+        pass
+else:
+    time.sleep(max(0.0, deadline - time.monotonic()))
+stem = os.path.splitext(os.path.basename(source))[0]
+make_pdf(os.path.join(out, stem + ".pdf"), pages=max(1, int(kib // 3)))
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """One conversion to run in a worker.
+
+    Attributes:
+        index: Position in the corpus
+        sections: Sections in the generated document
+        paragraphs: Paragraphs per section
+        images: Images referenced by the document
+        stages: Pipeline stages to run, in order
+        stub: Whether xelatex is the timing stub
+
+    """
+
+    index: int
+    sections: int
+    paragraphs: int
+    images: int
+    stages: tuple[str, ...]
+    stub: bool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--sections", type=int, nargs=2, default=[1, 20], metavar=("MIN", "MAX"))
+    parser.add_argument("--paragraphs", type=int, default=10)
+    parser.add_argument("--images", type=int, default=2, help="Images per document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--real-xelatex", action="store_true", help="Compile with the xelatex on PATH")
+    parser.add_argument("--stub-base", type=float, default=0.2, help="Stub seconds per run")
+    parser.add_argument("--stub-per-kib", type=float, default=0.002, help="Stub seconds per KiB of TeX")
+    parser.add_argument("--stub-busy", action="store_true", help="Stub burns CPU instead of sleeping")
+    parser.add_argument("--work-dir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [
+        Job(i, rng.randint(*args.sections), args.paragraphs, args.images, tuple(args.stages), not args.real_xelatex)
+        for i in range(args.documents)
+    ]
+    report: dict[str, Any] = {
+        "report_version": REPORT_VERSION,
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="h2t-load-", dir=args.work_dir) as tmp:
+        env = dict(os.environ)
+        if not args.real_xelatex:
+            bin_dir = Path(tmp) / "bin"
+            bin_dir.mkdir()
+            stub = bin_dir / "xelatex"
+            script = STUB_XELATEX.format(
+                repo=str(REPO), base=args.stub_base, per_kib=args.stub_per_kib, busy=args.stub_busy
+            )
+            stub.write_text(f"#!{sys.executable}\n{script}", encoding="utf-8")
+            stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+            env["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+
+        for concurrency in args.concurrency:
+            run_dir = Path(tmp) / f"c{concurrency}"
+            run_dir.mkdir()
+            report["runs"].append(_run(jobs, concurrency, run_dir, env))
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)  # noqa: T201
+
+
+def _run(jobs: list[Job], concurrency: int, run_dir: Path, env: dict[str, str]) -> dict[str, Any]:
+    """Run every job with concurrency workers and summarize the results."""
+    cpu_before = _cpu_seconds() if resource is not None else 0.0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker, initargs=(str(run_dir), env)) as pool:
+        results = list(pool.map(_run_job, jobs))
+    wall = time.perf_counter() - start
+    cpu = _cpu_seconds() - cpu_before if resource is not None else None
+
+    succeeded = [r for r in results if r["ok"]]
+    stages = [stage for stage in STAGES if stage in jobs[0].stages] if jobs else []
+    latency = {stage: _summary([r["stages"][stage] for r in succeeded]) for stage in stages}
+    latency["total"] = _summary([r["total"] for r in succeeded])
+    peak = max((r["max_rss"] for r in results if r["max_rss"] is not None), default=None)
+    return {
+        "concurrency": concurrency,
+        "documents": len(jobs),
+        "failures": len(results) - len(succeeded),
+        "wall_seconds": round(wall, 3),
+        "throughput_docs_per_second": round(len(succeeded) / wall, 3) if wall else None,
+        "latency_ms": latency,
+        "cpu_seconds": round(cpu, 3) if cpu is not None else None,
+        "cpu_utilization": round(cpu / (wall * (os.cpu_count() or 1)), 3) if cpu is not None and wall else None,
+        "peak_worker_rss_mib": round(peak / 2**20, 1) if peak is not None else None,
+    }
+
+
+def _summary(seconds: list[float]) -> dict[str, float | None]:
+    """Return p50/p95/p99, mean and max in milliseconds."""
+    values = sorted(seconds)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50) * 1000, 2),
+        "p95": round(percentile(values, 95) * 1000, 2),
+        "p99": round(percentile(values, 99) * 1000, 2),
+        "mean": round(sum(values) / len(values) * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Return the nearest-rank q-th percentile of an ascending list."""
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _init_worker(run_dir: str, env: dict[str, str]) -> None:
+    """Point the worker at the run directory and the chosen xelatex, and mute converter logging."""
+    global _run_dir  # noqa: PLW0603
+
+    os.environ.clear()
+    os.environ.update(env)
+    _run_dir = Path(run_dir)
+    # Jobs pass log_level=None; a null handler keeps records off the last-resort stderr handler.
+    logging.getLogger().addHandler(logging.NullHandler())
+
+
+def _run_job(job: Job) -> dict[str, Any]:
+    """Generate one document, run its stages and return the timings."""
+    work = _run_dir / f"doc{job.index}"
+    work.mkdir()
+    html = make_document(sections=job.sections, paragraphs=job.paragraphs)
+    images = []
+    for n in range(job.images):
+        Image.new("RGB", (320, 240), (n * 40 % 256, 90, 160)).save(work / f"img{n}.png")
+        images.append(f'<img src="img{n}.png">')
+    html_file = work / "doc.html"
+    html_file.write_text(html.replace("</body>", "".join(images) + "</body>"), encoding="utf-8")
+
+    converter = HTMLtoTeXConverter(str(html_file), str(work / "out" / "doc.tex"), log_level=None)
+    converter.tex_file.parent.mkdir()
+    if job.stub:
+        # The stub has no fonts or packages to probe.
+        converter.check_system_requirements = lambda: True
+
+    timings: dict[str, float] = {}
+    ok = True
+    for stage in job.stages:
+        start = time.perf_counter()
+        ok = converter.run_stages([stage])
+        timings[stage] = time.perf_counter() - start
+        if not ok:
+            break
+
+    shutil.rmtree(work, ignore_errors=True)
+    max_rss = None
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        max_rss *= 1 if sys.platform == "darwin" else 1024
+    return {"ok": ok, "stages": timings, "total": sum(timings.values()), "max_rss": max_rss}
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and its reaped children (pool workers and xelatex)."""
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+
+def _revision() -> str | None:
+    """Return the git commit being measured, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,58 @@
 from __future__ import annotations
 
 import argparse
-import fnmatch
+import asyncio
+import contextlib
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
+import signal
+import subprocess
 import sys
 import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from queue import Queue
 from subprocess import CompletedProcess, run
-from threading import Timer
 from typing import Any, cast
 
 # Third-party libraries
 import requests
 import yaml
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup
 from PIL import Image
 from retrying import retry
 
+from src.utils.assets import AssetIngestor
+from src.utils.docmodel import DocumentModel, Node
+from src.utils.emoji_sheet import EmojiSheet, emoji_key
+from src.utils.features import EMOJI_PATTERN, scan_features
+from src.utils.image_index import MAX_IMAGE_DIMENSION, ImageIndex, ImageInfo
+from src.utils.incremental import (
+    IncrementalStats,
+    SectionCache,
+    SectionFragment,
+    flatten_units,
+    section_digest,
+    split_sections,
+)
+from src.utils.listings import ListingStore
+from src.utils.log_pipeline import attach_log_file, configure_logging, log_to_file
+from src.utils.parallel import CHUNKS_PER_WORKER, balanced_ranges
+from src.utils.pdf_check import check_pdf
+from src.utils.process import run_process_tree, run_watched
+from src.utils.progress import PAGE_PATTERN, CancelToken, ConversionCancelled, ProgressCallback, ProgressEvent
+from src.utils.requirements_probe import RequirementsProbe
+from src.utils.sandbox import MIN_RESERVE, BuildSandbox
+from src.utils.split_compile import SECTION_MARKER, SplitCompiler
+from src.utils.stages import STAGES, StageManifest, file_digest
+
+NODE_CHECK_INTERVAL = 64  # Nodes converted between cancellation checks
+
 # Windows-specific handling
 if sys.platform == "win32":
     try:
@@ -51,8 +83,10 @@ def get_issues() -> dict[str, list[Any]]:
 
 
 # Example YAML loading
-with open("config.yaml") as file:
-    config = cast(dict[str, Any], yaml.safe_load(file))
+config: dict[str, Any] = {}
+if Path("config.yaml").exists():
+    with open("config.yaml") as file:
+        config = cast(dict[str, Any], yaml.safe_load(file) or {})
 
 # Example subprocess usage
 result: CompletedProcess[str] = run(
@@ -73,15 +107,19 @@ class HTMLtoTeXConverter:
 
     """
 
-    def __init__(self, html_file: str, tex_file: str) -> None:
+    def __init__(self, html_file: str, tex_file: str, log_level: int | str | None = logging.INFO) -> None:
         self.html_file = Path(html_file)
         self.tex_file = Path(tex_file)
         self.memory_limit = 1024 * 1024 * 1024  # Default 1GB
-        self.setup_logging()
+        self.setup_logging(log_level)
         self.list_depth = 0
         self.table_column_widths: dict[str, int] = {}
         self.image_paths: list[Path] = []
         self.image_cache: dict[str, Path] = {}
+        self.assets = AssetIngestor(self.tex_file.parent / "images")
+        self.image_index = ImageIndex()  # Header metadata of images, shared between runs
+        self.image_info: dict[str, ImageInfo | None] = {}
+        self.reencode_images: dict[Path, list[str]] = {}  # Images that should be re-encoded, with reasons
         self.required_packages = {
             "listings": False,
             "soul": False,
@@ -93,120 +131,315 @@ class HTMLtoTeXConverter:
             "tikz": False,
             "mdframed": False,
         }
+        self.listing_languages: set[str] = set()
         self.image_compression = 85
         self.processing_queue: Queue[str] = Queue()
         self.max_workers = 4
-        self.temp_dir = Path(tempfile.mkdtemp())
         self.max_compile_time = 300  # 5 minutes timeout
         self.max_retries = 3
         self.intermediate_cleanup = True
+        self.requirements_probe = RequirementsProbe()
+        self.split_compile = False  # Compile top-level sections in parallel
+        self.document_cache = False  # Keep the parsed document beside the TeX file
+        self.incremental = False  # Reuse TeX of sections unchanged since the last run
+        self.parallel_convert = False  # Convert top-level body units in max_workers processes
+        self.externalize_listings = False  # Reference code blocks from side files
+        self.listing_inline_limit = 0  # Blocks up to this many bytes stay inline
+        self.listings = ListingStore(self.tex_file.parent / "listings")
+        self.listing_log: list[str] = []  # Code of each externalized block, in document order
+        self.emoji_backend = "images"  # "images": one PNG per emoji, "sheet": one multi-page PDF
+        self.emoji_sheet = EmojiSheet(self.tex_file.parent / "images" / "emoji-sheet.pdf", "images/emoji-sheet.pdf")
+        self.incremental_stats = IncrementalStats()
+        self.expected_pages: int | None = None  # Page count validate_output requires, if known
+        self.required_fonts = ["Amiri"]  # Fonts validate_output requires in the PDF
+        self.sandbox = True  # Compile in a private scratch directory, on tmpfs when possible
+        self.scratch_dir: Path | None = None  # Where sandboxes are created; None picks /dev/shm or TMPDIR
+        self.progress: ProgressCallback | None = None  # Receives a ProgressEvent as each stage advances
+        self.cancel_token = CancelToken()  # Set from any thread to stop the conversion
+        self._nodes_total = 0
+        self._nodes_done = 0
+        self._next_node_check = 0
+        self._next_node_report = 0
 
         # Windows-specific initialization
         if sys.platform == "win32":
             self._set_windows_memory_limit()
 
-    def setup_logging(self) -> None:
-        """Enhanced logging setup with both file and console output."""
-        log_file = self.tex_file.with_suffix(".conversion.log")
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler(log_file, encoding="utf-8"),
-                logging.StreamHandler(sys.stdout),
-            ],
-        )
+    def setup_logging(self, level: int | str | None = logging.INFO) -> None:
+        """Log to console through a queue drained by a background thread.
+
+        The console pipeline is process-wide and set up only once. While
+        convert(), convert_async() or run_stages() runs, records at level and
+        above also go to a log file beside the TeX file. With level None the
+        process-wide logging setup is left to the caller.
+        """
+        self.log_level = level
+        self.log_file = self.tex_file.with_suffix(".conversion.log")
+        if level is not None:
+            configure_logging(level)
         self.logger = logging.getLogger(__name__)
 
+    def _logging_to_file(self) -> contextlib.AbstractContextManager[None]:
+        """Write the log file for the duration of a run, unless logging is left to the caller."""
+        if self.log_level is None:
+            return contextlib.nullcontext()
+        self.tex_file.parent.mkdir(parents=True, exist_ok=True)
+        return log_to_file(self.log_file, self.log_level)
+
+    def _report(self, stage: str, done: int, total: int | None = None, attempt: int = 0, detail: str = "") -> None:
+        """Pass a progress event to the callback, if one is set."""
+        if self.progress is not None:
+            self.progress(ProgressEvent(stage, done, total, attempt, detail))
+
+    def _node_checkpoint(self) -> None:
+        """Check for cancellation every NODE_CHECK_INTERVAL nodes and report progress about every 1%."""
+        self.cancel_token.raise_if_cancelled()
+        self._next_node_check = self._nodes_done + NODE_CHECK_INTERVAL
+        if self._nodes_done >= self._next_node_report:
+            self._next_node_report = self._nodes_done + max(1, self._nodes_total // 100)
+            self._report("convert", min(self._nodes_done, self._nodes_total), self._nodes_total)
+
     def read_html_file(self) -> BeautifulSoup:
         """Read and parse the HTML file."""
         with open(self.html_file, encoding="utf-8") as f:
             html_content = f.read()
         return BeautifulSoup(html_content, "html.parser")
 
-    def process_content(self, soup: BeautifulSoup) -> str:
+    def load_document(self) -> Node:
+        """Return the compact document model, reusing the cache if the HTML is unchanged."""
+        digest = hashlib.sha256(self.html_file.read_bytes()).hexdigest()
+        cache_file = self.tex_file.with_suffix(".docmodel")
+
+        if self.document_cache:
+            model = DocumentModel.load(cache_file, digest)
+            if model is not None:
+                self.logger.info("Reusing parsed document from %s", cache_file)
+                return model.root
+
+        model = DocumentModel.from_soup(self.read_html_file(), source_hash=digest)
+        if self.document_cache:
+            try:
+                model.save(cache_file)
+            except OSError as e:
+                self.logger.warning("Document cache write failed: %s", e)
+        return model.root
+
+    def process_content(self, soup: BeautifulSoup | Node) -> str:
         """Process the HTML content and convert to LaTeX."""
-        header = self.create_tex_header()
-        body_content = self.convert_tag_to_tex(soup)
-        footer = r"\end{document}"
-        return header + "\n" + body_content + "\n" + footer
+        return "".join(self.iter_content(soup))
+
+    def iter_content(self, soup: BeautifulSoup | Node) -> Iterator[str]:
+        """Yield the final preamble first, then the body piece by piece."""
+        self.prescan_features(soup)
+        yield self.create_tex_header() + "\n"
+        if self.incremental:
+            yield from self._iter_sections_incremental(soup)
+        elif self.parallel_convert and self.max_workers > 1:
+            yield from self._iter_parallel(soup)
+        else:
+            for unit in flatten_units(soup):
+                yield self._convert_unit(unit)
+        # Converters that render a subtree in one go skip its nodes in the count.
+        self._nodes_done = self._nodes_total
+        self._report("convert", self._nodes_total, self._nodes_total)
+        yield "\n" + r"\end{document}"
+
+    def _convert_unit(self, unit: Any) -> str:
+        """Convert a top-level body unit, marking where top-level sections start for split compilation."""
+        tex = self.convert_tag_to_tex(unit)
+        if getattr(unit, "name", None) == "h1" and tex:
+            return SECTION_MARKER + tex
+        return tex
+
+    def _render_options_key(self) -> str:
+        """Return a key for settings that change how sections render."""
+        options = {
+            "converter": 3,
+            "externalize_listings": self.externalize_listings,
+            "listing_inline_limit": self.listing_inline_limit,
+            "emoji_backend": self.emoji_backend,
+        }
+        return json.dumps(options, sort_keys=True)
+
+    def _image_stamp(self, src: str) -> str:
+        """Return size and mtime of a local image so edits invalidate its section."""
+        if src.startswith(("http://", "https://")):
+            return src
+        path = Path(src)
+        if not path.is_absolute():
+            path = self.html_file.parent / path
+        try:
+            stat = path.stat()
+        except OSError:
+            return f"{src}:missing"
+        return f"{src}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _iter_sections_incremental(self, soup: BeautifulSoup | Node) -> Iterator[str]:
+        """Yield section TeX, reusing fragments whose section hash is unchanged."""
+        cache = SectionCache(self.tex_file.with_suffix(".sections.json"), self._render_options_key())
+        stats = IncrementalStats()
+
+        for units in split_sections(soup):
+            digest = section_digest(units, self._image_stamp)
+            fragment = cache.get(digest)
+            if fragment is not None:
+                stats.reused += 1
+                for name in fragment.packages:
+                    self.required_packages[name] = True
+                for src, path in fragment.images:
+                    if src in self.image_cache:
+                        continue
+                    try:
+                        self._ingest_image(src, Path(path))
+                    except OSError as e:
+                        self.logger.error("Failed to place image %s: %s", src, e)
+                for code in fragment.listings:
+                    # Writes the side file only if it is missing.
+                    self.listings.store(code)
+            else:
+                stats.rebuilt += 1
+                fragment = self._convert_section(digest, units)
+            cache.add(fragment)
+            yield fragment.tex
+
+        try:
+            cache.save()
+        except OSError as e:
+            self.logger.warning("Section cache write failed: %s", e)
+        self.incremental_stats = stats
+        self.logger.info("Incremental conversion: %s sections reused, %s rebuilt", stats.reused, stats.rebuilt)
+
+    def _iter_parallel(self, soup: BeautifulSoup | Node) -> Iterator[str]:
+        """Yield the body converted in a process pool, in document order.
+
+        Top-level units are split into contiguous ranges of similar subtree
+        size. Each worker loads the compact document model once and returns
+        the TeX of a range together with the packages and images it touched;
+        these are merged in range order, so the TeX and image_paths match a
+        serial conversion exactly.
+        """
+        model = soup.document if isinstance(soup, Node) else DocumentModel.from_soup(soup)
+        units = list(flatten_units(model.root))
+        weights = [unit.size if isinstance(unit, Node) else 1 for unit in units]
+        ranges = balanced_ranges(weights, self.max_workers * CHUNKS_PER_WORKER)
+        if len(ranges) <= 1:
+            for unit in units:
+                yield self.convert_tag_to_tex(unit)
+            return
+
+        settings = {
+            "externalize_listings": self.externalize_listings,
+            "listing_inline_limit": self.listing_inline_limit,
+            "emoji_backend": self.emoji_backend,
+            "emoji_pages": self.emoji_sheet.pages,
+            "log_level": self.log_level,
+        }
+        with tempfile.TemporaryDirectory(prefix="h2t-parallel-") as tmp:
+            model_file = Path(tmp) / "document.model"
+            model.save(model_file)
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(ranges)),
+                initializer=_init_parallel_worker,
+                initargs=(str(self.html_file), str(self.tex_file), str(model_file), settings),
+            ) as pool:
+                try:
+                    for (start, stop), fragment in zip(ranges, pool.map(_convert_unit_range, ranges)):
+                        self.cancel_token.raise_if_cancelled()
+                        for name in fragment.packages:
+                            self.required_packages[name] = True
+                        for src, path in fragment.images:
+                            if src not in self.image_cache:
+                                self.image_cache[src] = Path(path)
+                                self.image_paths.append(Path(path))
+                        for src, info in fragment.image_info:
+                            if src not in self.image_info:
+                                self.image_info[src] = info
+                                if info is not None and info.reencode:
+                                    self.reencode_images[self.image_cache[src]] = info.reencode
+                        self.image_index.merge(fragment.index_changes)
+                        self.assets.merge(fragment.asset_changes)
+                        self._nodes_done += sum(weights[start:stop])
+                        self._next_node_report = 0
+                        self._node_checkpoint()
+                        yield fragment.tex
+                except ConversionCancelled:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+
+    def _convert_section(self, digest: str, units: list[Any]) -> SectionFragment:
+        """Convert one section, capturing the packages, images and listings it touches."""
+        saved_packages = self.required_packages
+        self.required_packages = dict.fromkeys(saved_packages, False)
+        known_images = set(self.image_cache)
+        known_listings = len(self.listing_log)
+        try:
+            tex = "".join(self._convert_unit(unit) for unit in units)
+            packages = [name for name, needed in self.required_packages.items() if needed]
+        finally:
+            for name, needed in self.required_packages.items():
+                if needed:
+                    saved_packages[name] = True
+            self.required_packages = saved_packages
+
+        images = [[src, str(path)] for src, path in self.image_cache.items() if src not in known_images]
+        listings = list(dict.fromkeys(self.listing_log[known_listings:]))
+        return SectionFragment(digest=digest, tex=tex, packages=packages, images=images, listings=listings)
+
+    def prescan_features(self, soup: BeautifulSoup | Node) -> None:
+        """Enable every package and listing language the body will need."""
+        features = scan_features(soup)
+        for name, needed in features.packages.items():
+            if needed:
+                self.required_packages[name] = True
+        self.listing_languages |= features.languages
+        if self.emoji_backend == "sheet":
+            self.emoji_sheet.assign(emoji_key(char) for char in features.emoji)
+        self._nodes_total = features.nodes
+        self._nodes_done = self._next_node_check = self._next_node_report = 0
+
+    def preamble_key(self) -> str:
+        """Return a stable cache key for the current preamble."""
+        return hashlib.sha256(self.create_tex_header().encode("utf-8")).hexdigest()[:16]
 
     def save_tex_file(self, content: str) -> None:
         """Save the LaTeX content to the output file."""
         self.tex_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.tex_file, "w", encoding="utf-8") as f:
             f.write(content)
-        self.logger.info(f"TeX file saved to {self.tex_file}")
+        self.logger.info("TeX file saved to %s", self.tex_file)
 
     def sanitize_for_pdf(self, text: str) -> str:
         """Sanitize text for PDF bookmarks."""
         return re.sub(r"\\[{}]|[^A-Za-z0-9 ]+", "", text)
 
     def check_system_requirements(self) -> bool:
-        """Verify system requirements for Windows."""
+        """Verify xelatex, fonts and LaTeX packages, using the cached probe."""
         try:
-            if not shutil.which("xelatex"):
-                self.logger.error("xelatex not found. Install MiKTeX.")
-                return False
-
-            font_paths = [
-                os.path.join(os.environ["WINDIR"], "Fonts"),
-                os.path.join(
-                    os.environ["LOCALAPPDATA"],
-                    "Microsoft",
-                    "Windows",
-                    "Fonts",
-                ),
-                os.path.join(os.environ["APPDATA"], "Microsoft", "Windows", "Fonts"),
-            ]
+            probe = self.requirements_probe.run()
+            if probe.from_cache:
+                self.logger.debug("System requirements served from cache")
 
-            amiri_patterns = ["amiri-regular.ttf", "amiri*.ttf"]
-            noto_patterns = ["notosansarabic-regular.ttf", "notosansarabic*.ttf"]
-
-            def font_exists(patterns, paths) -> bool:
-                for path in paths:
-                    if not os.path.exists(path):
-                        continue
-                    for f in os.listdir(path):
-                        if any(fnmatch.fnmatch(f.lower(), p) for p in patterns):
-                            return True
+            if not probe.xelatex:
+                self.logger.error("xelatex not found. Install MiKTeX or TeX Live.")
                 return False
 
-            amiri_found = font_exists(amiri_patterns, font_paths)
-            noto_found = font_exists(noto_patterns, font_paths)
-
-            if not amiri_found:
+            if "amiri" in probe.missing_fonts:
                 self.logger.error(
                     "Amiri font missing. Download from https://fonts.google.com/specimen/Amiri",
                 )
-            if not noto_found:
+            if "noto" in probe.missing_fonts:
                 self.logger.error(
                     "Noto Arabic font missing. Download from https://fonts.google.com/noto/fonts",
                 )
-            if not amiri_found or not noto_found:
+            if probe.missing_fonts:
                 return False
 
-            required_packages = [
-                "polyglossia",
-                "fontspec",
-                "bidi",
-                "auxhook",
-                "xkeyval",
-            ]
-            for package in required_packages:
-                result = subprocess.run(
-                    ["kpsewhich", f"{package}.sty"],
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode != 0:
-                    self.logger.error(f"Missing LaTeX package: {package}")
-                    return False
-
-            return True
+            for package in probe.missing_packages:
+                self.logger.error("Missing LaTeX package: %s", package)
+            return not probe.missing_packages
 
         except Exception as e:
-            self.logger.exception(f"System check failed: {e}")
+            self.logger.exception("System check failed: %s", e)
             return False
 
     def create_tex_header(self) -> str:
@@ -241,10 +474,15 @@ class HTMLtoTeXConverter:
 
         if self.required_packages.get("listings", False):
             header.insert(-5, r"\usepackage{listings}")
+            if self.listing_languages:
+                header.insert(-5, rf"\lstloadlanguages{{{','.join(sorted(self.listing_languages))}}}")
         if self.required_packages.get("soul", False):
             header.insert(-5, r"\usepackage{soul}")
         if self.required_packages.get("mdframed", False):
             header.insert(-5, r"\usepackage{mdframed}")
+        if self.emoji_backend == "sheet":
+            for line in self.emoji_sheet.preamble_lines():
+                header.insert(-5, line)
 
         return "\n".join(header)
 
@@ -254,19 +492,16 @@ class HTMLtoTeXConverter:
             return ""
 
         try:
-            emoji_pattern = re.compile(
-                r"[" "\U0001f300-\U0001f9ff" "\U0001fa00-\U0001fa6f" "\u2600-\u26ff" "\u2700-\u27bf" "]",
-                flags=re.UNICODE,
-            )
-
             def replace_emoji(match) -> str:
                 emj = match.group()
+                if self.emoji_backend == "sheet":
+                    reference = self.emoji_sheet.reference(emoji_key(emj))
+                    if reference:
+                        return reference
                 code_points = "-".join(f"{ord(char):04X}" for char in emj)
                 emj_image_path = self.cache_emoji_image(code_points)
                 return f"\\includegraphics{{images/{emj_image_path}}}"
 
-            text = emoji_pattern.sub(replace_emoji, text)
-
             special_chars = {
                 "&": r"\&",
                 "%": r"\%",
@@ -290,40 +525,61 @@ class HTMLtoTeXConverter:
             for char, replacement in special_chars.items():
                 text = text.replace(char, replacement)
 
+            # After escaping, so the emitted commands are not escaped themselves.
+            text = EMOJI_PATTERN.sub(replace_emoji, text)
+
             if any("\u0600" <= c <= "\u06ff" for c in text):
                 self.required_packages["amiri"] = True
 
             return text
 
         except Exception as e:
-            self.logger.exception(f"Sanitization error: {e}")
+            self.logger.exception("Sanitization error: %s", e)
             return ""
 
     TWEMOJI_VERSION = "14.0.2"
     EMOJI_CDN_URL = f"https://cdnjs.cloudflare.com/ajax/libs/twemoji/{TWEMOJI_VERSION}/72x72/{{code_points}}.png"
     PLACEHOLDER_IMAGE = "missing.png"
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+    @staticmethod
+    def emoji_image_name(code_points: str) -> str:
+        """Return the Twemoji file name for dash-separated hex code points."""
+        code_points_clean = "-".join(cp.lstrip("0") for cp in code_points.split("-")).lower()
+        return f"{code_points_clean}.png"
+
+    @retry(stop_max_attempt_number=3, wait_fixed=2000)
     def cache_emoji_image(self, code_points: str) -> str:
         """Download and cache the emoji image."""
         cache_dir = self.tex_file.parent / "images"
         cache_dir.mkdir(exist_ok=True)
-        code_points_clean = "-".join(cp.lstrip("0") for cp in code_points.split("-")).lower()
-        image_name = f"{code_points_clean}.png"
+        image_name = self.emoji_image_name(code_points)
         image_path = cache_dir / image_name
 
         if not image_path.exists():
-            emj_url = f"https://cdnjs.cloudflare.com/ajax/libs/twemoji/14.0.2/72x72/{code_points_clean}.png"
+            emj_url = self.EMOJI_CDN_URL.format(code_points=image_name.removesuffix(".png"))
             try:
                 response = requests.get(emj_url, timeout=10)
                 response.raise_for_status()
                 image_path.write_bytes(response.content)
             except requests.exceptions.RequestException as e:
-                self.logger.exception(f"Emoji download failed: {e}. Using placeholder.")
+                self.logger.exception("Emoji download failed: %s. Using placeholder.", e)
                 return "missing.png"
 
         return image_name
 
+    def build_emoji_sheet(self) -> None:
+        """Pack the emoji used by the document into the sheet PDF."""
+
+        def glyph(key: str) -> Path | None:
+            name = self.cache_emoji_image(key)
+            return None if name == self.PLACEHOLDER_IMAGE else self.tex_file.parent / "images" / name
+
+        try:
+            if self.emoji_sheet.build(glyph):
+                self.logger.info("Emoji sheet written with %s glyphs", len(self.emoji_sheet.pages))
+        except Exception as e:
+            self.logger.exception("Emoji sheet creation failed: %s", e)
+
     def verify_rtl_content(self, content: str) -> bool:
         """Enhanced RTL content verification."""
         try:
@@ -344,16 +600,16 @@ class HTMLtoTeXConverter:
 
             for pattern in required_patterns:
                 if not re.search(pattern, content):
-                    self.logger.error(f"Missing RTL config: {pattern}")
+                    self.logger.error("Missing RTL config: %s", pattern)
                     return False
 
             return True
 
         except Exception as e:
-            self.logger.exception(f"RTL verification failed: {e}")
+            self.logger.exception("RTL verification failed: %s", e)
             return False
 
-    def _convert_list(self, tag) -> str
+    def _convert_list(self, tag) -> str:
         """Convert HTML lists to LaTeX lists."""
         try:
             self.list_depth += 1
@@ -372,7 +628,7 @@ class HTMLtoTeXConverter:
             return "\n".join(tex) + "\n\n"
 
         except Exception as e:
-            self.logger.exception(f"List conversion error: {e}")
+            self.logger.exception("List conversion error: %s", e)
             return ""
 
     def _convert_paragraph(self, tag) -> str:
@@ -400,7 +656,7 @@ class HTMLtoTeXConverter:
             return f"{content}\n\n"
 
         except Exception as e:
-            self.logger.exception(f"Paragraph conversion error: {e}")
+            self.logger.exception("Paragraph conversion error: %s", e)
             return ""
 
     def _convert_image(self, tag) -> str:
@@ -413,38 +669,29 @@ class HTMLtoTeXConverter:
             if src in self.image_cache:
                 image_path = self.image_cache[src]
             else:
-                images_dir = self.tex_file.parent / "images"
-                images_dir.mkdir(exist_ok=True)
-
-                if src.startswith(("http://", "https://")):
-                    response = requests.get(src)
-                    if response.status_code != 200:
-                        self.logger.error(f"Failed to download image: {src}")
-                        return ""
-
-                    image_path = images_dir / Path(src).name
-                    image_path.write_bytes(response.content)
-                else:
-                    image_path = Path(src)
-                    if not image_path.is_absolute():
-                        image_path = self.html_file.parent / image_path
-
-                    new_path = images_dir / image_path.name
-                    shutil.copy2(image_path, new_path)
-                    image_path = new_path
-
-                self.image_cache[src] = image_path
-                self.image_paths.append(image_path)
+                image_path = self._ingest_image(src)
+                if image_path is None:
+                    return ""
 
             alt = tag.get("alt", "")
             width = tag.get("width", "")
             height = tag.get("height", "")
+            info = self.image_info.get(src)
 
+            # With the bounding box given, TeX never opens the image to measure it.
             options = []
-            if width:
-                options.append(f"width={width}px")
-            if height:
+            natural = ""
+            if info is not None:
+                nat_width, nat_height = info.natural_size()
+                natural = f"{nat_width:.2f}bp"
+                options += [f"natwidth={natural}", f"natheight={nat_height:.2f}bp"]
+            if width and height:
+                options += [f"width={width}px", f"height={height}px"]
+            elif height:
                 options.append(f"height={height}px")
+            elif width or natural:
+                target = f"{width}px" if width else natural
+                options.append(f"width=\\ifdim {target}>\\linewidth\\linewidth\\else {target}\\fi")
 
             options_str = f"[{', '.join(options)}]" if options else ""
 
@@ -453,9 +700,41 @@ class HTMLtoTeXConverter:
             return f"\\includegraphics{options_str}{{{image_path.name}}}\n\n"
 
         except Exception as e:
-            self.logger.exception(f"Image conversion error: {e}")
+            self.logger.exception("Image conversion error: %s", e)
             return ""
 
+    def _ingest_image(self, src: str, placed: Path | None = None) -> Path | None:
+        """Place the image behind src in the images directory and record it.
+
+        placed is where an earlier run put the image; it is kept when it still
+        exists. Returns None when a remote image cannot be downloaded.
+        """
+        remote = src.startswith(("http://", "https://"))
+        source = None
+        if not remote:
+            source = Path(src)
+            if not source.is_absolute():
+                source = self.html_file.parent / source
+
+        if placed is not None and placed.exists():
+            image_path = placed
+        elif remote:
+            try:
+                image_path = self.assets.fetch_url(src)
+            except requests.exceptions.RequestException:
+                self.logger.error("Failed to download image: %s", src)
+                return None
+        else:
+            image_path = self.assets.place_file(source)
+
+        self.image_cache[src] = image_path
+        self.image_paths.append(image_path)
+        info = self.image_info[src] = self.image_index.lookup(source or image_path)
+        if info is not None and info.reencode:
+            self.reencode_images[image_path] = info.reencode
+            self.logger.warning("Image %s needs re-encoding: %s", src, ", ".join(info.reencode))
+        return image_path
+
     def _convert_pre(self, tag) -> str:
         """Convert preformatted text with listings package."""
         self.required_packages["listings"] = True
@@ -471,12 +750,19 @@ class HTMLtoTeXConverter:
                         language = cls.replace("language-", "")
                         break
 
+            if self.externalize_listings and len(code.encode("utf-8")) > self.listing_inline_limit:
+                listing_path = self.listings.store(code)
+                self.listing_log.append(code)
+                listing_ref = listing_path.relative_to(self.tex_file.parent).as_posix()
+                options = f"[language={language}]" if language else ""
+                return f"\\lstinputlisting{options}{{{listing_ref}}}\n\n"
+
             if language:
                 return f"\\begin{{lstlisting}}[language={language}]\n{code}\n\\end{{lstlisting}}\n\n"
             return f"\\begin{{lstlisting}}\n{code}\n\\end{{lstlisting}}\n\n"
 
         except Exception as e:
-            self.logger.exception(f"Preformatted text error: {e}")
+            self.logger.exception("Preformatted text error: %s", e)
             return ""
 
     def _convert_link(self, tag) -> str:
@@ -492,66 +778,197 @@ class HTMLtoTeXConverter:
             return f"\\href{{{href}}}{{{text}}}"
 
         except Exception as e:
-            self.logger.exception(f"Link conversion error: {e}")
+            self.logger.exception("Link conversion error: %s", e)
             return ""
 
+    def _compile_command(
+        self,
+        tex_file: Path | None = None,
+        sandbox: BuildSandbox | None = None,
+    ) -> tuple[list[str], dict[str, str]]:
+        """Return the xelatex command line and environment for a TeX file."""
+        tex_file = tex_file or self.tex_file
+        output_dir = tex_file.parent
+        if sandbox is not None:
+            env = sandbox.env()
+        else:
+            env = os.environ.copy()
+            env["TEXMFVAR"] = str(output_dir)
+
+        command = [
+            "xelatex",
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            f"-output-directory={output_dir}",
+            "-shell-escape",
+            str(tex_file),
+        ]
+        return command, env
+
+    @contextlib.contextmanager
+    def _build(self) -> Iterator[BuildSandbox | None]:
+        """Yield the sandbox for one compile, or None to build beside the TeX file."""
+        if not self.sandbox:
+            yield None
+            return
+        reserve = 4 * self.tex_file.stat().st_size
+        reserve += sum(path.stat().st_size for path in self.image_paths if path.exists())
+        with BuildSandbox(self.tex_file, MIN_RESERVE + reserve, self.scratch_dir) as sandbox:
+            self.logger.debug("Building in %s", sandbox.path)
+            yield sandbox
+
+    @staticmethod
+    def _export(sandbox: BuildSandbox | None) -> None:
+        """Move the PDF, and the TeX file if a retry fixed it, out of the sandbox."""
+        if sandbox is None:
+            return
+        if sandbox.tex_file.read_bytes() != sandbox.source.read_bytes():
+            sandbox.export(".pdf", ".tex")
+        else:
+            sandbox.export(".pdf")
+
     def compile_pdf(self) -> bool:
         """Enhanced PDF compilation with cross-platform timeout."""
         try:
-            output_dir = self.tex_file.parent
-            env = os.environ.copy()
-            env["TEXMFVAR"] = str(output_dir)
+            with self._build() as sandbox:
+                return self._compile_pdf(sandbox)
+        except Exception as e:
+            self.logger.exception("PDF compilation error: %s", e)
+            return False
 
-            base_command = [
-                "xelatex",
-                "-interaction=nonstopmode",
-                "-halt-on-error",
-                f"-output-directory={output_dir}",
-                "-shell-escape",
-            ]
+    def _page_reporter(self, attempt: int) -> Callable[[str], None]:
+        """Return an xelatex stdout line handler that reports each page as it ships out."""
+        pages = 0
 
-            proc = None
-            timeout_occurred = [False]
+        def on_output(line: str) -> None:
+            nonlocal pages
+            for match in PAGE_PATTERN.finditer(line):
+                page = int(match.group(1))
+                if page > pages:
+                    pages = page
+                    self._report("compile", page, self.expected_pages, attempt)
 
-            def timeout_handler() -> None:
-                timeout_occurred[0] = True
-                if proc:
-                    proc.terminate()
+        return on_output
 
-            for attempt in range(self.max_retries):
-                proc = subprocess.Popen(
-                    [*base_command, str(self.tex_file)],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+    def _compile_pdf(self, sandbox: BuildSandbox | None) -> bool:
+        """Run xelatex with retries, killing the process tree on timeout or cancellation."""
+        tex_file = sandbox.tex_file if sandbox else self.tex_file
+        command, env = self._compile_command(tex_file, sandbox)
+
+        for attempt in range(self.max_retries):
+            self.cancel_token.raise_if_cancelled()
+            self._report("compile", 0, self.expected_pages, attempt + 1)
+            try:
+                returncode, _stdout, stderr = run_watched(
+                    command,
+                    self.max_compile_time,
+                    self.cancel_token,
+                    self._page_reporter(attempt + 1),
                     env=env,
-                    text=True,
-                    encoding="utf-8",
+                    cwd=tex_file.parent,
                 )
+            except ConversionCancelled:
+                if sandbox is None:
+                    # xelatex was writing the PDF in place; a partial one is worse than none.
+                    tex_file.with_suffix(".pdf").unlink(missing_ok=True)
+                raise
+            except TimeoutError as e:
+                msg = "Compilation timed out"
+                raise TimeoutError(msg) from e
+
+            if returncode != 0:
+                self._analyze_compilation_errors(stderr)
+                if attempt < self.max_retries - 1:
+                    self.logger.warning("Retrying (%d/%d)", attempt + 1, self.max_retries)
+                    self._fix_common_errors(tex_file)
+                    continue
+                return False
 
-                timer = Timer(self.max_compile_time, timeout_handler)
-                timer.start()
-
-                stdout, stderr = proc.communicate()
-                timer.cancel()
+            self._export(sandbox)
+            return True
+        return False
 
-                if timeout_occurred[0]:
-                    msg = "Compilation timed out"
-                    raise TimeoutError(msg)
+    async def compile_pdf_async(self) -> bool:
+        """Compile with asyncio subprocesses; timeouts and cancellation kill the process tree."""
+        try:
+            with self._build() as sandbox:
+                tex_file = sandbox.tex_file if sandbox else self.tex_file
+                command, env = self._compile_command(tex_file, sandbox)
+                for attempt in range(self.max_retries):
+                    self.cancel_token.raise_if_cancelled()
+                    self._report("compile", 0, self.expected_pages, attempt + 1)
+                    returncode, _stdout, stderr = await run_process_tree(
+                        command,
+                        timeout=self.max_compile_time,
+                        env=env,
+                        cwd=tex_file.parent,
+                        on_output=self._page_reporter(attempt + 1),
+                    )
+
+                    if returncode != 0:
+                        self._analyze_compilation_errors(stderr)
+                        if attempt < self.max_retries - 1:
+                            self.logger.warning("Retrying (%d/%d)", attempt + 1, self.max_retries)
+                            await asyncio.to_thread(self._fix_common_errors, tex_file)
+                            continue
+                        return False
+
+                    await asyncio.to_thread(self._export, sandbox)
+                    return True
+                return False
 
-                if proc.returncode != 0:
-                    self._analyze_compilation_errors(stderr)
-                    if attempt < self.max_retries - 1:
-                        self.logger.warning(
-                            f"Retrying ({attempt+1}/{self.max_retries})",
-                        )
-                        self._fix_common_errors()
-                        continue
-                    return False
+        except asyncio.TimeoutError:
+            self.logger.error("Compilation timed out")
+            return False
+        except Exception as e:
+            self.logger.exception("PDF compilation error: %s", e)
+            return False
 
-                return True
+    def compile_pdf_split(self) -> bool:
+        """Compile top-level sections in parallel xelatex processes and merge them."""
+        try:
+            with self._build() as sandbox:
+                if sandbox is not None:
+                    tex_file, env, work_dir = sandbox.tex_file, sandbox.env(), sandbox.path / "split"
+                else:
+                    tex_file, work_dir = self.tex_file, Path(tempfile.mkdtemp(prefix="h2t-split-"))
+                    env = os.environ.copy()
+                    env["TEXMFVAR"] = str(self.tex_file.parent)
+                compiler = SplitCompiler(
+                    ["xelatex", "-interaction=nonstopmode", "-halt-on-error", "-shell-escape"],
+                    work_dir,
+                    workers=self.max_workers,
+                    timeout=self.max_compile_time,
+                )
+                self.cancel_token.raise_if_cancelled()
+                self._report("compile", 0, None, 1)
+                try:
+                    report = compiler.compile(tex_file, env=env, cancel=self.cancel_token)
+                finally:
+                    if sandbox is None:
+                        shutil.rmtree(work_dir, ignore_errors=True)
+                self._export(sandbox)
+            self.expected_pages = sum(report.pages)
+            self._report("compile", self.expected_pages, self.expected_pages, 1)
+            self.logger.info(
+                "Split compile: %d parts, %d pages in %.1fs (single-process estimate %.1fs, speedup %.2fx)",
+                report.parts,
+                sum(report.pages),
+                report.wall_time,
+                report.serial_estimate,
+                report.speedup,
+            )
+            return True
 
+        except subprocess.CalledProcessError as e:
+            self._analyze_compilation_errors(e.stdout)
+            self.logger.error("Split compilation failed")
+            return False
+        except TimeoutError as e:
+            self.logger.error("Split compilation timed out: %s", e)
+            return False
         except Exception as e:
-            self.logger.exception(f"PDF compilation error: {e!s}")
+            self.logger.exception("Split compilation error: %s", e)
             return False
 
     def _create_custom_format(self, format_file: Path) -> None:
@@ -573,12 +990,13 @@ class HTMLtoTeXConverter:
                     check=True,
                 )
         except Exception as e:
-            self.logger.warning(f"Custom format creation failed: {e}")
+            self.logger.warning("Custom format creation failed: %s", e)
 
-    def _fix_common_errors(self) -> None:
-        """Attempt automatic fixes for common errors."""
+    def _fix_common_errors(self, tex_file: Path | None = None) -> None:
+        """Attempt automatic fixes for common errors in tex_file (default: the output TeX file)."""
+        tex_file = tex_file or self.tex_file
         try:
-            with open(self.tex_file, encoding="utf-8") as f:
+            with open(tex_file, encoding="utf-8") as f:
                 content = f.read()
 
             if "\\usepackage{fontspec}" not in content:
@@ -596,11 +1014,11 @@ class HTMLtoTeXConverter:
             if "\\end{document}" not in content:
                 content += "\n\\end{document}"
 
-            with open(self.tex_file, "w", encoding="utf-8") as f:
+            with open(tex_file, "w", encoding="utf-8") as f:
                 f.write(content)
 
         except Exception as e:
-            self.logger.exception(f"Error fixing issues: {e}")
+            self.logger.exception("Error fixing issues: %s", e)
 
     def optimize_images(self, image_path: Path) -> None:
         """Optimize images for PDF."""
@@ -611,21 +1029,24 @@ class HTMLtoTeXConverter:
                     background.paste(img, mask=img.split()[3])
                     img = background
 
-                max_dimension = 2000
-                if max(img.size) > max_dimension:
-                    ratio = max_dimension / max(img.size)
+                if max(img.size) > MAX_IMAGE_DIMENSION:
+                    ratio = MAX_IMAGE_DIMENSION / max(img.size)
                     new_size = tuple(int(dim * ratio) for dim in img.size)
                     img = img.resize(new_size, Image.Resampling.LANCZOS)
 
+                # Write beside the original and swap it in, so a hardlinked
+                # source file is never modified through the shared inode.
+                tmp_path = image_path.with_name(f".{image_path.stem}.opt{image_path.suffix}")
                 img.save(
-                    image_path,
+                    tmp_path,
                     optimize=True,
                     quality=self.image_compression,
                     progressive=True,
                 )
+            os.replace(tmp_path, image_path)
 
         except Exception as e:
-            self.logger.exception(f"Image optimization failed: {e}")
+            self.logger.exception("Image optimization failed: %s", e)
 
     def validate_tex_file(self) -> bool:
         """Validate generated TeX file."""
@@ -643,7 +1064,7 @@ class HTMLtoTeXConverter:
 
             missing = [elem for elem in required_elements if elem not in content]
             if missing:
-                self.logger.error(f"Missing elements: {missing}")
+                self.logger.error("Missing elements: %s", missing)
                 return False
 
             if content.count("\\begin{document}") != 1 or content.count("\\end{document}") != 1:
@@ -653,7 +1074,7 @@ class HTMLtoTeXConverter:
             return True
 
         except Exception as e:
-            self.logger.exception(f"Validation error: {e}")
+            self.logger.exception("Validation error: %s", e)
             return False
 
     def _set_windows_memory_limit(self) -> None:
@@ -663,7 +1084,7 @@ class HTMLtoTeXConverter:
                 process = psutil.Process()
                 process.memory_limit(self.memory_limit)
             except Exception as e:
-                self.logger.warning(f"Memory limit setting failed: {e}")
+                self.logger.warning("Memory limit setting failed: %s", e)
 
     def _convert_table(self, tag) -> str:
         """Convert HTML tables to LaTeX tables (Implementation needed)."""
@@ -676,9 +1097,22 @@ class HTMLtoTeXConverter:
         return self.process_content(self.read_html_file())
 
     def validate_output(self) -> bool:
-        """Validate generated PDF output (Implementation needed)."""
-        self.logger.warning("PDF validation not implemented")
-        return True
+        """Check the compiled PDF's structure, page count and fonts.
+
+        Only the cross-reference data, page tree root and the first pages'
+        font resources are read, so this stays fast for very large files.
+        """
+        pdf_file = self.tex_file.with_suffix(".pdf")
+        if not pdf_file.exists():
+            self.logger.error("PDF not found: %s", pdf_file)
+            return False
+
+        report = check_pdf(pdf_file, self.expected_pages, self.required_fonts)
+        for error in report.errors:
+            self.logger.error("PDF validation failed: %s", error)
+        if report.ok:
+            self.logger.info("PDF validated: %d pages, version %s", report.pages, report.version)
+        return report.ok
 
     def _analyze_compilation_errors(self, stderr: str) -> None:
         """Analyze compilation errors."""
@@ -704,7 +1138,7 @@ class HTMLtoTeXConverter:
                 try:
                     file_path.unlink()
                 except Exception as e:
-                    self.logger.warning(f"Cleanup failed: {file_path} - {e}")
+                    self.logger.warning("Cleanup failed: %s - %s", file_path, e)
 
     def _analyze_log_file(self, log_file: Path) -> None:
         """Analyze LaTeX log file."""
@@ -722,17 +1156,17 @@ class HTMLtoTeXConverter:
                     log_content,
                 )
                 if error_msg:
-                    self.logger.error(f"Polyglossia error: {error_msg.group(1)}")
+                    self.logger.error("Polyglossia error: %s", error_msg.group(1))
 
             missing_package = re.search(
                 r"! LaTeX Error: File `(.*?)\.sty\' not found",
                 log_content,
             )
             if missing_package:
-                self.logger.error(f"Missing package: {missing_package.group(1)}")
+                self.logger.error("Missing package: %s", missing_package.group(1))
 
         except Exception as e:
-            self.logger.exception(f"Log analysis failed: {e}")
+            self.logger.exception("Log analysis failed: %s", e)
 
     def convert_tag_to_tex(self, tag) -> str:
         """Main tag conversion dispatcher."""
@@ -740,10 +1174,16 @@ class HTMLtoTeXConverter:
             if tag is None:
                 return ""
 
-            if isinstance(tag, NavigableString):
-                return self.sanitize_tex(tag.string or "")
+            self._nodes_done += 1
+            if self._nodes_done >= self._next_node_check:
+                self._node_checkpoint()
+
+            # Covers bs4 NavigableString and DocumentModel text nodes alike.
+            if isinstance(tag, str):
+                return self.sanitize_tex(str(tag))
 
             tag_type = tag.name if hasattr(tag, "name") else ""
+            self.logger.debug("Converting <%s>", tag_type)
 
             converters = {
                 "h1": lambda t: self._convert_heading(t),
@@ -770,7 +1210,7 @@ class HTMLtoTeXConverter:
             return "".join(self.convert_tag_to_tex(child) for child in tag.children)
 
         except Exception as e:
-            self.logger.exception(f"Tag conversion error: {e}")
+            self.logger.exception("Tag conversion error: %s", e)
             return ""
 
     def _convert_custom_tag(self, tag) -> str:
@@ -801,47 +1241,312 @@ class HTMLtoTeXConverter:
             return f"\\begin{{latin}}\\{command}{{{content}}}\\end{{latin}}\n\n"
 
         except Exception as e:
-            self.logger.exception(f"Heading conversion error: {e}")
+            self.logger.exception("Heading conversion error: %s", e)
             return ""
 
-    def convert(self) -> bool:
-        try:
-            self.logger.info(f"Starting conversion: {self.html_file}")
+    def _prepare(self) -> bool:
+        """Run every stage before compilation: checks, TeX generation, images."""
+        self.logger.info("Starting conversion: %s", self.html_file)
 
-            if not self.check_system_requirements():
-                return False
+        if not self.check_system_requirements():
+            return False
 
-            if sys.platform == "win32":
-                self._set_windows_memory_limit()
+        if not self._generate_tex():
+            return False
 
-            if os.path.getsize(self.html_file) > 10 * 1024 * 1024:
-                self.logger.info("Processing large file in chunks")
-                content = self.process_large_document()
-            else:
-                soup = self.read_html_file()
-                content = self.process_content(soup)
+        self._process_images(self.assets.is_current)
+        return True
 
-            if not self.verify_rtl_content(content):
-                return False
+    def _generate_tex(self) -> bool:
+        """Convert the HTML and save the TeX file and the assets it references."""
+        if sys.platform == "win32":
+            self._set_windows_memory_limit()
+
+        if os.path.getsize(self.html_file) > 10 * 1024 * 1024:
+            self.logger.info("Processing large file in chunks")
+            content = self.process_large_document()
+        else:
+            document = self.load_document()
+            content = self.process_content(document)
+
+        if not self.verify_rtl_content(content):
+            return False
+
+        self.cancel_token.raise_if_cancelled()
+        self.save_tex_file(content)
+        try:
+            self.image_index.save()
+        except OSError as e:
+            self.logger.warning("Image index write failed: %s", e)
 
-            self.save_tex_file(content)
+        if self.emoji_backend == "sheet":
+            self.cancel_token.raise_if_cancelled()
+            self.build_emoji_sheet()
 
-            for image_path in self.image_paths:
+        return True
+
+    def _process_images(self, unchanged: Callable[[Path], bool] | None = None) -> None:
+        """Optimize every image the TeX uses, except those unchanged reports as already done.
+
+        Each image is then recorded as finished, so the next run can keep it
+        instead of placing and optimizing its source again.
+        """
+        for done, image_path in enumerate(self.image_paths, 1):
+            self.cancel_token.raise_if_cancelled()
+            if unchanged is None or not unchanged(image_path):
                 self.optimize_images(image_path)
+            self.assets.record(image_path)
+            self._report("images", done, len(self.image_paths), detail=str(image_path))
+        try:
+            self.assets.save()
+        except OSError as e:
+            self.logger.warning("Asset stamp write failed: %s", e)
 
-            if not self.compile_pdf():
-                return False
+    def _finish(self) -> bool:
+        """Validate the compiled PDF and remove intermediates."""
+        if not self.validate_output():
+            return False
+
+        self.cleanup_tex_files()
+
+        return True
+
+    def _discard_partial_output(self) -> None:
+        """Remove what a cancelled run leaves beside the TeX file."""
+        self.logger.warning("Conversion cancelled: %s", self.cancel_token.reason)
+        self.cleanup_tex_files()
+
+    def run_stages(self, stages: Iterable[str], force: bool = False) -> bool:
+        """Run the named pipeline stages, in pipeline order, through a manifest beside the TeX file.
+
+        Each stage reads only on-disk artifacts of the stages before it, so
+        they can run in separate processes or on different machines, and
+        skips its work when its inputs match the last successful run.
+        force ignores the record and runs everything requested.
+        """
+        manifest = StageManifest(self.tex_file.with_suffix(".stages.json"))
+        runners = {
+            "tex-only": self._stage_tex,
+            "images-only": self._stage_images,
+            "compile-only": self._stage_compile,
+            "validate": self._stage_validate,
+        }
+        requested = set(stages)
+        with self._logging_to_file():
+            try:
+                for stage in STAGES:
+                    if stage not in requested:
+                        continue
+                    if not runners[stage](manifest, force):
+                        return False
+                    manifest.save()
+                return True
 
-            if not self.validate_output():
+            except ConversionCancelled:
+                self._discard_partial_output()
+                raise
+            except Exception as e:
+                self.logger.exception("Stage failed: %s", e)
                 return False
 
-            self.cleanup_tex_files()
+    def _stage_tex(self, manifest: StageManifest, force: bool) -> bool:
+        inputs = {
+            "html": file_digest(self.html_file),
+            "options": self._render_options_key(),
+            # The TeX embeds image sizes, so edited image files make it stale too.
+            "image_sources": [self._image_stamp(src) for src in manifest.value("tex-only", "sources", [])],
+        }
+        images = manifest.value("tex-only", "images", [])
+        if not force and manifest.is_fresh("tex-only", inputs) and all((manifest.root / p).exists() for p in images):
+            self.logger.info("tex-only: %s is up to date", self.tex_file)
+            return True
+
+        self.logger.info("Generating TeX: %s", self.html_file)
+        if not self._generate_tex():
+            return False
+        inputs["image_sources"] = [self._image_stamp(src) for src in self.image_cache]
+        manifest.record(
+            "tex-only",
+            inputs,
+            [self.tex_file],
+            images=[manifest.relative(path) for path in self.image_paths],
+            sources=list(self.image_cache),
+        )
+        return True
+
+    def _stage_images(self, manifest: StageManifest, force: bool) -> bool:
+        self._load_stage_images(manifest)
+
+        def unchanged(path: Path) -> bool:
+            digest = manifest.output_digest("images-only", path)
+            return digest is not None and digest == file_digest(path)
+
+        self._process_images(None if force else unchanged)
+        manifest.record("images-only", {}, self.image_paths)
+        return True
 
+    def _stage_compile(self, manifest: StageManifest, force: bool) -> bool:
+        self._load_stage_images(manifest)
+        inputs = {
+            "tex": file_digest(self.tex_file),
+            "assets": manifest.asset_digests(),
+            "split": self.split_compile,
+        }
+        if not force and manifest.is_fresh("compile-only", inputs):
+            self.logger.info("compile-only: %s is up to date", self.tex_file.with_suffix(".pdf"))
             return True
 
-        except Exception as e:
-            self.logger.exception(f"Conversion failed: {e}")
+        if not self.check_system_requirements():
+            return False
+        compiled = self.compile_pdf_split() if self.split_compile else self.compile_pdf()
+        if not compiled:
+            return False
+        self.cleanup_tex_files()
+        # A retry may have fixed the TeX file; record what was actually compiled.
+        inputs["tex"] = file_digest(self.tex_file)
+        manifest.record("compile-only", inputs, [self.tex_file.with_suffix(".pdf")], pages=self.expected_pages)
+        return True
+
+    def _stage_validate(self, manifest: StageManifest, force: bool) -> bool:
+        if self.expected_pages is None:
+            self.expected_pages = manifest.value("compile-only", "pages")
+        inputs = {
+            "pdf": file_digest(self.tex_file.with_suffix(".pdf")),
+            "pages": self.expected_pages,
+            "fonts": self.required_fonts,
+        }
+        if not force and inputs["pdf"] is not None and manifest.is_fresh("validate", inputs):
+            self.logger.info("validate: %s already passed", self.tex_file.with_suffix(".pdf"))
+            return True
+
+        if not self.validate_output():
             return False
+        manifest.record("validate", inputs, [])
+        return True
+
+    def _load_stage_images(self, manifest: StageManifest) -> None:
+        """Take the image list from the manifest unless this run generated the TeX itself.
+
+        Without a tex-only record, as when compiling a TeX file written by
+        hand, every file in the images directory is used.
+        """
+        if self.image_paths:
+            return
+        images = manifest.value("tex-only", "images")
+        if images is not None:
+            self.image_paths = [manifest.root / name for name in images]
+            return
+        image_dir = self.assets.target_dir
+        self.logger.warning("No tex-only record in %s; using the files in %s", manifest.path, image_dir)
+        if image_dir.is_dir():
+            self.image_paths = sorted(
+                path for path in image_dir.iterdir() if path.is_file() and not path.name.startswith(".")
+            )
+
+    def convert(self) -> bool:
+        """Run the whole pipeline.
+
+        Raises ConversionCancelled, after removing intermediates, if the
+        cancel token is set while it runs.
+        """
+        with self._logging_to_file():
+            try:
+                if not self._prepare():
+                    return False
+
+                compiled = self.compile_pdf_split() if self.split_compile else self.compile_pdf()
+                if not compiled:
+                    return False
+
+                return self._finish()
+
+            except ConversionCancelled:
+                self._discard_partial_output()
+                raise
+            except Exception as e:
+                self.logger.exception("Conversion failed: %s", e)
+                return False
+
+    async def _to_cancellable_thread(self, func: Callable[[], bool]) -> bool:
+        """Run func in a worker thread; cancelling the task sets the cancel token and waits for func to stop."""
+        future = asyncio.ensure_future(asyncio.to_thread(func))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.cancel_token.cancel("task cancelled")
+            with contextlib.suppress(BaseException):
+                await future
+            raise
+
+    async def convert_async(self) -> bool:
+        """Convert without blocking the event loop.
+
+        TeX generation, image processing, split compiles and validation run
+        in worker threads and single compiles use asyncio subprocesses, so
+        many conversions can share one loop. Cancelling the task sets the
+        cancel token, waits for the running thread to stop and kills every
+        running xelatex process tree.
+        """
+        with self._logging_to_file():
+            try:
+                if not await self._to_cancellable_thread(self._prepare):
+                    return False
+
+                if self.split_compile:
+                    compiled = await self._to_cancellable_thread(self.compile_pdf_split)
+                else:
+                    compiled = await self.compile_pdf_async()
+                if not compiled:
+                    return False
+
+                return await self._to_cancellable_thread(self._finish)
+
+            except (ConversionCancelled, asyncio.CancelledError):
+                if not self.cancel_token.cancelled:
+                    self.cancel_token.cancel("task cancelled")
+                await asyncio.to_thread(self._discard_partial_output)
+                raise
+            except Exception as e:
+                self.logger.exception("Conversion failed: %s", e)
+                return False
+
+
+# Per-process state of _iter_parallel workers, set once by the pool initializer.
+_worker_converter: HTMLtoTeXConverter | None = None
+_worker_units: list[Any] = []
+
+
+def _init_parallel_worker(html_file: str, tex_file: str, model_file: str, settings: dict[str, Any]) -> None:
+    """Load the document model and build a converter configured like the parent's."""
+    global _worker_converter, _worker_units  # noqa: PLW0603
+
+    converter = HTMLtoTeXConverter(html_file, tex_file, log_level=settings["log_level"])
+    if converter.log_level is not None:
+        # The worker logs for the parent's run, so its file stays attached for the worker's life.
+        attach_log_file(converter.log_file, converter.log_level)
+    converter.externalize_listings = settings["externalize_listings"]
+    converter.listing_inline_limit = settings["listing_inline_limit"]
+    converter.emoji_backend = settings["emoji_backend"]
+    converter.emoji_sheet.pages = settings["emoji_pages"]
+    model = DocumentModel.load(Path(model_file))
+    if model is None:
+        msg = f"Cannot load document model {model_file}"
+        raise RuntimeError(msg)
+    _worker_converter = converter
+    _worker_units = list(flatten_units(model.root))
+
+
+def _convert_unit_range(bounds: tuple[int, int]) -> SectionFragment:
+    """Convert top-level units [start, stop) in a pool worker."""
+    start, stop = bounds
+    converter = _worker_converter
+    known = set(converter.image_info)
+    fragment = converter._convert_section("", _worker_units[start:stop])  # noqa: SLF001
+    # Image metadata lives in this process; hand it to the parent with the TeX.
+    fragment.image_info = [[src, info] for src, info in converter.image_info.items() if src not in known]
+    fragment.index_changes = converter.image_index.take_changes()
+    fragment.asset_changes = converter.assets.take_changes()
+    return fragment
 
 
 def main() -> None:
@@ -875,25 +1580,93 @@ def main() -> None:
         default=4,
         help="Maximum worker threads",
     )
+    parser.add_argument(
+        "--document-cache",
+        action="store_true",
+        help="Cache the parsed document so re-renders skip HTML parsing",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only reconvert sections that changed since the last run",
+    )
+    parser.add_argument(
+        "--externalize-listings",
+        action="store_true",
+        help="Write each distinct code block once to a side file and reference it",
+    )
+    parser.add_argument(
+        "--emoji-backend",
+        choices=["images", "sheet"],
+        default="images",
+        help="Render emoji as one image each or from a single multi-page PDF",
+    )
+    parser.add_argument(
+        "--parallel-convert",
+        action="store_true",
+        help="Convert the body in --max-workers processes (output identical to serial)",
+    )
+    parser.add_argument(
+        "--no-sandbox",
+        action="store_true",
+        help="Compile beside the output file instead of in a private scratch directory",
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        type=Path,
+        default=None,
+        help="Directory for build sandboxes (default: /dev/shm when it has room, else the temp dir)",
+    )
+    parser.add_argument(
+        "--split-compile",
+        action="store_true",
+        help="Compile top-level sections in parallel and merge the PDFs",
+    )
+
+    parser.add_argument(
+        "--stage",
+        nargs="+",
+        choices=STAGES,
+        default=None,
+        help="Run only these stages, reusing artifacts and skipping stages whose inputs are unchanged",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --stage, rerun stages even when their inputs are unchanged",
+    )
 
     args = parser.parse_args()
 
     try:
-        input_path = Path(args.input).resolve(strict=True)
+        # Later stages work from the TeX directory alone; the HTML need not be present.
+        needs_html = args.stage is None or "tex-only" in args.stage
+        input_path = Path(args.input).resolve(strict=needs_html)
         output_path = Path(args.output or input_path.with_suffix(".tex"))
 
-        converter = HTMLtoTeXConverter(input_path, output_path)
+        configure_logging(args.log_level)
+        converter = HTMLtoTeXConverter(input_path, output_path, log_level=args.log_level)
         converter.memory_limit = args.memory_limit * 1024 * 1024
         converter.image_compression = args.image_quality
         converter.max_workers = args.max_workers
-
-        if converter.convert():
-            pass
-        else:
+        converter.split_compile = args.split_compile
+        converter.parallel_convert = args.parallel_convert
+        converter.sandbox = not args.no_sandbox
+        converter.scratch_dir = args.scratch_dir
+        converter.document_cache = args.document_cache
+        converter.incremental = args.incremental
+        converter.externalize_listings = args.externalize_listings
+        converter.emoji_backend = args.emoji_backend
+        signal.signal(signal.SIGTERM, lambda *_: converter.cancel_token.cancel("SIGTERM"))
+
+        succeeded = converter.run_stages(args.stage, force=args.force) if args.stage else converter.convert()
+        if not succeeded:
             sys.exit(1)
 
+    except ConversionCancelled:
+        sys.exit(128 + signal.SIGTERM)
     except Exception as e:
-        logging.exception(f"Error: {e}")
+        logging.exception("Error: %s", e)
         sys.exit(1)
 
 
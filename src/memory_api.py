@@ -0,0 +1,188 @@
+"""Library API: convert HTML to TeX in memory.
+
+Nothing here writes files, downloads assets, touches the on-disk image
+index or configures logging. Records go to the "src.enhanced_converter" logger and reach whatever
+handlers the host application installed.
+
+    converter = MemoryConverter(base_dir=Path("site"))
+    tex = converter.convert("<h1>عنوان</h1><p>نص</p>").tex
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import threading
+
+from bs4 import BeautifulSoup
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.image_index import MAX_ENTRIES, ImageIndex, ImageInfo
+from src.utils.listings import ListingStore
+
+DOCUMENT_NAME = "document"
+
+
+@dataclass
+class TexDocument:
+    """Result of one in-memory conversion.
+
+    Attributes:
+        tex: Complete TeX source, preamble included
+        sources: Each asset path the TeX refers to, relative to the TeX file,
+            mapped to where it comes from: a local path, a URL, or "" for
+            externalized listings
+        assets: Asset contents by the same relative path; filled only when
+            collect_assets is set, and never with remote assets
+
+    """
+
+    tex: str
+    sources: dict[str, str] = field(default_factory=dict)
+    assets: dict[str, bytes] = field(default_factory=dict)
+
+
+class _AssetNames:
+    """Stand-in for AssetIngestor that names assets where it would place them, without I/O."""
+
+    def __init__(self, target_dir: Path, sources: dict[str, str]) -> None:
+        self.target_dir = target_dir
+        self.sources = sources
+
+    def fetch_url(self, url: str) -> Path:
+        dest = self.target_dir / Path(url.split("?", 1)[0]).name
+        self.sources[dest.as_posix()] = url
+        return dest
+
+    def place_file(self, source: Path) -> Path:
+        dest = self.target_dir / Path(source).name
+        self.sources[dest.as_posix()] = str(source)
+        return dest
+
+
+class _ListingBuffer(ListingStore):
+    """ListingStore that keeps side files in a dict instead of writing them."""
+
+    def __init__(self, directory: Path, files: dict[str, bytes]) -> None:
+        super().__init__(directory)
+        self.files = files
+
+    def store(self, code: str) -> Path:
+        data = code.encode("utf-8")
+        path = self.path_for(data)
+        self.files[path.as_posix()] = data
+        return path
+
+
+class _MemoryIndex(ImageIndex):
+    """ImageIndex held in memory only and shared by every conversion in the process.
+
+    Local images are hashed and probed once per process. Lookups are
+    serialized so that concurrent conversions can share the instance.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(Path(os.devnull))
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, path: Path) -> ImageInfo | None:
+        with self._lock:
+            info = super().lookup(path)
+            while len(self._entries) > MAX_ENTRIES:
+                del self._entries[next(iter(self._entries))]
+            return info
+
+    def save(self) -> None:
+        pass
+
+    def _load(self) -> dict[str, ImageInfo]:
+        return self._entries
+
+
+_shared_index = _MemoryIndex()
+
+
+class _BufferedConverter(HTMLtoTeXConverter):
+    """Converter whose side files and downloads are recorded rather than performed."""
+
+    def __init__(self, base_dir: Path) -> None:
+        super().__init__(str(base_dir / f"{DOCUMENT_NAME}.html"), f"{DOCUMENT_NAME}.tex", log_level=None)
+        self.sources: dict[str, str] = {}
+        self.listing_files: dict[str, bytes] = {}
+        self.assets = _AssetNames(Path("images"), self.sources)
+        self.listings = _ListingBuffer(Path("listings"), self.listing_files)
+        self.image_index = _shared_index
+
+    def _ingest_image(self, src: str, placed: Path | None = None) -> Path | None:
+        if not src.startswith(("http://", "https://")):
+            return super()._ingest_image(src, placed)
+        # Remote images are never downloaded, so there is no file to measure.
+        image_path = self.assets.fetch_url(src)
+        self.image_cache[src] = image_path
+        self.image_paths.append(image_path)
+        self.image_info[src] = None
+        return image_path
+
+    def cache_emoji_image(self, code_points: str) -> str:
+        image_name = self.emoji_image_name(code_points)
+        url = self.EMOJI_CDN_URL.format(code_points=image_name.removesuffix(".png"))
+        self.sources[f"images/{image_name}"] = url
+        return image_name
+
+
+class MemoryConverter:
+    """Reusable, thread-safe HTML to TeX conversion without side effects.
+
+    The instance only holds options; every convert() call works on its own
+    converter state, so one instance can serve many calls from many threads
+    at once. Images keep the file names the file-based converter gives them,
+    so the TeX is the same as its output for the same options, except that
+    remote images, which are never downloaded, carry no natural size.
+
+    Attributes:
+        base_dir: Directory relative image paths are resolved against
+        externalize_listings: Reference long code blocks from listings/ side files
+        listing_inline_limit: Blocks up to this many bytes stay inline
+        parser: BeautifulSoup tree builder
+
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        externalize_listings: bool = False,
+        listing_inline_limit: int = 0,
+        parser: str = "html.parser",
+    ) -> None:
+        self.base_dir = Path(base_dir) if base_dir is not None else Path()
+        self.externalize_listings = externalize_listings
+        self.listing_inline_limit = listing_inline_limit
+        self.parser = parser
+
+    def convert(self, html: str | bytes, collect_assets: bool = False) -> TexDocument:
+        """Convert an HTML document, given as text or as bytes in any encoding BeautifulSoup detects."""
+        converter = _BufferedConverter(self.base_dir)
+        converter.externalize_listings = self.externalize_listings
+        converter.listing_inline_limit = self.listing_inline_limit
+
+        tex = converter.process_content(BeautifulSoup(html, self.parser))
+        sources = dict(converter.sources)
+        sources.update(dict.fromkeys(converter.listing_files, ""))
+        document = TexDocument(tex, sources)
+        if collect_assets:
+            document.assets.update(converter.listing_files)
+            for name, origin in converter.sources.items():
+                if origin.startswith(("http://", "https://")):
+                    continue
+                try:
+                    document.assets[name] = Path(origin).read_bytes()
+                except OSError as e:
+                    converter.logger.warning("Asset %s not readable: %s", origin, e)
+        return document
+
+
+def html_to_tex(html: str | bytes, base_dir: Path | None = None) -> str:
+    """Return the TeX for an HTML document, with default options."""
+    return MemoryConverter(base_dir).convert(html).tex
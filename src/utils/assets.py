@@ -0,0 +1,191 @@
+"""Asset ingestion with streamed downloads and link-before-copy placement."""
+
+from __future__ import annotations
+
+import contextlib
+import email.utils
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import requests
+
+from src.utils.stages import write_text_atomic
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB per streamed chunk
+FICLONE = 0x40049409  # Linux ioctl request for reflink copies
+STAMP_FILE = ".placed.json"
+
+
+class AssetIngestor:
+    """Place remote and local assets into a target directory.
+
+    Remote assets are streamed to disk in chunks instead of being held in
+    memory. Local assets are hardlinked or reflinked when the filesystem
+    allows it and copied otherwise.
+
+    Placed files are usually rewritten afterwards, by image optimization for
+    example, so they cannot be compared with their source. Instead, record()
+    notes a finished file's size and mtime together with those its source had
+    when it was placed, and save() keeps them in a hidden file in target_dir.
+    A local asset whose source and finished file both still match is left
+    untouched.
+
+    Attributes:
+        target_dir: Directory receiving ingested assets
+        chunk_size: Number of bytes read per download chunk
+        timeout: Network timeout in seconds
+        stats: Counters for linked, reflinked, copied, downloaded and reused assets
+
+    """
+
+    def __init__(
+        self,
+        target_dir: Path,
+        chunk_size: int = CHUNK_SIZE,
+        timeout: float = 30,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.target_dir = Path(target_dir)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.stats = {"linked": 0, "reflinked": 0, "copied": 0, "downloaded": 0, "reused": 0}
+        self._stamps: dict[str, dict[str, list[int] | None]] | None = None
+        self._new_stamps: dict[str, dict[str, list[int] | None]] = {}
+        self._dirty = False
+
+    def fetch_url(self, url: str) -> Path:
+        """Stream a remote asset into the target directory."""
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        dest = self.target_dir / Path(url.split("?", 1)[0]).name
+        headers = {}
+        if dest.exists():
+            headers["If-Modified-Since"] = email.utils.formatdate(dest.stat().st_mtime, usegmt=True)
+
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as response:
+            if response.status_code == 304:
+                self.stats["reused"] += 1
+                return dest
+            response.raise_for_status()
+
+            tmp = self._temp_path(dest)
+            try:
+                with open(tmp, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                os.replace(tmp, dest)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+            last_modified = response.headers.get("Last-Modified")
+            if last_modified:
+                with contextlib.suppress(TypeError, ValueError, OSError):
+                    mtime = email.utils.parsedate_to_datetime(last_modified).timestamp()
+                    os.utime(dest, (mtime, mtime))
+
+        self.stats["downloaded"] += 1
+        return dest
+
+    def place_file(self, source: Path) -> Path:
+        """Place a local asset into the target directory without needless copies."""
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        source = Path(source)
+        dest = self.target_dir / source.name
+        source_stamp = self._stamp(source)
+        stamp = self._load().get(dest.name)
+
+        if stamp is not None and stamp["source"] == source_stamp and self.is_current(dest):
+            self.stats["reused"] += 1
+            return dest
+
+        self._stamps[dest.name] = self._new_stamps[dest.name] = {"source": source_stamp, "dest": None}
+        self._dirty = True
+        with contextlib.suppress(OSError):
+            if os.path.samefile(source, dest):
+                self.stats["reused"] += 1
+                return dest
+
+        tmp = self._temp_path(dest)
+        try:
+            method = self._link_or_copy(source, tmp)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        self.stats[method] += 1
+        return dest
+
+    def record(self, dest: Path) -> None:
+        """Note dest, as it is now, as the finished form of the asset placed there."""
+        stamp = self._load().setdefault(Path(dest).name, {"source": None, "dest": None})
+        stamp["dest"] = self._stamp(Path(dest))
+        self._dirty = True
+
+    def is_current(self, dest: Path) -> bool:
+        """Check whether dest is unchanged since record() was last called for it."""
+        stamp = self._load().get(Path(dest).name)
+        return stamp is not None and stamp["dest"] is not None and stamp["dest"] == self._stamp(Path(dest))
+
+    def take_changes(self) -> dict[str, dict[str, list[int] | None]]:
+        """Return the stamps of files placed since the last call, for merge() into an ingestor in another process."""
+        changes, self._new_stamps = self._new_stamps, {}
+        return changes
+
+    def merge(self, changes: dict[str, dict[str, list[int] | None]]) -> None:
+        """Add stamps returned by another ingestor's take_changes()."""
+        if changes:
+            self._load().update(changes)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the recorded stamps atomically if anything changed."""
+        if not self._dirty or self._stamps is None:
+            return
+        write_text_atomic(self.target_dir / STAMP_FILE, json.dumps(self._stamps, sort_keys=True))
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, list[int] | None]]:
+        if self._stamps is None:
+            try:
+                self._stamps = dict(json.loads((self.target_dir / STAMP_FILE).read_text(encoding="utf-8")))
+            except (OSError, ValueError, TypeError):
+                self._stamps = {}
+        return self._stamps
+
+    @staticmethod
+    def _stamp(path: Path) -> list[int] | None:
+        """Return [size, mtime_ns] of path, None if it does not exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def _temp_path(dest: Path) -> Path:
+        """Return a sibling path used for atomic replacement of dest."""
+        return dest.with_name(f".{dest.name}.{os.getpid()}.part")
+
+    @staticmethod
+    def _link_or_copy(source: Path, dest: Path) -> str:
+        """Hardlink, reflink or copy source to dest and report the method used."""
+        with contextlib.suppress(OSError):
+            os.link(source, dest)
+            return "linked"
+
+        if sys.platform == "linux":
+            import fcntl
+
+            try:
+                with open(source, "rb") as src, open(dest, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, dest)
+                return "reflinked"
+            except OSError:
+                dest.unlink(missing_ok=True)
+
+        shutil.copy2(source, dest)
+        return "copied"
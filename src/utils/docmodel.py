@@ -0,0 +1,260 @@
+"""Compact, cacheable document model between HTML parsing and TeX rendering."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+import marshal
+import os
+from pathlib import Path
+import sys
+from typing import Any
+
+from bs4 import CData, NavigableString
+
+MAGIC = b"H2TDOM1\n"
+TEXT = -1  # Text that get_text() includes
+OTHER_TEXT = -2  # Comments, doctypes and other strings get_text() skips
+
+
+class DocumentModel:
+    """Array-backed document tree.
+
+    Nodes are numbered in document order. For each node the model stores a
+    name id (or TEXT/OTHER_TEXT for strings), the index one past its last
+    descendant, and a payload index into ``texts`` or ``attrs``. Tag names
+    and class names are interned. Elements are exposed through lightweight
+    ``Node`` views created on demand, and text nodes as plain ``str``, so the
+    converters can walk the model exactly as they walk a BeautifulSoup tree.
+
+    Attributes:
+        names: Interned tag names referenced by name id
+        name_ids: Name id per node, negative for text nodes
+        ends: Index one past the last descendant of each node
+        payloads: Index into texts (text nodes) or attrs (elements, -1 if none)
+        texts: String contents of text nodes
+        attrs: Attribute dictionaries of elements that have any
+        source_hash: Digest of the HTML the model was built from
+
+    """
+
+    __slots__ = ("attrs", "ends", "name_ids", "names", "payloads", "source_hash", "texts")
+
+    def __init__(self, source_hash: str = "") -> None:
+        self.names: list[str] = []
+        self.name_ids = array("i")
+        self.ends = array("i")
+        self.payloads = array("i")
+        self.texts: list[str] = []
+        self.attrs: list[dict[str, Any]] = []
+        self.source_hash = source_hash
+
+    @property
+    def root(self) -> Node:
+        """Return the document node."""
+        return Node(self, 0)
+
+    def __len__(self) -> int:
+        return len(self.name_ids)
+
+    @classmethod
+    def from_soup(cls, soup: Any, source_hash: str = "") -> DocumentModel:
+        """Build the model from a parsed BeautifulSoup document."""
+        model = cls(source_hash)
+        name_index: dict[str, int] = {}
+        open_nodes: list[int] = []
+        stack: list[Any] = [soup]
+
+        # Iterative pre-order walk; a None marker closes the innermost element.
+        while stack:
+            node = stack.pop()
+            if node is None:
+                model.ends[open_nodes.pop()] = len(model.name_ids)
+                continue
+
+            index = len(model.name_ids)
+            if isinstance(node, NavigableString):
+                model.name_ids.append(TEXT if type(node) in (NavigableString, CData) else OTHER_TEXT)
+                model.ends.append(index + 1)
+                model.payloads.append(len(model.texts))
+                model.texts.append(str(node))
+                continue
+
+            name = sys.intern(node.name)
+            if name not in name_index:
+                name_index[name] = len(model.names)
+                model.names.append(name)
+            model.name_ids.append(name_index[name])
+            model.ends.append(index + 1)
+            if node.attrs:
+                model.payloads.append(len(model.attrs))
+                model.attrs.append(_intern_attrs(node.attrs))
+            else:
+                model.payloads.append(-1)
+
+            open_nodes.append(index)
+            stack.append(None)
+            stack.extend(reversed(node.contents))
+
+        return model
+
+    def save(self, path: Path) -> None:
+        """Write the model to a binary cache file atomically."""
+        payload = marshal.dumps(
+            (
+                self.source_hash,
+                self.names,
+                self.name_ids.tobytes(),
+                self.ends.tobytes(),
+                self.payloads.tobytes(),
+                self.texts,
+                self.attrs,
+            ),
+        )
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + f"{sys.version_info[0]}.{sys.version_info[1]}\n".encode())
+            f.write(payload)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, source_hash: str | None = None) -> DocumentModel | None:
+        """Read a cached model, or return None if missing, stale or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                if f.readline().decode().strip() != f"{sys.version_info[0]}.{sys.version_info[1]}":
+                    return None
+                fields = marshal.loads(f.read())  # noqa: S302 - written by save()
+            model = cls(fields[0])
+            if source_hash is not None and model.source_hash != source_hash:
+                return None
+            model.names = [sys.intern(name) for name in fields[1]]
+            model.name_ids.frombytes(fields[2])
+            model.ends.frombytes(fields[3])
+            model.payloads.frombytes(fields[4])
+            model.texts = fields[5]
+            model.attrs = fields[6]
+        except (OSError, ValueError, EOFError, TypeError, IndexError):
+            return None
+        return model
+
+
+class Node:
+    """View of one element in a DocumentModel, mirroring the bs4 Tag API the converters use."""
+
+    __slots__ = ("_doc", "_index")
+
+    def __init__(self, doc: DocumentModel, index: int) -> None:
+        self._doc = doc
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"<Node {self.name} #{self._index}>"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Node) and other._doc is self._doc and other._index == self._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._doc), self._index))
+
+    @property
+    def document(self) -> DocumentModel:
+        """Return the model this node belongs to."""
+        return self._doc
+
+    @property
+    def index(self) -> int:
+        """Return the node's position in document order."""
+        return self._index
+
+    @property
+    def size(self) -> int:
+        """Return the number of nodes in this subtree, including this one."""
+        return self._doc.ends[self._index] - self._index
+
+    @property
+    def name(self) -> str:
+        """Return the tag name, ``[document]`` for the root."""
+        if self._index == 0:
+            return "[document]"
+        return self._doc.names[self._doc.name_ids[self._index]]
+
+    @property
+    def attrs(self) -> dict[str, Any]:
+        """Return the attribute dictionary."""
+        payload = self._doc.payloads[self._index]
+        return self._doc.attrs[payload] if payload >= 0 else {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return an attribute value."""
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def _wrap(self, index: int) -> Node | str:
+        doc = self._doc
+        if doc.name_ids[index] < 0:
+            return doc.texts[doc.payloads[index]]
+        return Node(doc, index)
+
+    @property
+    def children(self) -> Iterator[Node | str]:
+        """Yield direct children: Node for elements, str for text."""
+        ends = self._doc.ends
+        child, end = self._index + 1, ends[self._index]
+        while child < end:
+            yield self._wrap(child)
+            child = ends[child]
+
+    @property
+    def contents(self) -> list[Node | str]:
+        """Return direct children as a list."""
+        return list(self.children)
+
+    @property
+    def descendants(self) -> Iterator[Node | str]:
+        """Yield every node below this one in document order."""
+        for index in range(self._index + 1, self._doc.ends[self._index]):
+            yield self._wrap(index)
+
+    @property
+    def string(self) -> str | None:
+        """Return the only string below a single-child chain, like bs4."""
+        children = self.contents
+        if len(children) != 1:
+            return None
+        child = children[0]
+        return child if isinstance(child, str) else child.string
+
+    def get_text(self) -> str:
+        """Concatenate the text below this node."""
+        doc = self._doc
+        return "".join(
+            doc.texts[doc.payloads[i]] for i in range(self._index + 1, doc.ends[self._index]) if doc.name_ids[i] == TEXT
+        )
+
+    def find_all(self, name: str | list[str], recursive: bool = True) -> list[Node]:
+        """Return descendant (or child) elements with the given name(s)."""
+        wanted = {name} if isinstance(name, str) else set(name)
+        nodes = self.descendants if recursive else self.children
+        return [node for node in nodes if isinstance(node, Node) and node.name in wanted]
+
+    def find(self, name: str | list[str]) -> Node | None:
+        """Return the first descendant element with the given name(s)."""
+        wanted = {name} if isinstance(name, str) else set(name)
+        for node in self.descendants:
+            if isinstance(node, Node) and node.name in wanted:
+                return node
+        return None
+
+
+def _intern_attrs(attrs: dict[str, Any]) -> dict[str, Any]:
+    """Copy attributes, interning class names and other multi-valued tokens."""
+    return {
+        sys.intern(key): [sys.intern(str(v)) for v in value] if isinstance(value, list) else str(value)
+        for key, value in attrs.items()
+    }
@@ -0,0 +1,97 @@
+"""Pack every emoji a document uses into one multi-page PDF."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import json
+import os
+from pathlib import Path
+
+from PIL import Image
+
+GLYPH_SIZE = (72, 72)
+MACRO = "emojiglyph"
+
+
+def emoji_key(char: str) -> str:
+    """Return the Twemoji file key for an emoji, e.g. '1f600'."""
+    return "-".join(f"{ord(c):x}" for c in char)
+
+
+class EmojiSheet:
+    """Map emoji to pages of a single PDF asset.
+
+    Pages follow the sorted emoji keys, so the mapping depends only on the
+    set of emoji in the document. The preamble defines one macro per page
+    and the body refers to emoji by key, which keeps rendered fragments
+    independent of page numbers.
+
+    Attributes:
+        path: Location of the sheet PDF
+        tex_ref: Path of the sheet as written in the TeX file
+        pages: Emoji key mapped to its 1-based page
+
+    """
+
+    def __init__(self, path: Path, tex_ref: str) -> None:
+        self.path = Path(path)
+        self.tex_ref = tex_ref
+        self.pages: dict[str, int] = {}
+
+    def assign(self, keys: Iterable[str]) -> None:
+        """Set the emoji carried by the sheet."""
+        self.pages = {key: page for page, key in enumerate(sorted(set(keys)), start=1)}
+
+    def reference(self, key: str) -> str | None:
+        """Return the TeX for an emoji on the sheet, or None if it is not on it."""
+        if key not in self.pages:
+            return None
+        return f"\\{MACRO}{{{key}}}"
+
+    def preamble_lines(self) -> list[str]:
+        """Return the macro and page table definitions for the preamble."""
+        if not self.pages:
+            return []
+        lines = [
+            f"\\newcommand{{\\{MACRO}}}[1]{{\\includegraphics[page=\\csname {MACRO}@#1\\endcsname]{{{self.tex_ref}}}}}",
+        ]
+        lines.extend(
+            f"\\expandafter\\def\\csname {MACRO}@{key}\\endcsname{{{page}}}" for key, page in self.pages.items()
+        )
+        return lines
+
+    def build(self, glyph: Callable[[str], Path | None]) -> bool:
+        """Write the sheet from per-emoji images unless it is already current.
+
+        glyph returns the image file of an emoji key, or None when it is not
+        available; such pages are left blank. Returns True if the sheet was
+        (re)written.
+        """
+        if not self.pages:
+            return False
+        manifest = self.path.with_suffix(".json")
+        keys = list(self.pages)
+        try:
+            if self.path.exists() and json.loads(manifest.read_text(encoding="utf-8")) == keys:
+                return False
+        except (OSError, ValueError):
+            pass
+
+        pages = [self._load_glyph(glyph(key)) for key in keys]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.stem}.{os.getpid()}{self.path.suffix}")
+        pages[0].save(tmp, save_all=True, append_images=pages[1:], resolution=72)
+        os.replace(tmp, self.path)
+        manifest.write_text(json.dumps(keys), encoding="utf-8")
+        return True
+
+    @staticmethod
+    def _load_glyph(path: Path | None) -> Image.Image:
+        """Return an RGBA glyph image, blank if the file is missing or unreadable."""
+        if path is not None:
+            try:
+                with Image.open(path) as img:
+                    return img.convert("RGBA").resize(GLYPH_SIZE)
+            except OSError:
+                pass
+        return Image.new("RGBA", GLYPH_SIZE, (255, 255, 255, 0))
@@ -0,0 +1,74 @@
+"""Fast feature detection over a parsed HTML document."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import re
+from typing import Any
+
+EMOJI_PATTERN = re.compile(
+    r"[" "\U0001f300-\U0001f9ff" "\U0001fa00-\U0001fa6f" "\u2600-\u26ff" "\u2700-\u27bf" "]",
+    flags=re.UNICODE,
+)
+ARABIC_PATTERN = re.compile(r"[\u0600-\u06ff]")
+
+
+@dataclass
+class FeatureSet:
+    """Packages and listing languages a document needs.
+
+    Attributes:
+        packages: Package flags keyed like HTMLtoTeXConverter.required_packages
+        languages: Listing languages referenced by code blocks
+        emoji: Distinct emoji characters in the text
+        nodes: Number of element and text nodes below the root
+
+    """
+
+    packages: dict[str, bool] = field(default_factory=dict)
+    languages: set[str] = field(default_factory=set)
+    emoji: set[str] = field(default_factory=set)
+    nodes: int = 0
+
+
+def scan_features(soup: Any) -> FeatureSet:
+    """Work out required packages and languages without converting the body.
+
+    The scan may over-approximate (a package that ends up unused is harmless)
+    but never misses a feature the converters would switch on.
+    """
+    features = FeatureSet()
+    packages = features.packages
+    strings: list[str] = []
+    nodes = 0
+
+    # One walk over descendants is several times cheaper than find_all().
+    for node in soup.descendants:
+        nodes += 1
+        name = getattr(node, "name", None)
+        if name is None:
+            strings.append(node)
+        elif name == "pre":
+            packages["listings"] = True
+            code_tag = node.find("code")
+            for cls in code_tag.get("class", []) if code_tag else []:
+                if cls.startswith("language-"):
+                    features.languages.add(cls.replace("language-", ""))
+                    break
+        elif name == "mark":
+            packages["soul"] = True
+        elif name == "p":
+            if "highlighted" in node.get("class", []):
+                packages["mdframed"] = True
+        elif name == "a" and node.get("href"):
+            packages["hyperref"] = True
+
+    features.nodes = nodes
+    text = "".join(strings)
+    features.emoji = set(EMOJI_PATTERN.findall(text))
+    if features.emoji:
+        packages["emoji"] = True
+    if ARABIC_PATTERN.search(text):
+        packages["amiri"] = True
+
+    return features
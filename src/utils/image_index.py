@@ -0,0 +1,180 @@
+"""Persistent index of image header metadata, keyed by content hash."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, UnidentifiedImageError
+
+from src.utils.requirements_probe import default_cache_file
+from src.utils.stages import file_digest, write_text_atomic
+
+INDEX_VERSION = 1
+MAX_ENTRIES = 20000
+MAX_IMAGE_DIMENSION = 2000  # Pixels; larger images are downscaled before compiling
+DEFAULT_DPI = 72.0  # What xdvipdfmx assumes for images that carry no resolution
+COMPILER_FORMATS = {"PNG", "JPEG"}
+HIGH_DEPTH_MODES = {"I", "I;16", "I;16B", "I;16L", "F"}
+
+
+def default_index_file() -> Path:
+    """Return the per-user image index location."""
+    return default_cache_file().with_name("image-index.json")
+
+
+@dataclass
+class ImageInfo:
+    """Header metadata of one image.
+
+    Attributes:
+        digest: SHA-256 of the file content
+        format: PIL format name, such as "PNG" or "JPEG"
+        width: Width in pixels
+        height: Height in pixels
+        dpi: Horizontal and vertical resolution, None when the file has none
+        mode: PIL color mode, such as "RGB", "RGBA" or "CMYK"
+        reencode: Reasons the image should be re-encoded before compiling
+
+    """
+
+    digest: str
+    format: str | None
+    width: int
+    height: int
+    dpi: tuple[float, float] | None = None
+    mode: str = ""
+    reencode: list[str] = field(default_factory=list)
+
+    def natural_size(self) -> tuple[float, float]:
+        """Return the size in big points that TeX would derive from the file."""
+        dpi_x, dpi_y = self.dpi or (DEFAULT_DPI, DEFAULT_DPI)
+        return self.width * 72 / dpi_x, self.height * 72 / dpi_y
+
+
+def probe_image(path: Path, digest: str) -> ImageInfo | None:
+    """Read an image's header, without decoding pixel data, and flag problems."""
+    try:
+        # PIL parses only the header on open; pixels are decoded on first access.
+        with Image.open(path) as img:
+            info = ImageInfo(digest, img.format, img.width, img.height, mode=img.mode)
+            dpi = img.info.get("dpi")
+    except (OSError, UnidentifiedImageError, ValueError):
+        return None
+
+    if dpi and all(float(d) > 1 for d in dpi[:2]):
+        info.dpi = (round(float(dpi[0]), 3), round(float(dpi[1]), 3))
+    if info.format not in COMPILER_FORMATS:
+        info.reencode.append(f"{info.format or 'unknown'} format")
+    if max(info.width, info.height) > MAX_IMAGE_DIMENSION:
+        info.reencode.append(f"larger than {MAX_IMAGE_DIMENSION} px")
+    if info.mode == "CMYK":
+        info.reencode.append("CMYK color")
+    elif info.mode in HIGH_DEPTH_MODES:
+        info.reencode.append("16-bit or float samples")
+    return info
+
+
+class ImageIndex:
+    """Image metadata that survives between runs.
+
+    Entries are keyed by content hash, so a file that is copied, renamed or
+    shared between documents is probed once. A side table maps each path to
+    the size and mtime it had when hashed, which lets unchanged files skip
+    hashing too. The index file is read on first use and written by save().
+
+    Attributes:
+        path: Index file
+        stats: Counters for lookups served from the index and images probed
+
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = Path(path) if path is not None else default_index_file()
+        self.stats = {"hits": 0, "probed": 0}
+        self._entries: dict[str, ImageInfo] | None = None
+        self._paths: dict[str, list] = {}
+        self._dirty = False
+        self._new_entries: dict[str, ImageInfo] = {}
+        self._new_paths: dict[str, list] = {}
+
+    def lookup(self, path: Path) -> ImageInfo | None:
+        """Return metadata for the image at path, probing it if it is not indexed."""
+        entries = self._load()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        hint = self._paths.get(key)
+        if hint is not None and hint[0] == stat.st_size and hint[1] == stat.st_mtime_ns:
+            digest = hint[2]
+        else:
+            digest = file_digest(path)
+            if digest is None:
+                return None
+            self._paths[key] = self._new_paths[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty = True
+
+        info = entries.pop(digest, None)
+        if info is not None:
+            self.stats["hits"] += 1
+        else:
+            info = probe_image(path, digest)
+            if info is None:
+                return None
+            self.stats["probed"] += 1
+            self._new_entries[digest] = info
+            self._dirty = True
+        entries[digest] = info  # Most recently used last
+        return info
+
+    def take_changes(self) -> dict[str, Any]:
+        """Return what lookups added since the last call, for merge() into an index in another process."""
+        changes = {"entries": list(self._new_entries.values()), "paths": self._new_paths}
+        self._new_entries, self._new_paths = {}, {}
+        return changes
+
+    def merge(self, changes: dict[str, Any]) -> None:
+        """Add entries and path hints returned by another index's take_changes()."""
+        if not changes.get("entries") and not changes.get("paths"):
+            return
+        entries = self._load()
+        for info in changes["entries"]:
+            entries.pop(info.digest, None)
+            entries[info.digest] = info
+        self._paths.update(changes["paths"])
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the index atomically if anything changed, dropping the least recently used entries."""
+        if not self._dirty or self._entries is None:
+            return
+        entries = list(self._entries.values())[-MAX_ENTRIES:]
+        live = {info.digest for info in entries}
+        state = {
+            "version": INDEX_VERSION,
+            "entries": [asdict(info) for info in entries],
+            "paths": {key: hint for key, hint in self._paths.items() if hint[2] in live},
+        }
+        write_text_atomic(self.path, json.dumps(state))
+        self._dirty = False
+
+    def _load(self) -> dict[str, ImageInfo]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            if state.get("version") == INDEX_VERSION:
+                for entry in state["entries"]:
+                    dpi = entry.pop("dpi")
+                    info = ImageInfo(**entry, dpi=tuple(dpi) if dpi else None)
+                    self._entries[info.digest] = info
+                self._paths = dict(state["paths"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries, self._paths = {}, {}
+        return self._entries
@@ -0,0 +1,152 @@
+"""Per-section fragment cache for incremental reconversion."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+STATE_VERSION = 1
+# Elements the converters render as the plain concatenation of their children.
+TRANSPARENT = frozenset({"[document]", "html", "body"})
+
+
+@dataclass
+class SectionFragment:
+    """Rendered TeX of one section and the side effects it had.
+
+    Attributes:
+        digest: Hash of the section's HTML and referenced image files
+        tex: Rendered TeX fragment
+        packages: required_packages flags the section switched on
+        images: (src, placed path) pairs of images the section ingested
+        listings: Code of the externalized listings the section references
+        image_info: (src, ImageInfo or None) pairs for those images; filled
+            only by parallel workers, whose converter state the parent lacks
+        index_changes: ImageIndex.take_changes() of a parallel worker
+        asset_changes: AssetIngestor.take_changes() of a parallel worker
+
+    """
+
+    digest: str
+    tex: str
+    packages: list[str] = field(default_factory=list)
+    images: list[list[str]] = field(default_factory=list)
+    listings: list[str] = field(default_factory=list)
+    image_info: list[list[Any]] = field(default_factory=list)
+    index_changes: dict[str, Any] = field(default_factory=dict)
+    asset_changes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class IncrementalStats:
+    """Reuse counters for one incremental run."""
+
+    reused: int = 0
+    rebuilt: int = 0
+
+    @property
+    def total(self) -> int:
+        """Return the number of sections in the document."""
+        return self.reused + self.rebuilt
+
+
+def split_sections(root: Any) -> list[list[Any]]:
+    """Group top-level nodes into sections that each start at an h1.
+
+    Containers rendered transparently (the document, html and body) are
+    flattened, so concatenating the rendered units reproduces a full
+    conversion byte for byte.
+    """
+    sections: list[list[Any]] = [[]]
+    for unit in flatten_units(root):
+        if getattr(unit, "name", None) == "h1" and sections[-1]:
+            sections.append([])
+        sections[-1].append(unit)
+    return [section for section in sections if section]
+
+
+def flatten_units(node: Any) -> Iterator[Any]:
+    """Yield the top-level units below node, looking through transparent containers."""
+    for child in node.children:
+        if getattr(child, "name", None) in TRANSPARENT:
+            yield from flatten_units(child)
+        else:
+            yield child
+
+
+def section_digest(units: Iterable[Any], image_stamp: Callable[[str], str]) -> str:
+    """Hash a section's structure, text, attributes and referenced images.
+
+    Each element contributes its name, attributes and child count, which
+    pins down the tree shape. image_stamp maps an img src to a string that
+    changes when the image file does.
+    """
+    h = hashlib.sha256()
+    stack = list(reversed(list(units)))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            h.update(b"\x00T")
+            h.update(node.encode("utf-8", "surrogatepass"))
+            continue
+        children = list(node.children)
+        attrs = sorted((k, " ".join(v) if isinstance(v, list) else v) for k, v in node.attrs.items())
+        h.update(f"\x00E{node.name}\x01{attrs!r}\x01{len(children)}".encode("utf-8", "surrogatepass"))
+        if node.name == "img" and node.get("src"):
+            h.update(image_stamp(node.get("src")).encode("utf-8", "surrogatepass"))
+        stack.extend(reversed(children))
+    return h.hexdigest()
+
+
+class SectionCache:
+    """JSON store of section fragments from the previous run.
+
+    Fragments are looked up by digest, so sections that moved are reused
+    too. The whole store is discarded when the render options key changes.
+
+    Attributes:
+        path: State file location
+        options_key: Identifies converter settings that affect rendered TeX
+
+    """
+
+    def __init__(self, path: Path, options_key: str) -> None:
+        self.path = Path(path)
+        self.options_key = options_key
+        self.previous: dict[str, SectionFragment] = {}
+        self.current: list[SectionFragment] = []
+        self._load()
+
+    def get(self, digest: str) -> SectionFragment | None:
+        """Return the previous fragment for digest, if any."""
+        return self.previous.get(digest)
+
+    def add(self, fragment: SectionFragment) -> None:
+        """Record a fragment used in this run."""
+        self.current.append(fragment)
+
+    def save(self) -> None:
+        """Persist this run's fragments atomically."""
+        state = {
+            "version": STATE_VERSION,
+            "options": self.options_key,
+            "sections": [asdict(fragment) for fragment in self.current],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            if state.get("version") != STATE_VERSION or state.get("options") != self.options_key:
+                return
+            self.previous = {entry["digest"]: SectionFragment(**entry) for entry in state["sections"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.previous = {}
@@ -0,0 +1,44 @@
+"""Content-addressed side files for externalized code listings."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+
+class ListingStore:
+    """Write each distinct code block once, named by its content hash.
+
+    Attributes:
+        directory: Directory holding the listing files
+        stats: Counters for files written and blocks served by an existing file
+
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.stats = {"written": 0, "reused": 0}
+        self._known: set[str] = set()
+
+    def path_for(self, data: bytes) -> Path:
+        """Return the side file name for the encoded code block."""
+        return self.directory / f"{hashlib.sha256(data).hexdigest()[:20]}.txt"
+
+    def store(self, code: str) -> Path:
+        """Return the side file holding code, writing it if it does not exist yet."""
+        data = code.encode("utf-8")
+        path = self.path_for(data)
+
+        if path.name in self._known or path.exists():
+            self._known.add(path.name)
+            self.stats["reused"] += 1
+            return path
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._known.add(path.name)
+        self.stats["written"] += 1
+        return path
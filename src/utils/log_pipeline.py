@@ -0,0 +1,180 @@
+"""Queue-based logging: callers enqueue records, a listener thread does the I/O."""
+
+from __future__ import annotations
+
+import atexit
+from collections.abc import Iterator
+import contextlib
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+from pathlib import Path
+import queue
+import sys
+import threading
+from typing import TextIO
+
+FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+FLUSH_TIMEOUT = 5.0  # Seconds detach_log_file waits for queued records to be written
+
+_listener: _Listener | None = None
+_queue_handler: _Enqueue | None = None
+_log_files: dict[str, list] = {}  # Absolute path -> [FileHandler, number of users]
+_lock = threading.Lock()
+
+
+class _Enqueue(QueueHandler):
+    """QueueHandler that resolves the message in place instead of copying the record."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render args now so the listener never reads objects the caller may mutate;
+        # the default prepare also formats a full line and copies the record, which the
+        # listener's own formatters redo anyway.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _Barrier:
+    """Queue marker the listener acknowledges once every record put before it is handled."""
+
+    def __init__(self) -> None:
+        self.reached = threading.Event()
+
+
+class _Listener(QueueListener):
+    """QueueListener that acknowledges _Barrier markers instead of handling them."""
+
+    def handle(self, record: logging.LogRecord | _Barrier) -> None:
+        if isinstance(record, _Barrier):
+            record.reached.set()
+            return
+        super().handle(record)
+
+
+def resolve_level(level: int | str) -> int:
+    """Return the numeric level for a name such as "INFO" or a number."""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        msg = f"Unknown log level: {level}"
+        raise ValueError(msg)
+    return value
+
+
+def configure_logging(level: int | str = logging.INFO, stream: TextIO | None = None) -> None:
+    """Route root logging through a queue to a stream handler, once per process.
+
+    The root logger's level filters records before anything is formatted,
+    so disabled calls cost one level check. Records that pass are put on an
+    unbounded queue; a background QueueListener formats and writes them.
+    Only the first call sets up the pipeline and the console level; later
+    calls leave both alone, so one converter cannot reconfigure another's
+    logging. Log files are added with attach_log_file() or log_to_file().
+    """
+    global _listener, _queue_handler  # noqa: PLW0603
+
+    with _lock:
+        if _listener is not None:
+            return
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setLevel(resolve_level(level))
+        handler.setFormatter(logging.Formatter(FORMAT))
+
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _queue_handler = _Enqueue(records)
+        _listener = _Listener(records, handler, respect_handler_level=True)
+        logging.getLogger().addHandler(_queue_handler)
+        _update_root_level()
+        _listener.start()
+
+
+def attach_log_file(log_file: Path, level: int | str = logging.INFO) -> None:
+    """Also write records at level and above to log_file, starting the pipeline if needed.
+
+    Attaching a file that is already attached only counts the extra user,
+    so concurrent runs sharing a log file do not write each record twice.
+    """
+    configure_logging(level)
+    key = os.path.abspath(log_file)
+    with _lock:
+        if key in _log_files:
+            _log_files[key][1] += 1
+            return
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setLevel(resolve_level(level))
+        handler.setFormatter(logging.Formatter(FORMAT))
+        _log_files[key] = [handler, 1]
+        _listener.handlers = (*_listener.handlers, handler)
+        _update_root_level()
+
+
+def detach_log_file(log_file: Path) -> None:
+    """Write out the records queued so far and close log_file once its last user detaches."""
+    key = os.path.abspath(log_file)
+    with _lock:
+        entry = _log_files.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _log_files[key]
+        listener = _listener
+
+    handler = entry[0]
+    if listener is not None:
+        barrier = _Barrier()
+        listener.queue.put_nowait(barrier)
+        barrier.reached.wait(FLUSH_TIMEOUT)
+        with _lock:
+            listener.handlers = tuple(h for h in listener.handlers if h is not handler)
+            _update_root_level()
+    handler.close()
+
+
+@contextlib.contextmanager
+def log_to_file(log_file: Path, level: int | str = logging.INFO) -> Iterator[None]:
+    """Attach log_file for the duration of the block."""
+    attach_log_file(log_file, level)
+    try:
+        yield
+    finally:
+        detach_log_file(log_file)
+
+
+def stop_logging() -> None:
+    """Drain the queue, stop the listener and close its handlers."""
+    global _listener, _queue_handler  # noqa: PLW0603
+
+    with _lock:
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = _queue_handler = None
+        _log_files.clear()
+
+
+def _update_root_level() -> None:
+    """Let through what the most verbose handler wants, and nothing more."""
+    logging.getLogger().setLevel(min(handler.level for handler in _listener.handlers))
+
+
+def _reset_after_fork() -> None:
+    """Forget the parent's pipeline in a forked child, whose listener thread did not survive the fork."""
+    global _listener, _queue_handler, _lock  # noqa: PLW0603
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    _listener = _queue_handler = None
+    _log_files.clear()
+    _lock = threading.Lock()
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,27 @@
+"""Partitioning helpers for converting one document in several processes."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+# More chunks than workers lets fast workers pick up slack from slow chunks.
+CHUNKS_PER_WORKER = 4
+
+
+def balanced_ranges(weights: Sequence[int], parts: int) -> list[tuple[int, int]]:
+    """Split indices into at most `parts` contiguous [start, stop) ranges of similar total weight."""
+    if not weights:
+        return []
+    parts = max(1, min(parts, len(weights)))
+    total = sum(weights)
+    ranges: list[tuple[int, int]] = []
+    start, acc = 0, 0
+    for index, weight in enumerate(weights):
+        acc += weight
+        # Cut once the running total reaches the next boundary, leaving one range per remaining part.
+        if len(ranges) < parts - 1 and acc * parts >= total * (len(ranges) + 1):
+            ranges.append((start, index + 1))
+            start = index + 1
+    if start < len(weights):
+        ranges.append((start, len(weights)))
+    return ranges
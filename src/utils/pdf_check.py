@@ -0,0 +1,485 @@
+"""Structural PDF validation that reads only the objects it needs."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import accumulate
+import mmap
+from pathlib import Path
+import re
+from typing import Any, NamedTuple
+import zlib
+
+_WS = rb"\x00\t\n\f\r "
+_SPACE = re.compile(rb"(?:[" + _WS + rb"]+|%[^\r\n]*)*")
+_REGULAR = rb"[^" + _WS + rb"()<>\[\]{}/%]"
+_NAME = re.compile(rb"/(" + _REGULAR + rb"*)")
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_REF_TAIL = re.compile(rb"[" + _WS + rb"]+(\d+)[" + _WS + rb"]+R(?!" + _REGULAR + rb")")
+_KEYWORD = re.compile(rb"[A-Za-z]+")
+_HEX = re.compile(rb"<([0-9A-Fa-f" + _WS + rb"]*)>")
+_OBJ_HEADER = re.compile(rb"[" + _WS + rb"]*(\d+)[" + _WS + rb"]+(\d+)[" + _WS + rb"]+obj")
+_XREF_SUBSECTION = re.compile(rb"(\d+)[ ]+(\d+)[ \t]*(?:\r\n|\r|\n)")
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_HEADER = re.compile(rb"%PDF-(\d\.\d)")
+_STARTXREF = re.compile(rb"startxref[" + _WS + rb"]+(\d+)[" + _WS + rb"]+%%EOF")
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")
+
+HEADER_WINDOW = 1024
+TAIL_WINDOW = 4096
+MAX_XREF_SECTIONS = 256
+
+
+class PdfStructureError(ValueError):
+    """The file is not a structurally sound PDF."""
+
+
+class Ref(NamedTuple):
+    """Indirect object reference."""
+
+    num: int
+    gen: int
+
+
+@dataclass
+class PdfReport:
+    """Outcome of a structural check.
+
+    Attributes:
+        path: File that was checked
+        version: Version from the header, e.g. "1.5"
+        pages: Page count from the page tree root
+        fonts: Base font names (subset prefix removed) used on the sampled pages
+        errors: Problems found; empty when the file passed
+
+    """
+
+    path: Path
+    version: str = ""
+    pages: int = 0
+    fonts: set[str] = field(default_factory=set)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return True if no problems were found."""
+        return not self.errors
+
+
+@dataclass
+class _Stream:
+    info: dict[str, Any]
+    start: int
+
+
+@dataclass
+class _XrefTable:
+    """Classic xref section: (first object, count, file offset of entries) per subsection."""
+
+    subsections: list[tuple[int, int, int]]
+
+
+@dataclass
+class _XrefStream:
+    """Decoded xref stream rows, located by arithmetic instead of a full index."""
+
+    data: bytes
+    widths: tuple[int, int, int]
+    ranges: list[tuple[int, int, int]]  # (first object, count, first row)
+
+
+class _Parser:
+    """Parser for the PDF object syntax over bytes or a memory map."""
+
+    def __init__(self, buf: Any) -> None:
+        self.buf = buf
+        self.size = len(buf)
+
+    def parse(self, position: int) -> tuple[Any, int]:
+        """Parse one direct object at position and return it with the end offset."""
+        buf = self.buf
+        position = _SPACE.match(buf, position).end()
+        head = buf[position : position + 2]
+        if head == b"<<":
+            result: dict[str, Any] = {}
+            position += 2
+            while True:
+                position = _SPACE.match(buf, position).end()
+                if buf[position : position + 2] == b">>":
+                    return result, position + 2
+                key = _NAME.match(buf, position)
+                if key is None:
+                    raise PdfStructureError(f"dictionary key expected at {position}")
+                result[_decode_name(key.group(1))], position = self.parse(key.end())
+        if head[:1] == b"[":
+            items = []
+            position += 1
+            while True:
+                position = _SPACE.match(buf, position).end()
+                if buf[position : position + 1] == b"]":
+                    return items, position + 1
+                item, position = self.parse(position)
+                items.append(item)
+        if head[:1] == b"/":
+            match = _NAME.match(buf, position)
+            return _decode_name(match.group(1)), match.end()
+        if head[:1] == b"(":
+            return self.parse_literal(position + 1)
+        if head[:1] == b"<":
+            match = _HEX.match(buf, position)
+            if match is None:
+                raise PdfStructureError(f"malformed hex string at {position}")
+            digits = re.sub(rb"[" + _WS + rb"]", b"", match.group(1))
+            return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode()), match.end()
+        match = _NUMBER.match(buf, position)
+        if match is not None:
+            token = match.group()
+            if b"." in token:
+                return float(token), match.end()
+            ref = _REF_TAIL.match(buf, match.end())
+            if ref is not None:
+                return Ref(int(token), int(ref.group(1))), ref.end()
+            return int(token), match.end()
+        match = _KEYWORD.match(buf, position)
+        if match is not None and match.group() in (b"true", b"false", b"null"):
+            return {b"true": True, b"false": False, b"null": None}[match.group()], match.end()
+        raise PdfStructureError(f"unexpected token at offset {position}")
+
+    def parse_literal(self, position: int) -> tuple[bytes, int]:
+        """Parse a (string) body starting just after the opening parenthesis."""
+        depth, start, buf = 1, position, self.buf
+        while depth:
+            if position >= self.size:
+                raise PdfStructureError("unterminated string")
+            char = buf[position : position + 1]
+            if char == b"\\":
+                position += 1
+            elif char == b"(":
+                depth += 1
+            elif char == b")":
+                depth -= 1
+            position += 1
+        return bytes(buf[start : position - 1]), position
+
+
+class PdfFile:
+    """Lazy object access to a memory-mapped PDF.
+
+    Only the header, the tail, the cross-reference sections and objects that
+    are explicitly resolved are read, so the cost is independent of how much
+    page content the file carries.
+
+    Attributes:
+        version: Version from the header
+        trailer: Merged trailer dictionary (newest section wins)
+
+    """
+
+    def __init__(self, buf: Any) -> None:
+        self.buf = buf
+        self.size = len(buf)
+        self.parser = _Parser(buf)
+        self.version = ""
+        self.trailer: dict[str, Any] = {}
+        self._sections: list[_XrefTable | _XrefStream] = []
+        self._object_streams: dict[int, tuple[bytes, dict[int, int]]] = {}
+        self._read_structure()
+
+    def _read_structure(self) -> None:
+        header = _HEADER.search(self.buf, 0, min(self.size, HEADER_WINDOW))
+        if header is None:
+            raise PdfStructureError("missing %PDF header")
+        self.version = header.group(1).decode()
+
+        tail_start = max(self.size - TAIL_WINDOW, 0)
+        position = self.buf.rfind(b"startxref", tail_start)
+        match = _STARTXREF.match(self.buf, position) if position >= 0 else None
+        if match is None:
+            raise PdfStructureError("missing startxref/%%EOF at end of file")
+
+        offset: int | None = int(match.group(1))
+        visited: set[int] = set()
+        while offset is not None:
+            if offset in visited or len(visited) >= MAX_XREF_SECTIONS:
+                raise PdfStructureError("cross-reference /Prev chain loops")
+            if not 0 <= offset < self.size:
+                raise PdfStructureError(f"cross-reference offset {offset} outside file")
+            visited.add(offset)
+            trailer = self._read_xref_section(offset)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            if isinstance(trailer.get("XRefStm"), int):
+                self._read_xref_section(trailer["XRefStm"])
+            prev = trailer.get("Prev")
+            offset = prev if isinstance(prev, int) else None
+
+        for key in ("Root", "Size"):
+            if key not in self.trailer:
+                raise PdfStructureError(f"trailer has no /{key}")
+        if "Encrypt" in self.trailer:
+            raise PdfStructureError("encrypted PDFs are not supported")
+
+    def _read_xref_section(self, offset: int) -> dict[str, Any]:
+        position = _SPACE.match(self.buf, offset).end()
+        if self.buf[position : position + 4] == b"xref":
+            return self._read_xref_table(position + 4)
+        obj = self._parse_indirect(position)
+        if not isinstance(obj, _Stream) or obj.info.get("Type") != "XRef":
+            raise PdfStructureError(f"startxref does not point at a cross-reference section ({offset})")
+        self._add_xref_stream(obj)
+        return obj.info
+
+    def _read_xref_table(self, position: int) -> dict[str, Any]:
+        subsections = []
+        while True:
+            position = _SPACE.match(self.buf, position).end()
+            if self.buf[position : position + 7] == b"trailer":
+                break
+            match = _XREF_SUBSECTION.match(self.buf, position)
+            if match is None:
+                raise PdfStructureError(f"malformed xref subsection at {position}")
+            first, count = int(match.group(1)), int(match.group(2))
+            subsections.append((first, count, match.end()))
+            position = match.end() + 20 * count
+            if position > self.size:
+                raise PdfStructureError("xref table runs past end of file")
+        self._sections.append(_XrefTable(subsections))
+        trailer, _end = self.parser.parse(position + 7)
+        if not isinstance(trailer, dict):
+            raise PdfStructureError("trailer is not a dictionary")
+        return trailer
+
+    def _add_xref_stream(self, stream: _Stream) -> None:
+        widths = stream.info.get("W")
+        size = stream.info.get("Size")
+        if not (isinstance(widths, list) and len(widths) == 3 and isinstance(size, int)):
+            raise PdfStructureError("xref stream lacks /W or /Size")
+        index = stream.info.get("Index", [0, size])
+        ranges, row = [], 0
+        for first, count in zip(index[::2], index[1::2]):
+            ranges.append((first, count, row))
+            row += count
+        data = self.stream_data(stream)
+        if len(data) < row * sum(widths):
+            raise PdfStructureError("xref stream is truncated")
+        self._sections.append(_XrefStream(data, (widths[0], widths[1], widths[2]), ranges))
+
+    def _lookup(self, num: int) -> tuple[int, int, int] | None:
+        """Return (type, field2, field3) for object num from the newest section defining it."""
+        for section in self._sections:
+            if isinstance(section, _XrefTable):
+                for first, count, start in section.subsections:
+                    if first <= num < first + count:
+                        entry = _XREF_ENTRY.match(self.buf, start + 20 * (num - first))
+                        if entry is None:
+                            raise PdfStructureError(f"malformed xref entry for object {num}")
+                        kind = 1 if entry.group(3) == b"n" else 0
+                        return kind, int(entry.group(1)), int(entry.group(2))
+                continue
+            for first, count, row in section.ranges:
+                if first <= num < first + count:
+                    w1, w2, w3 = section.widths
+                    at = (row + num - first) * (w1 + w2 + w3)
+                    data = section.data
+                    kind = int.from_bytes(data[at : at + w1], "big") if w1 else 1
+                    f2 = int.from_bytes(data[at + w1 : at + w1 + w2], "big")
+                    f3 = int.from_bytes(data[at + w1 + w2 : at + w1 + w2 + w3], "big")
+                    return kind, f2, f3
+        return None
+
+    def resolve(self, value: Any, depth: int = 0) -> Any:
+        """Follow indirect references until a direct object is reached."""
+        while isinstance(value, Ref):
+            if depth > 32:
+                raise PdfStructureError("reference chain too deep")
+            value = self._load(value.num)
+            depth += 1
+        return value
+
+    def _load(self, num: int) -> Any:
+        entry = self._lookup(num)
+        if entry is None or entry[0] == 0:
+            return None
+        kind, f2, f3 = entry
+        if kind == 2:
+            return self._from_object_stream(f2, f3, num)
+        if not 0 <= f2 < self.size:
+            raise PdfStructureError(f"object {num} offset {f2} outside file")
+        header = _OBJ_HEADER.match(self.buf, f2)
+        if header is None or int(header.group(1)) != num:
+            raise PdfStructureError(f"xref offset for object {num} does not point at it")
+        return self._parse_indirect(f2)
+
+    def _parse_indirect(self, position: int) -> Any:
+        header = _OBJ_HEADER.match(self.buf, position)
+        if header is None:
+            raise PdfStructureError(f"no object at offset {position}")
+        value, end = self.parser.parse(header.end())
+        if isinstance(value, dict):
+            end = _SPACE.match(self.buf, end).end()
+            if self.buf[end : end + 6] == b"stream":
+                end += 6
+                if self.buf[end : end + 2] == b"\r\n":
+                    end += 2
+                elif self.buf[end : end + 1] in (b"\n", b"\r"):
+                    end += 1
+                return _Stream(value, end)
+        return value
+
+    def _from_object_stream(self, stream_num: int, index: int, num: int) -> Any:
+        if stream_num not in self._object_streams:
+            stream = self.resolve(Ref(stream_num, 0))
+            if not isinstance(stream, _Stream):
+                raise PdfStructureError(f"object stream {stream_num} missing")
+            data = self.stream_data(stream)
+            first = stream.info.get("First", 0)
+            parser = _Parser(data)
+            offsets: dict[int, int] = {}
+            position = 0
+            for _ in range(stream.info.get("N", 0)):
+                obj_num, position = parser.parse(position)
+                obj_offset, position = parser.parse(position)
+                offsets[obj_num] = first + obj_offset
+            self._object_streams[stream_num] = (data, offsets)
+        data, offsets = self._object_streams[stream_num]
+        if num not in offsets:
+            raise PdfStructureError(f"object {num} not in object stream {stream_num} (index {index})")
+        return _Parser(data).parse(offsets[num])[0]
+
+    def stream_data(self, stream: _Stream) -> bytes:
+        """Return the decoded bytes of a stream (FlateDecode with PNG predictors or none)."""
+        length = self.resolve(stream.info.get("Length"))
+        if not isinstance(length, int) or stream.start + length > self.size:
+            raise PdfStructureError("stream length missing or past end of file")
+        data = bytes(self.buf[stream.start : stream.start + length])
+        filters = stream.info.get("Filter", [])
+        filters = filters if isinstance(filters, list) else [filters]
+        params = stream.info.get("DecodeParms") or {}
+        for name in filters:
+            if name != "FlateDecode":
+                raise PdfStructureError(f"unsupported stream filter /{name}")
+            data = zlib.decompress(data)
+        predictor = params.get("Predictor", 1) if isinstance(params, dict) else 1
+        if predictor >= 10:
+            data = _png_unpredict(data, params.get("Columns", 1))
+        return data
+
+    def page_tree(self) -> dict[str, Any]:
+        """Return the root of the page tree."""
+        catalog = self.resolve(self.trailer["Root"])
+        if not isinstance(catalog, dict) or catalog.get("Type") != "Catalog":
+            raise PdfStructureError("/Root is not a catalog")
+        pages = self.resolve(catalog.get("Pages"))
+        if not isinstance(pages, dict) or pages.get("Type") != "Pages":
+            raise PdfStructureError("catalog has no page tree")
+        return pages
+
+    def page_fonts(self, root: dict[str, Any], limit: int) -> set[str]:
+        """Collect base font names from the resources of the first `limit` pages."""
+        fonts: set[str] = set()
+        seen = 0
+        stack: list[tuple[dict[str, Any], Any]] = [(root, None)]
+        while stack and seen < limit:
+            node, inherited = stack.pop()
+            resources = self.resolve(node.get("Resources")) or inherited
+            if node.get("Type") == "Pages":
+                kids = self.resolve(node.get("Kids")) or []
+                stack.extend((self.resolve(kid), resources) for kid in reversed(kids[: limit - seen]))
+                continue
+            seen += 1
+            font_dict = self.resolve(resources.get("Font")) if isinstance(resources, dict) else None
+            for font in (font_dict or {}).values():
+                font = self.resolve(font)
+                if isinstance(font, dict) and isinstance(font.get("BaseFont"), str):
+                    fonts.add(_SUBSET_PREFIX.sub("", font["BaseFont"]))
+        return fonts
+
+
+def check_pdf(
+    path: Path,
+    expected_pages: int | None = None,
+    required_fonts: Iterable[str] = (),
+    font_pages: int = 8,
+) -> PdfReport:
+    """Validate a PDF's structure, page count and fonts without reading its content.
+
+    The file is memory-mapped; the header, trailer, cross-reference
+    sections, catalog, page tree root and the resources of the first
+    font_pages pages are the only parts touched. A required font matches
+    any base font whose name contains it, ignoring case.
+    """
+    report = PdfReport(Path(path))
+    wanted = [font.lower() for font in required_fonts]
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                report.errors.append("file is empty")
+                return report
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                pdf = PdfFile(buf)
+                report.version = pdf.version
+                root = pdf.page_tree()
+                count = pdf.resolve(root.get("Count"))
+                if not isinstance(count, int) or count < 1:
+                    report.errors.append("page tree has no pages")
+                else:
+                    report.pages = count
+                if wanted:
+                    report.fonts = pdf.page_fonts(root, font_pages)
+    except OSError as e:
+        report.errors.append(f"cannot read file: {e}")
+        return report
+    except (PdfStructureError, zlib.error, IndexError, KeyError, TypeError, AttributeError, ValueError) as e:
+        report.errors.append(f"{type(e).__name__}: {e}" if not isinstance(e, PdfStructureError) else str(e))
+        return report
+
+    if expected_pages is not None and report.pages and report.pages != expected_pages:
+        report.errors.append(f"expected {expected_pages} pages, found {report.pages}")
+    for font in wanted:
+        if not any(font in name.lower() for name in report.fonts):
+            report.errors.append(f"font {font!r} not found on the first {font_pages} pages")
+    return report
+
+
+def _decode_name(raw: bytes) -> str:
+    if b"#" in raw:
+        raw = re.sub(rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), raw)
+    return raw.decode("latin-1")
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """Undo PNG row predictors (Predictor >= 10) for byte-aligned rows."""
+    row_size = columns + 1
+    rows = len(data) // row_size
+    data = data[: rows * row_size]
+    kinds = data[::row_size]
+    if kinds.count(2) == rows:
+        # All rows use "Up", as PDF writers emit for xref streams: each column is a
+        # running sum mod 256, computed per column at C speed.
+        out = bytearray(rows * columns)
+        for column in range(columns):
+            out[column::columns] = bytes(map((255).__and__, accumulate(data[column + 1 :: row_size])))
+        return bytes(out)
+    out = bytearray()
+    previous = bytearray(columns)
+    for start in range(0, len(data) - row_size + 1, row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1 : start + row_size])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                upper_left = previous[i - 1] if i else 0
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upper_left)) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
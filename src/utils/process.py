@@ -0,0 +1,163 @@
+"""Subprocess helpers that can kill a whole process tree."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Any
+
+from src.utils.progress import CancelToken
+
+POLL_INTERVAL = 0.05
+
+
+def new_group_kwargs() -> dict[str, Any]:
+    """Return Popen keyword arguments that start a child in its own process group."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_process_tree(pid: int) -> None:
+    """Kill a process started with new_group_kwargs() and all of its descendants."""
+    if sys.platform == "win32":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            capture_output=True,
+            check=False,
+        )
+        return
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signal.SIGKILL)
+
+
+async def run_process_tree(
+    command: list[str],
+    timeout: float,
+    env: dict[str, str] | None = None,
+    cwd: str | os.PathLike[str] | None = None,
+    on_output: Callable[[str], None] | None = None,
+) -> tuple[int, str, str]:
+    """Run command in its own process group and return (returncode, stdout, stderr).
+
+    stdout is passed to on_output line by line while the command runs. On
+    timeout or cancellation the whole process group is killed, including
+    anything xelatex spawned under -shell-escape, before the exception
+    propagates.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        cwd=cwd,
+        **new_group_kwargs(),
+    )
+
+    async def read_stdout() -> bytes:
+        lines = []
+        async for line in proc.stdout:
+            lines.append(line)
+            if on_output is not None:
+                on_output(line.decode("utf-8", errors="replace"))
+        return b"".join(lines)
+
+    async def communicate() -> tuple[bytes, bytes]:
+        stdout, stderr = await asyncio.gather(read_stdout(), proc.stderr.read())
+        await proc.wait()
+        return stdout, stderr
+
+    try:
+        stdout, stderr = await asyncio.wait_for(communicate(), timeout)
+    except BaseException:
+        kill_process_tree(proc.pid)
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        await asyncio.shield(proc.wait())
+        raise
+
+    return (
+        proc.returncode if proc.returncode is not None else -1,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+def run_watched(
+    command: list[str],
+    timeout: float,
+    cancel: CancelToken | None = None,
+    on_output: Callable[[str], None] | None = None,
+    env: dict[str, str] | None = None,
+    cwd: str | os.PathLike[str] | None = None,
+) -> tuple[int, str, str]:
+    """Run command in its own process group and return (returncode, stdout, stderr).
+
+    stdout is passed to on_output line by line while the command runs. The
+    whole process group is killed on timeout (TimeoutError) or as soon as
+    cancel is set (ConversionCancelled), before the exception propagates,
+    and also once the command exits, so background processes it left
+    behind cannot keep the output pipes open.
+    """
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        cwd=cwd,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        **new_group_kwargs(),
+    )
+    stdout: list[str] = []
+    stderr: list[str] = []
+
+    def pump_stdout() -> None:
+        for line in proc.stdout:
+            stdout.append(line)
+            if on_output is not None:
+                on_output(line)
+
+    # Both pipes are drained in threads so neither can fill up and stall the child.
+    readers = [
+        threading.Thread(target=pump_stdout, daemon=True),
+        threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    deadline = time.monotonic() + timeout
+    try:
+        while proc.poll() is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                msg = f"{command[0]} timed out after {timeout}s"
+                raise TimeoutError(msg)
+            if cancel is None:
+                with contextlib.suppress(subprocess.TimeoutExpired):
+                    proc.wait(min(remaining, POLL_INTERVAL))
+            elif cancel.wait(min(remaining, POLL_INTERVAL)):
+                cancel.raise_if_cancelled()
+    except BaseException:
+        kill_process_tree(proc.pid)
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        proc.wait()
+        raise
+    finally:
+        # Descendants that outlive the leader would hold the pipes open forever.
+        kill_process_tree(proc.pid)
+        for reader, pipe in zip(readers, (proc.stdout, proc.stderr)):
+            reader.join(max(deadline - time.monotonic(), POLL_INTERVAL))
+            if not reader.is_alive():
+                pipe.close()
+
+    return proc.returncode, "".join(stdout), "".join(stderr)
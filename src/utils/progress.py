@@ -0,0 +1,78 @@
+"""Progress events and cooperative cancellation for long conversions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import re
+import threading
+
+# xelatex writes "[<n>" to stdout as it ships out page n.
+PAGE_PATTERN = re.compile(r"\[(\d+)")
+
+
+class ConversionCancelled(BaseException):  # noqa: N818
+    """Raised where a conversion notices its CancelToken was set.
+
+    Derives from BaseException, like KeyboardInterrupt, so the converters'
+    broad ``except Exception`` handlers let it through to the caller.
+    """
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One progress report.
+
+    Attributes:
+        stage: "convert" (document nodes), "images" (images optimized) or
+            "compile" (pages shipped out by xelatex)
+        done: Units finished so far
+        total: Units expected, None when unknown
+        attempt: Compile pass, counting from 1; 0 outside the compile stage
+        detail: Item just finished, such as an image path
+
+    """
+
+    stage: str
+    done: int
+    total: int | None = None
+    attempt: int = 0
+    detail: str = ""
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+class CancelToken:
+    """Thread-safe flag a caller sets to stop a running conversion.
+
+    The converter checks it between document nodes, between images and
+    while xelatex runs, so a cancel takes effect within a node or a short
+    poll interval rather than at the end of a stage.
+
+    Attributes:
+        reason: Text passed to cancel(), used in the raised exception
+
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Request cancellation; safe to call from any thread or a signal handler."""
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to timeout seconds; return True as soon as cancellation is requested."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise ConversionCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise ConversionCancelled(self.reason)
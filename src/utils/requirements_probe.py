@@ -0,0 +1,199 @@
+"""Cached probing of the TeX and font requirements for PDF compilation."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import fnmatch
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+REQUIRED_FONTS: dict[str, tuple[str, ...]] = {
+    "amiri": ("amiri-regular.ttf", "amiri*.ttf"),
+    "noto": ("notosansarabic-regular.ttf", "notosansarabic*.ttf"),
+}
+REQUIRED_PACKAGES: tuple[str, ...] = ("polyglossia", "fontspec", "bidi", "auxhook", "xkeyval")
+CACHE_VERSION = 1
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of a requirements probe.
+
+    Attributes:
+        xelatex: Path to the xelatex executable, if found
+        missing_fonts: Keys of REQUIRED_FONTS that could not be located
+        missing_packages: LaTeX packages kpsewhich could not resolve
+        from_cache: Whether the result was served from the on-disk cache
+
+    """
+
+    xelatex: str | None = None
+    missing_fonts: list[str] = field(default_factory=list)
+    missing_packages: list[str] = field(default_factory=list)
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Return True when every requirement is satisfied."""
+        return bool(self.xelatex) and not self.missing_fonts and not self.missing_packages
+
+
+def default_cache_file() -> Path:
+    """Return the per-user cache file for probe results."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "html2tex" / "requirements.json"
+
+
+def font_dirs() -> list[Path]:
+    """Return the font directories searched on this platform."""
+    home = Path.home()
+    if sys.platform == "win32":
+        candidates = [
+            Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts",
+            Path(os.environ.get("LOCALAPPDATA", home / "AppData" / "Local")) / "Microsoft" / "Windows" / "Fonts",
+            Path(os.environ.get("APPDATA", home / "AppData" / "Roaming")) / "Microsoft" / "Windows" / "Fonts",
+        ]
+    elif sys.platform == "darwin":
+        candidates = [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library" / "Fonts"]
+    else:
+        data_home = Path(os.environ.get("XDG_DATA_HOME", home / ".local" / "share"))
+        candidates = [
+            Path("/usr/share/fonts"),
+            Path("/usr/local/share/fonts"),
+            data_home / "fonts",
+            home / ".fonts",
+        ]
+    return [path for path in candidates if path.is_dir()]
+
+
+class RequirementsProbe:
+    """Check for xelatex, fonts and LaTeX packages, caching successful results.
+
+    A successful probe is stored together with the mtimes of the xelatex
+    binary, the font directories and the directories holding every resolved
+    file. Later runs only stat those paths; any change triggers a new probe.
+    Failed probes are never cached, so installing a missing piece is picked
+    up on the next run.
+
+    Attributes:
+        cache_file: JSON file holding the last successful probe
+        fonts: Font keys mapped to lowercase filename patterns
+        packages: LaTeX package names resolved through kpsewhich
+
+    """
+
+    def __init__(
+        self,
+        cache_file: Path | None = None,
+        fonts: dict[str, tuple[str, ...]] | None = None,
+        packages: tuple[str, ...] = REQUIRED_PACKAGES,
+    ) -> None:
+        self.cache_file = cache_file or default_cache_file()
+        self.fonts = fonts or REQUIRED_FONTS
+        self.packages = packages
+
+    def run(self, use_cache: bool = True) -> ProbeResult:
+        """Return probe results, served from cache when still valid."""
+        if use_cache:
+            cached = self._load_cache()
+            if cached is not None:
+                return cached
+
+        result = ProbeResult(xelatex=shutil.which("xelatex"))
+        if not result.xelatex:
+            return result
+
+        font_files = self._locate_fonts()
+        result.missing_fonts = [key for key in self.fonts if key not in font_files]
+        package_files, result.missing_packages = self._resolve_packages()
+
+        if result.ok:
+            watched = [result.xelatex, *map(str, font_dirs())]
+            watched += [os.path.dirname(path) for path in [*font_files.values(), *package_files]]
+            self._save_cache(result, watched)
+        return result
+
+    def _locate_fonts(self) -> dict[str, str]:
+        """Map each font key to the first matching font file."""
+        found: dict[str, str] = {}
+        for path in self._font_index():
+            name = os.path.basename(path).lower()
+            for key, patterns in self.fonts.items():
+                if key not in found and any(fnmatch.fnmatch(name, p) for p in patterns):
+                    found[key] = path
+            if len(found) == len(self.fonts):
+                break
+        return found
+
+    @staticmethod
+    def _font_index() -> list[str]:
+        """List installed font files, via fontconfig when available."""
+        if sys.platform != "win32" and shutil.which("fc-list"):
+            proc = subprocess.run(
+                ["fc-list", "--format", "%{file}\\n"],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if proc.returncode == 0:
+                return proc.stdout.splitlines()
+
+        files: list[str] = []
+        for directory in font_dirs():
+            for root, _dirs, names in os.walk(directory):
+                files.extend(os.path.join(root, name) for name in names)
+        return files
+
+    def _resolve_packages(self) -> tuple[list[str], list[str]]:
+        """Resolve all packages with a single kpsewhich call."""
+        if not self.packages:
+            return [], []
+        proc = subprocess.run(
+            ["kpsewhich", *(f"{package}.sty" for package in self.packages)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        found = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+        names = {os.path.basename(path) for path in found}
+        missing = [package for package in self.packages if f"{package}.sty" not in names]
+        return found, missing
+
+    def _load_cache(self) -> ProbeResult | None:
+        """Return the cached result if every watched path is unchanged."""
+        try:
+            entry = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if entry.get("version") != CACHE_VERSION or entry.get("key") != self._key():
+                return None
+            for path, mtime in entry["stamps"].items():
+                if os.stat(path).st_mtime_ns != mtime:
+                    return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        result = ProbeResult(**entry["result"])
+        result.from_cache = True
+        return result
+
+    def _save_cache(self, result: ProbeResult, watched: list[str]) -> None:
+        """Persist a successful result with the mtimes it depends on."""
+        try:
+            stamps = {path: os.stat(path).st_mtime_ns for path in dict.fromkeys(watched)}
+            entry = {"version": CACHE_VERSION, "key": self._key(), "stamps": stamps, "result": asdict(result)}
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry), encoding="utf-8")
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+
+    def _key(self) -> str:
+        """Identify what was probed so changed requirements miss the cache."""
+        return json.dumps([sorted(self.fonts.items()), list(self.packages), os.environ.get("PATH", "")])
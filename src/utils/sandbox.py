@@ -0,0 +1,107 @@
+"""Isolated scratch directories for TeX compilation."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from types import TracebackType
+
+SHM_DIR = Path("/dev/shm")
+MIN_RESERVE = 64 * 1024 * 1024
+
+
+def scratch_root(reserve: int, preferred: Path | None = None) -> Path | None:
+    """Pick where to create a sandbox.
+
+    An explicit preferred directory wins. Otherwise /dev/shm is used when it
+    exists, is writable and has reserve bytes free; None means the system
+    temporary directory.
+    """
+    if preferred is not None:
+        return Path(preferred)
+    try:
+        if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK) and shutil.disk_usage(SHM_DIR).free >= reserve:
+            return SHM_DIR
+    except OSError:
+        pass
+    return None
+
+
+class BuildSandbox:
+    """One compile's private working directory, removed on exit.
+
+    The TeX file is copied in and xelatex runs there with the original
+    directory on TEXINPUTS, so images and listings are read in place while
+    every intermediate (.aux, .log, .toc, .out, font caches) stays in the
+    sandbox. Only the files passed to export() leave it, each via a
+    temporary file in the destination directory and an atomic rename.
+
+    Attributes:
+        source: TeX file being compiled
+        root: Directory the sandbox is created in, None for the system default
+        path: Sandbox directory while entered
+        tex_file: Working copy of the TeX file inside the sandbox
+
+    """
+
+    def __init__(self, source: Path, reserve: int = MIN_RESERVE, root: Path | None = None) -> None:
+        self.source = Path(source).resolve()
+        self.root = scratch_root(max(reserve, MIN_RESERVE), root)
+        self.path: Path | None = None
+        self.tex_file: Path | None = None
+
+    def __enter__(self) -> BuildSandbox:
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix="h2t-build-", dir=self.root))
+        try:
+            self.tex_file = self.path / self.source.name
+            shutil.copyfile(self.source, self.tex_file)
+        except BaseException:
+            self.cleanup()
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        """Remove the sandbox and everything in it."""
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+
+    def env(self, base: dict[str, str] | None = None) -> dict[str, str]:
+        """Return an environment that finds inputs beside the source and caches in the sandbox."""
+        env = dict(os.environ if base is None else base)
+        # A trailing separator keeps kpathsea's default search path after ours.
+        inputs = [str(self.source.parent) + "//", env.get("TEXINPUTS", "")]
+        env["TEXINPUTS"] = os.pathsep.join(inputs) if inputs[1] else inputs[0] + os.pathsep
+        env["TEXMFVAR"] = str(self.path)
+        return env
+
+    def export(self, *suffixes: str) -> list[Path]:
+        """Move the sandbox files with these suffixes next to the source, atomically."""
+        if self.tex_file is None:
+            msg = "sandbox is not active"
+            raise RuntimeError(msg)
+        exported = []
+        for suffix in suffixes:
+            built = self.tex_file.with_suffix(suffix)
+            target = self.source.with_suffix(suffix)
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            try:
+                shutil.copyfile(built, tmp)
+                os.replace(tmp, target)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            exported.append(target)
+        return exported
@@ -0,0 +1,183 @@
+"""Parallel compilation of a TeX document split at top-level sections."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import re
+import subprocess
+import time
+
+from src.utils.process import run_watched
+from src.utils.progress import CancelToken
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # Optional: only needed for split compilation
+    PdfReader = None
+    PdfWriter = None
+
+# HTMLtoTeXConverter._convert_unit puts this TeX comment line before each
+# top-level h1, the only places a part can start.
+SECTION_MARKER = "%% h2t:section\n"
+SECTION_START = re.compile(r"^%% h2t:section$", re.MULTILINE)
+SECTION_COMMAND = re.compile(r"\\section\{")
+VERBATIM = re.compile(r"\\begin\{(lstlisting|verbatim)\}.*?\\end\{\1\}", re.DOTALL)
+
+
+@dataclass
+class SplitReport:
+    """Timing of a split compilation.
+
+    Attributes:
+        parts: Number of parts compiled
+        pages: Page count of each part
+        part_times: Wall-clock time of each first-pass part compile
+        wall_time: End-to-end time including renumbering and merge
+
+    """
+
+    parts: int = 0
+    pages: list[int] = field(default_factory=list)
+    part_times: list[float] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def serial_estimate(self) -> float:
+        """Approximate single-process compile time (sum of part times)."""
+        return sum(self.part_times)
+
+    @property
+    def speedup(self) -> float:
+        """Estimated wall-clock speedup over the single-process compile."""
+        return self.serial_estimate / self.wall_time if self.wall_time else 0.0
+
+
+def split_document(content: str, parts: int) -> tuple[str, list[str]]:
+    """Split TeX into its preamble and up to `parts` balanced body chunks.
+
+    Chunks only break at section markers outside verbatim code, so each
+    one is a run of whole top-level sections and never leaves an
+    environment open.
+    """
+    doc_start = content.index(r"\begin{document}")
+    body_start = content.index("\n", doc_start) + 1
+    if content.startswith(r"\begin{arabic}", body_start):
+        body_start = content.index("\n", body_start) + 1
+    body_end = content.rindex(r"\end{document}")
+
+    preamble = content[:body_start]
+    body = content[body_start:body_end]
+    verbatim = [match.span() for match in VERBATIM.finditer(body)]
+    starts = [
+        match.start()
+        for match in SECTION_START.finditer(body)
+        if not any(begin <= match.start() < end for begin, end in verbatim)
+    ]
+    bounds = [0, *starts, len(body)]
+    sections = [body[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    target = sum(map(len, sections)) / max(parts, 1)
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for section in sections:
+        if current and size + len(section) / 2 > target and len(chunks) < parts - 1:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(section)
+        size += len(section)
+    if current:
+        chunks.append("".join(current))
+    return preamble, chunks or [""]
+
+
+def count_sections(tex: str) -> int:
+    """Count the \\section commands in tex that TeX executes, skipping verbatim code."""
+    return len(SECTION_COMMAND.findall(VERBATIM.sub("", tex)))
+
+
+class SplitCompiler:
+    """Compile section chunks in parallel xelatex processes and merge the PDFs.
+
+    The first round compiles every chunk at once to learn its page count.
+    Chunks that do not start on page one are then recompiled, again in
+    parallel, with their page and section counters set so that numbering
+    runs on across the merged document. Outlines from each part are kept,
+    so bookmarks survive the merge. Each xelatex runs in its own process
+    group, which is killed on timeout or cancellation.
+
+    Attributes:
+        command: xelatex command prefix, without output directory or input file
+        work_dir: Directory holding one scratch subdirectory per part
+        workers: Number of parts and concurrent xelatex processes
+        timeout: Per-process timeout in seconds
+
+    """
+
+    def __init__(self, command: list[str], work_dir: Path, workers: int = 4, timeout: float = 300) -> None:
+        self.command = command
+        self.work_dir = Path(work_dir)
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+
+    def compile(
+        self, tex_file: Path, env: dict[str, str] | None = None, cancel: CancelToken | None = None
+    ) -> SplitReport:
+        """Compile tex_file in parts and write the merged PDF beside it.
+
+        Raises CalledProcessError when a part fails, TimeoutError when one
+        runs too long and ConversionCancelled as soon as cancel is set.
+        """
+        if PdfWriter is None:
+            msg = "pypdf is required for split compilation"
+            raise RuntimeError(msg)
+
+        start = time.perf_counter()
+        tex_file = Path(tex_file)
+        preamble, chunks = split_document(tex_file.read_text(encoding="utf-8"), self.workers)
+        report = SplitReport(parts=len(chunks))
+        section_offsets = [0]
+        for chunk in chunks[:-1]:
+            section_offsets.append(section_offsets[-1] + count_sections(chunk))
+
+        def build(index: int, first_page: int) -> tuple[Path, float]:
+            part_dir = self.work_dir / f"part{index:03d}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            part_tex = part_dir / "part.tex"
+            counters = f"\\setcounter{{page}}{{{first_page}}}\\setcounter{{section}}{{{section_offsets[index]}}}\n"
+            part_tex.write_text(f"{preamble}{counters}{chunks[index]}\n\\end{{document}}", encoding="utf-8")
+            command = [*self.command, f"-output-directory={part_dir}", str(part_tex)]
+            began = time.perf_counter()
+            returncode, stdout, stderr = run_watched(command, self.timeout, cancel, env=env, cwd=tex_file.parent)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, command, stdout, stderr)
+            return part_dir / "part.pdf", time.perf_counter() - began
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            first_round = list(pool.map(build, range(len(chunks)), [1] * len(chunks)))
+            report.part_times = [elapsed for _pdf, elapsed in first_round]
+            report.pages = [len(PdfReader(pdf).pages) for pdf, _elapsed in first_round]
+
+            first_pages = [1]
+            for pages in report.pages[:-1]:
+                first_pages.append(first_pages[-1] + pages)
+            renumber = [i for i in range(1, len(chunks)) if first_pages[i] != 1]
+            list(pool.map(build, renumber, [first_pages[i] for i in renumber]))
+
+        self._merge([pdf for pdf, _elapsed in first_round], tex_file.with_suffix(".pdf"))
+        report.wall_time = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    def _merge(parts: list[Path], output: Path) -> None:
+        """Concatenate part PDFs, keeping their outlines, and write atomically."""
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(str(part), import_outline=True)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.part")
+        with open(tmp, "wb") as f:
+            writer.write(f)
+        os.replace(tmp, output)
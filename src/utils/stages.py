@@ -0,0 +1,122 @@
+"""Record of pipeline stage runs, so stages can run apart and skip unchanged work."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any
+
+STAGES = ("tex-only", "images-only", "compile-only", "validate")
+MANIFEST_VERSION = 1
+ASSET_DIRS = ("images", "listings")
+CHUNK_SIZE = 1 << 20
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Replace path with text through a temporary file unique to this call."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def file_digest(path: Path) -> str | None:
+    """Return the SHA-256 of a file's content, None if it cannot be read."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class StageManifest:
+    """Inputs and outputs of the last successful run of each stage.
+
+    A stage is fresh when it is called with the inputs it last ran with and
+    every output it wrote still has the content it wrote. Inputs are content
+    digests rather than timestamps and paths are stored relative to the TeX
+    directory, so the directory can be generated on one machine and
+    compiled on another without invalidating the record.
+
+    Attributes:
+        path: Manifest file, beside the TeX file
+        root: Directory the recorded paths are relative to
+        stages: Stage name mapped to its inputs, output digests and extras
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.root = self.path.parent
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def relative(self, path: Path) -> str:
+        """Return path as recorded: relative to root, with forward slashes."""
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def asset_digests(self) -> dict[str, str | None]:
+        """Digest every file in the directories the converter writes assets to."""
+        digests = {}
+        for name in ASSET_DIRS:
+            directory = self.root / name
+            if directory.is_dir():
+                for path in sorted(directory.rglob("*")):
+                    if path.is_file() and not path.name.startswith("."):
+                        digests[self.relative(path)] = file_digest(path)
+        return digests
+
+    def is_fresh(self, stage: str, inputs: dict[str, Any]) -> bool:
+        """Return True if stage last ran with inputs and its outputs are untouched since."""
+        record = self.stages.get(stage)
+        if record is None or record["inputs"] != _normalized(inputs):
+            return False
+        return all(file_digest(self.root / name) == digest for name, digest in record["outputs"].items())
+
+    def output_digest(self, stage: str, path: Path) -> str | None:
+        """Return the digest path had when stage last wrote it."""
+        return self.stages.get(stage, {}).get("outputs", {}).get(self.relative(path))
+
+    def value(self, stage: str, key: str, default: Any = None) -> Any:
+        """Return an extra value recorded with stage."""
+        return self.stages.get(stage, {}).get(key, default)
+
+    def record(self, stage: str, inputs: dict[str, Any], outputs: Iterable[Path], **extra: Any) -> None:
+        """Remember a successful run of stage."""
+        self.stages[stage] = {
+            "inputs": _normalized(inputs),
+            "outputs": {self.relative(path): file_digest(path) for path in outputs},
+            **_normalized(extra),
+        }
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        state = {"version": MANIFEST_VERSION, "stages": self.stages}
+        write_text_atomic(self.path, json.dumps(state, indent=1, sort_keys=True))
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            if state.get("version") == MANIFEST_VERSION and isinstance(state.get("stages"), dict):
+                self.stages = state["stages"]
+        except (OSError, ValueError):
+            self.stages = {}
+
+
+def _normalized(value: Any) -> Any:
+    """Return value as it reads back from JSON, so tuples compare equal to lists."""
+    return json.loads(json.dumps(value, sort_keys=True))
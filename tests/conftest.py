@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _cache_home(tmp_path, monkeypatch):
+    # Keep the requirements probe and image index out of the real user cache.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.assets import AssetIngestor
+
+
+class FakeResponse:
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+        self.headers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        return self.response
+
+
+def test_place_file_reuses_unchanged(tmp_path):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"jpeg-data")
+    ingestor = AssetIngestor(tmp_path / "images")
+
+    first = ingestor.place_file(source)
+    second = ingestor.place_file(source)
+
+    assert first == second == tmp_path / "images" / "photo.jpg"
+    assert first.read_bytes() == b"jpeg-data"
+    assert ingestor.stats["reused"] == 1
+
+
+def test_place_file_refreshes_modified_source(tmp_path):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"old")
+    ingestor = AssetIngestor(tmp_path / "images")
+    dest = ingestor.place_file(source)
+
+    source.unlink()
+    source.write_bytes(b"newer")
+    os.utime(source, (1, 1))
+
+    assert ingestor.place_file(source).read_bytes() == b"newer"
+    assert dest.read_bytes() == b"newer"
+
+
+def test_fetch_url_streams_chunks(tmp_path):
+    session = FakeSession(FakeResponse([b"ab", b"cd"]))
+    ingestor = AssetIngestor(tmp_path, session=session)
+
+    dest = ingestor.fetch_url("https://example.com/img/pic.png?size=large")
+
+    assert dest == tmp_path / "pic.png"
+    assert dest.read_bytes() == b"abcd"
+    assert session.calls[0]["stream"] is True
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_fetch_url_keeps_file_on_not_modified(tmp_path):
+    (tmp_path / "pic.png").write_bytes(b"cached")
+    session = FakeSession(FakeResponse([], status_code=304))
+    ingestor = AssetIngestor(tmp_path, session=session)
+
+    dest = ingestor.fetch_url("https://example.com/pic.png")
+
+    assert dest.read_bytes() == b"cached"
+    assert "If-Modified-Since" in session.calls[0]["headers"]
+
+
+def test_place_file_keeps_rewritten_copy_of_unchanged_source(tmp_path):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"original")
+    ingestor = AssetIngestor(tmp_path / "images")
+    dest = ingestor.place_file(source)
+    tmp = tmp_path / "optimized"
+    tmp.write_bytes(b"optimized")
+    os.replace(tmp, dest)
+    ingestor.record(dest)
+    ingestor.save()
+
+    rerun = AssetIngestor(tmp_path / "images")
+    assert rerun.place_file(source).read_bytes() == b"optimized"
+    assert rerun.stats["reused"] == 1
+    assert rerun.is_current(dest)
+
+    source.write_bytes(b"edited source")
+    assert rerun.place_file(source).read_bytes() == b"edited source"
+    assert not rerun.is_current(dest)
+
+
+def test_rerun_does_not_reoptimize_placed_images(tmp_path, monkeypatch):
+    Image.new("RGB", (40, 20)).save(tmp_path / "pic.png")
+    (tmp_path / "doc.html").write_text('<p>x</p><img src="pic.png">', encoding="utf-8")
+    optimized = []
+
+    def prepare():
+        converter = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "out" / "doc.tex"), log_level=None)
+        converter.tex_file.parent.mkdir(exist_ok=True)
+        converter.check_system_requirements = lambda: True
+        monkeypatch.setattr(converter, "optimize_images", optimized.append)
+        assert converter._prepare()  # noqa: SLF001
+        return converter
+
+    prepare()
+    converter = prepare()
+
+    assert optimized == [tmp_path / "out" / "images" / "pic.png"]
+    assert converter.assets.stats["reused"] == 1
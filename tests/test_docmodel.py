@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+
+from src.utils.docmodel import DocumentModel, Node
+
+HTML = (
+    "<!DOCTYPE html><html><body><h1>عنوان</h1>"
+    '<p class="text-center lead">one <strong>two</strong> <!-- note --></p>'
+    '<ul><li>a</li><li>b <em>c</em></li></ul>'
+    '<pre><code class="language-python">x = 1 &lt; 2</code></pre>'
+    '<img src="pic.png" alt="A"></body></html>'
+)
+
+
+def build(html=HTML):
+    soup = BeautifulSoup(html, "html.parser")
+    return soup, DocumentModel.from_soup(soup, source_hash="abc")
+
+
+def shape(node):
+    if isinstance(node, str):
+        return str(node)
+    return (node.name, dict(node.attrs), [shape(child) for child in node.children])
+
+
+def test_model_mirrors_soup_structure():
+    soup, model = build()
+
+    assert shape(model.root) == shape(soup)
+    assert model.root.find("pre").get_text() == soup.find("pre").get_text()
+    assert model.root.find("strong").string == "two"
+    assert [li.get_text() for li in model.root.find("ul").find_all("li", recursive=False)] == ["a", "b c"]
+
+
+def test_model_interns_names_and_classes():
+    _, model = build("<p class='lead'>x</p><p class='lead'>y</p>")
+    first, second = model.root.find_all("p")
+
+    assert first.name is second.name
+    assert first["class"][0] is second["class"][0]
+
+
+def test_model_round_trips_through_cache(tmp_path):
+    _, model = build()
+    cache = tmp_path / "doc.docmodel"
+    model.save(cache)
+
+    loaded = DocumentModel.load(cache, source_hash="abc")
+
+    assert isinstance(loaded.root, Node)
+    assert shape(loaded.root) == shape(model.root)
+    assert DocumentModel.load(cache, source_hash="other") is None
+    assert DocumentModel.load(tmp_path / "missing", source_hash="abc") is None
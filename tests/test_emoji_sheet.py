@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from PIL import Image
+import pytest
+
+from src.utils.emoji_sheet import EmojiSheet, emoji_key
+
+
+def make_sheet(tmp_path):
+    sheet = EmojiSheet(tmp_path / "images" / "emoji-sheet.pdf", "images/emoji-sheet.pdf")
+    sheet.assign([emoji_key("\U0001f600"), emoji_key("☀"), emoji_key("\U0001f600")])
+    return sheet
+
+
+def test_pages_follow_sorted_keys(tmp_path):
+    sheet = make_sheet(tmp_path)
+
+    assert sheet.pages == {"1f600": 1, "2600": 2}
+    assert sheet.reference("2600") == "\\emojiglyph{2600}"
+    assert sheet.reference("1f601") is None
+    assert sheet.preamble_lines()[1:] == [
+        "\\expandafter\\def\\csname emojiglyph@1f600\\endcsname{1}",
+        "\\expandafter\\def\\csname emojiglyph@2600\\endcsname{2}",
+    ]
+
+
+def test_build_writes_one_pdf_and_skips_when_current(tmp_path):
+    glyph = tmp_path / "1f600.png"
+    Image.new("RGBA", (72, 72), (255, 200, 0, 255)).save(glyph)
+    sheet = make_sheet(tmp_path)
+    lookup = {"1f600": glyph, "2600": None}.get
+
+    assert sheet.build(lookup) is True
+    assert sheet.build(lookup) is False
+
+    pypdf = pytest.importorskip("pypdf")
+    assert len(pypdf.PdfReader(sheet.path).pages) == 2
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+
+from src.utils.features import scan_features
+
+
+def scan(html):
+    return scan_features(BeautifulSoup(html, "html.parser"))
+
+
+def test_scan_detects_packages_and_languages():
+    features = scan(
+        '<p class="highlighted">x</p><mark>y</mark>'
+        '<pre><code class="hljs language-python">print(1)</code></pre>'
+        '<a href="https://example.com">link</a>',
+    )
+
+    assert features.packages == {"mdframed": True, "soul": True, "listings": True, "hyperref": True}
+    assert features.languages == {"python"}
+
+
+def test_scan_detects_text_features():
+    features = scan("<p>مرحبا \U0001f600</p>")
+
+    assert features.packages == {"emoji": True, "amiri": True}
+
+
+def test_scan_plain_document_needs_nothing():
+    features = scan("<p>plain <code class='language-c'>x</code></p>")
+
+    assert features.packages == {}
+    assert features.languages == set()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from PIL import Image
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.image_index import ImageIndex, probe_image
+
+
+def test_probe_reads_header_and_flags_problems(tmp_path):
+    Image.new("RGB", (300, 150)).save(tmp_path / "ok.png", dpi=(144, 144))
+    Image.new("CMYK", (10, 10)).save(tmp_path / "print.jpg")
+    Image.new("RGB", (2400, 10)).save(tmp_path / "wide.gif")
+
+    ok = probe_image(tmp_path / "ok.png", "d1")
+    cmyk = probe_image(tmp_path / "print.jpg", "d2")
+    wide = probe_image(tmp_path / "wide.gif", "d3")
+
+    assert (ok.format, ok.width, ok.height, ok.mode, ok.reencode) == ("PNG", 300, 150, "RGB", [])
+    assert ok.natural_size() == pytest.approx((150, 75), abs=0.1)
+    assert cmyk.dpi is None and cmyk.natural_size() == (10, 10)
+    assert cmyk.reencode == ["CMYK color"]
+    assert wide.reencode == ["GIF format", "larger than 2000 px"]
+    assert probe_image(tmp_path / "missing.png", "d4") is None
+
+
+def test_index_persists_by_content(tmp_path, monkeypatch):
+    Image.new("RGB", (40, 20)).save(tmp_path / "a.png")
+    (tmp_path / "b.png").write_bytes((tmp_path / "a.png").read_bytes())
+    index = ImageIndex(tmp_path / "index.json")
+
+    first = index.lookup(tmp_path / "a.png")
+    assert index.lookup(tmp_path / "b.png") == first
+    assert index.stats == {"hits": 1, "probed": 1}
+    index.save()
+
+    monkeypatch.setattr("src.utils.image_index.probe_image", lambda *_: pytest.fail("probed again"))
+    monkeypatch.setattr("src.utils.image_index.file_digest", lambda *_: pytest.fail("hashed again"))
+    reloaded = ImageIndex(tmp_path / "index.json")
+    assert reloaded.lookup(tmp_path / "a.png") == first
+    assert reloaded.stats == {"hits": 1, "probed": 0}
+
+
+def test_index_notices_changed_content(tmp_path):
+    path = tmp_path / "a.png"
+    Image.new("RGB", (40, 20)).save(path)
+    index = ImageIndex(tmp_path / "index.json")
+    index.lookup(path)
+    index.save()
+
+    Image.new("RGB", (80, 20)).save(path)
+
+    assert ImageIndex(tmp_path / "index.json").lookup(path).width == 80
+
+
+def test_converter_emits_natural_size_clamped_to_line_width(tmp_path):
+    Image.new("RGB", (144, 72)).save(tmp_path / "a.png")
+    Image.new("RGB", (3000, 10)).save(tmp_path / "big.png")
+    html_file = tmp_path / "doc.html"
+    html_file.write_text('<img src="a.png"><img src="a.png" width="50"><img src="big.png">', encoding="utf-8")
+    (tmp_path / "out").mkdir()
+    converter = HTMLtoTeXConverter(str(html_file), str(tmp_path / "out" / "doc.tex"), log_level="CRITICAL")
+
+    tex = converter.process_content(converter.load_document())
+
+    natural = r"natwidth=144.00bp, natheight=72.00bp"
+    assert rf"\includegraphics[{natural}, width=\ifdim 144.00bp>\linewidth\linewidth\else 144.00bp\fi]{{a.png}}" in tex
+    assert rf"\includegraphics[{natural}, width=\ifdim 50px>\linewidth\linewidth\else 50px\fi]{{a.png}}" in tex
+    assert converter.reencode_images == {tmp_path / "out" / "images" / "big.png": ["larger than 2000 px"]}
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    paths = []
+    for i in range(8):
+        paths.append(tmp_path / f"{i}.png")
+        Image.new("RGB", (10 + i, 10)).save(paths[-1])
+
+    def save(path):
+        index = ImageIndex(tmp_path / "index.json")
+        index.lookup(path)
+        index.save()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, paths * 10))
+
+    assert json.loads((tmp_path / "index.json").read_text())["entries"]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix != ".png") == ["index.json"]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import shutil
+
+from bs4 import BeautifulSoup
+from PIL import Image
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.incremental import section_digest, split_sections
+
+BOOK = "<html><body><p>intro</p><h1>One</h1><p>first {0}</p><h1>Two</h1><p>second</p></body></html>"
+
+
+def test_split_sections_flattens_body_and_starts_at_h1():
+    soup = BeautifulSoup(BOOK.format("x"), "html.parser")
+
+    sections = split_sections(soup)
+
+    assert [[getattr(unit, "name", None) for unit in section] for section in sections] == [
+        ["p"],
+        ["h1", "p"],
+        ["h1", "p"],
+    ]
+
+
+def test_section_digest_tracks_structure_and_images():
+    def digest(html, stamp="a"):
+        return section_digest(BeautifulSoup(html, "html.parser").children, lambda src: stamp)
+
+    assert digest("<b><i>x</i></b>") != digest("<b></b><i>x</i>")
+    assert digest("<img src='p.png'>", "a") != digest("<img src='p.png'>", "b")
+    assert digest("<p class='a'>x</p>") == digest("<p class='a'>x</p>")
+
+
+def render(tmp_path, html, incremental):
+    html_file = tmp_path / "book.html"
+    html_file.write_text(html, encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(html_file), str(tmp_path / "book.tex"))
+    converter.incremental = incremental
+    return converter, converter.process_content(converter.load_document())
+
+
+def test_incremental_reuses_unchanged_sections(tmp_path):
+    _, full = render(tmp_path, BOOK.format("edited"), incremental=False)
+    render(tmp_path, BOOK.format("original"), incremental=True)
+
+    converter, tex = render(tmp_path, BOOK.format("edited"), incremental=True)
+
+    assert tex == full
+    assert (converter.incremental_stats.reused, converter.incremental_stats.rebuilt) == (2, 1)
+
+
+def test_incremental_rerun_keeps_images_of_reused_sections(tmp_path):
+    Image.new("RGB", (40, 20)).save(tmp_path / "fig.png")
+    book = BOOK.replace("<p>second</p>", '<p>second</p><img src="fig.png">')
+    render(tmp_path, book.format("original"), incremental=True)
+    shutil.rmtree(tmp_path / "images")
+
+    converter, tex = render(tmp_path, book.format("edited"), incremental=True)
+
+    placed = tmp_path / "images" / "fig.png"
+    assert converter.incremental_stats.reused == 2
+    assert "{fig.png}" in tex
+    assert converter.image_paths == [placed]
+    assert placed.read_bytes() == (tmp_path / "fig.png").read_bytes()
+
+
+def test_incremental_rerun_recreates_listings_of_reused_sections(tmp_path):
+    book = BOOK.replace("<p>second</p>", '<p>second</p><pre><code class="language-python">x = 1</code></pre>')
+
+    def render_listings(html):
+        html_file = tmp_path / "book.html"
+        html_file.write_text(html, encoding="utf-8")
+        converter = HTMLtoTeXConverter(str(html_file), str(tmp_path / "book.tex"))
+        converter.incremental = True
+        converter.externalize_listings = True
+        return converter, converter.process_content(converter.load_document())
+
+    render_listings(book.format("original"))
+    shutil.rmtree(tmp_path / "listings")
+
+    converter, tex = render_listings(book.format("edited"))
+
+    assert converter.incremental_stats.reused == 2
+    (listing,) = (tmp_path / "listings").iterdir()
+    assert listing.read_text(encoding="utf-8") == "x = 1"
+    assert f"{{listings/{listing.name}}}" in tex
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from src.utils.listings import ListingStore
+
+
+def test_identical_blocks_share_one_file(tmp_path):
+    store = ListingStore(tmp_path / "listings")
+
+    first = store.store("print('hi')\n")
+    second = store.store("print('hi')\n")
+    other = store.store("print('bye')\n")
+
+    assert first == second != other
+    assert first.read_text(encoding="utf-8") == "print('hi')\n"
+    assert store.stats == {"written": 2, "reused": 1}
+
+
+def test_existing_file_is_not_rewritten(tmp_path):
+    path = ListingStore(tmp_path).store("x = 1")
+    mtime = path.stat().st_mtime_ns
+
+    fresh_store = ListingStore(tmp_path)
+
+    assert fresh_store.store("x = 1") == path
+    assert path.stat().st_mtime_ns == mtime
+    assert fresh_store.stats["written"] == 0
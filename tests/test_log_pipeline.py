@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import io
+import logging
+
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.log_pipeline import configure_logging, log_to_file, resolve_level, stop_logging
+
+
+@pytest.fixture(autouse=True)
+def _restore_root():
+    level = logging.getLogger().level
+    stop_logging()
+    yield
+    stop_logging()
+    logging.getLogger().setLevel(level)
+
+
+def test_level_filters_before_formatting(tmp_path):
+    formatted = []
+
+    class Probe:
+        def __init__(self, name):
+            self.name = name
+
+        def __str__(self):
+            formatted.append(self.name)
+            return self.name
+
+    stream = io.StringIO()
+    configure_logging("INFO", stream=stream)
+    with log_to_file(tmp_path / "run.log", "INFO"):
+        logging.getLogger("t").debug("hidden %s", Probe("hidden"))
+        logging.getLogger("t").info("shown %s", Probe("probe"))
+
+    assert "hidden" not in formatted
+    assert "shown probe" in stream.getvalue()
+    assert "hidden" not in (tmp_path / "run.log").read_text(encoding="utf-8")
+
+
+def test_later_configuration_keeps_the_pipeline(tmp_path):
+    stream = io.StringIO()
+    configure_logging("WARNING", stream=stream)
+    configure_logging("DEBUG", stream=io.StringIO())
+    logging.getLogger("t").info("quiet")
+    logging.getLogger("t").warning("loud")
+    stop_logging()
+
+    assert stream.getvalue().count("WARNING") == 1
+    assert "quiet" not in stream.getvalue()
+
+
+def test_log_files_have_their_own_levels_and_are_flushed_on_detach(tmp_path):
+    stream = io.StringIO()
+    configure_logging("WARNING", stream=stream)
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+
+    with log_to_file(first, "INFO"):
+        with log_to_file(second, "DEBUG"):
+            logging.getLogger("t").debug("detail")
+        logging.getLogger("t").info("progress")
+        # Detaching wrote everything queued for the file before closing it.
+        assert "detail" in second.read_text(encoding="utf-8")
+    logging.getLogger("t").info("after")
+
+    assert "progress" in first.read_text(encoding="utf-8")
+    assert "detail" not in first.read_text(encoding="utf-8")
+    assert "progress" not in second.read_text(encoding="utf-8")
+    assert "after" not in first.read_text(encoding="utf-8")
+    assert stream.getvalue() == ""
+    assert logging.getLogger().level == logging.WARNING
+
+
+def test_shared_log_file_is_written_once(tmp_path):
+    configure_logging("WARNING", stream=io.StringIO())
+    log_file = tmp_path / "run.log"
+
+    with log_to_file(log_file, "INFO"):
+        with log_to_file(log_file, "INFO"):
+            logging.getLogger("t").info("once")
+        logging.getLogger("t").info("still open")
+
+    assert log_file.read_text(encoding="utf-8").count("once") == 1
+    assert "still open" in log_file.read_text(encoding="utf-8")
+
+
+def test_resolve_level():
+    assert resolve_level("debug") == logging.DEBUG
+    assert resolve_level(30) == logging.WARNING
+    with pytest.raises(ValueError, match="Unknown log level"):
+        resolve_level("LOUD")
+
+
+def test_converters_keep_their_own_log_files(tmp_path):
+    (tmp_path / "doc.html").write_text("<p>text</p>", encoding="utf-8")
+    first = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "a" / "doc.tex"), log_level="INFO")
+    second = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "b" / "doc.tex"), log_level="DEBUG")
+
+    assert first.run_stages(["tex-only"])
+
+    assert "TeX" in first.log_file.read_text(encoding="utf-8")
+    assert not second.log_file.exists()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from PIL import Image
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.memory_api import MemoryConverter, html_to_tex
+from src.utils.image_index import ImageIndex
+
+HTML = (
+    "<html><body><h1>عنوان</h1><p>نص &amp; text</p>"
+    '<pre><code class="language-python">print("hi")</code></pre>'
+    '<img src="pic.png"><img src="https://example.com/a/remote.png?x=1"></body></html>'
+)
+
+
+def test_matches_file_based_conversion_without_writing(tmp_path, monkeypatch):
+    Image.new("RGB", (4, 4)).save(tmp_path / "pic.png")
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(HTML.replace("https://example.com/a/remote.png?x=1", "pic.png"), encoding="utf-8")
+    out = tmp_path / "out"
+    out.mkdir()
+    converter = HTMLtoTeXConverter(str(html_file), str(out / "doc.tex"), log_level="CRITICAL")
+    expected = converter.process_content(converter.load_document())
+
+    work = tmp_path / "cwd"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    handlers = list(logging.getLogger().handlers)
+    document = MemoryConverter(base_dir=tmp_path).convert(html_file.read_bytes())
+
+    assert document.tex == expected
+    assert list(work.iterdir()) == []
+    assert logging.getLogger().handlers == handlers
+
+
+def test_sources_and_collected_assets(tmp_path):
+    Image.new("RGB", (4, 4)).save(tmp_path / "pic.png")
+    converter = MemoryConverter(base_dir=tmp_path, externalize_listings=True)
+
+    document = converter.convert(HTML + "<p>😀</p>", collect_assets=True)
+
+    listing = next(name for name in document.sources if name.startswith("listings/"))
+    assert f"\\lstinputlisting[language=python]{{{listing}}}" in document.tex
+    assert document.sources["images/pic.png"] == str(tmp_path / "pic.png")
+    assert document.sources["images/remote.png"] == "https://example.com/a/remote.png?x=1"
+    assert document.sources["images/1f600.png"].endswith("/1f600.png")
+    assert document.assets[listing] == b'print("hi")'
+    assert document.assets["images/pic.png"] == (tmp_path / "pic.png").read_bytes()
+    assert "images/remote.png" not in document.assets
+    assert not converter.convert(HTML).assets
+
+
+def test_reusable_across_threads():
+    converter = MemoryConverter()
+    documents = [f"<h1>فصل {i}</h1><ul><li>item {i}</li></ul>" for i in range(40)]
+    expected = [html_to_tex(doc) for doc in documents]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        actual = list(pool.map(lambda doc: converter.convert(doc).tex, documents))
+
+    assert actual == expected
+    assert all(f"فصل {i}" in tex for i, tex in enumerate(actual))
+
+
+def test_image_metadata_stays_in_memory(tmp_path, monkeypatch):
+    Image.new("RGB", (144, 72)).save(tmp_path / "pic.png")
+    (tmp_path / "images").mkdir()
+    Image.new("RGB", (10, 10)).save(tmp_path / "images" / "remote.png")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ImageIndex, "_load", lambda self: pytest.fail("index file read"))
+
+    tex = MemoryConverter(base_dir=tmp_path).convert(HTML).tex
+
+    assert r"\includegraphics[natwidth=144.00bp, natheight=72.00bp" in tex
+    assert r"\includegraphics{remote.png}" in tex
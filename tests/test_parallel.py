@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.parallel import balanced_ranges
+
+
+def test_balanced_ranges_cover_everything_in_order():
+    ranges = balanced_ranges([5, 1, 1, 1, 1, 5, 1, 1], 3)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 8
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert len(ranges) == 3
+
+
+def test_balanced_ranges_edge_cases():
+    assert balanced_ranges([], 4) == []
+    assert balanced_ranges([3], 4) == [(0, 1)]
+    assert balanced_ranges([1, 1], 8) == [(0, 1), (1, 2)]
+
+
+def make_converter(tmp_path, html, parallel):
+    out = tmp_path / ("parallel" if parallel else "serial")
+    out.mkdir()
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(html_file), str(out / "doc.tex"), log_level="CRITICAL")
+    converter.parallel_convert = parallel
+    converter.max_workers = 2
+    return converter
+
+
+def test_parallel_output_matches_serial(tmp_path):
+    for name in ("a.png", "b.png"):
+        Image.new("RGB", (4, 4)).save(tmp_path / name)
+    sections = "".join(
+        f'<h1>فصل {i}</h1><p>نص {i} &amp; more</p><pre><code class="language-python">x = {i}</code></pre>'
+        f'<img src="{"ab"[i % 2]}.png"><ul><li>item {i}</li></ul>'
+        for i in range(12)
+    )
+    html = f"<html><body>{sections}</body></html>"
+
+    serial = make_converter(tmp_path, html, parallel=False)
+    parallel = make_converter(tmp_path, html, parallel=True)
+    expected = serial.process_content(serial.load_document())
+    actual = parallel.process_content(parallel.load_document())
+
+    assert actual == expected
+    assert parallel.required_packages == serial.required_packages
+    assert [p.name for p in parallel.image_paths] == [p.name for p in serial.image_paths] == ["a.png", "b.png"]
+
+
+def test_parallel_merges_image_metadata_from_workers(tmp_path):
+    Image.new("RGB", (144, 72)).save(tmp_path / "small.png")
+    Image.new("RGB", (2400, 10)).save(tmp_path / "big.png")
+    sections = "".join(f'<h1>فصل {i}</h1><img src="{"small" if i % 2 else "big"}.png">' for i in range(8))
+    html = f"<html><body>{sections}</body></html>"
+
+    serial = make_converter(tmp_path, html, parallel=False)
+    parallel = make_converter(tmp_path, html, parallel=True)
+    serial.process_content(serial.load_document())
+    parallel.process_content(parallel.load_document())
+
+    assert parallel.image_info == serial.image_info
+    assert parallel.image_info["big.png"].reencode == ["larger than 2000 px"]
+    assert {p.name: r for p, r in parallel.reencode_images.items()} == {"big.png": ["larger than 2000 px"]}
+    assert parallel.image_index.stats["probed"] == 0
+    assert parallel.image_index.lookup(tmp_path / "small.png") == serial.image_info["small.png"]
+    assert parallel.image_index.stats == {"hits": 1, "probed": 0}
+
+
+def test_parallel_rerun_keeps_optimized_images(tmp_path):
+    Image.new("RGB", (40, 20), "red").save(tmp_path / "pic.png")
+    sections = "".join(f"<h1>فصل {i}</h1><p>نص {i}</p>" for i in range(6))
+    (tmp_path / "doc.html").write_text(f'<html><body>{sections}<img src="pic.png"></body></html>', encoding="utf-8")
+    optimized = []
+
+    for _ in range(3):
+        converter = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "out" / "doc.tex"), log_level=None)
+        converter.tex_file.parent.mkdir(exist_ok=True)
+        converter.parallel_convert = True
+        converter.max_workers = 2
+        converter.check_system_requirements = lambda: True
+        optimize = converter.optimize_images
+        converter.optimize_images = lambda path, optimize=optimize: (optimized.append(path), optimize(path))
+        assert converter._prepare()  # noqa: SLF001
+
+    assert optimized == [tmp_path / "out" / "images" / "pic.png"]
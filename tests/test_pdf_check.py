@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.corpus import make_pdf
+from src.utils.pdf_check import check_pdf
+
+
+@pytest.mark.parametrize("xref_stream", [False, True])
+def test_valid_pdf_passes(tmp_path, xref_stream):
+    path = tmp_path / "doc.pdf"
+    make_pdf(path, pages=4, padding=10_000, xref_stream=xref_stream)
+
+    report = check_pdf(path, expected_pages=4, required_fonts=["amiri"])
+
+    assert report.ok, report.errors
+    assert report.version == "1.5"
+    assert report.pages == 4
+    assert report.fonts == {"Amiri-Regular"}
+
+
+def test_page_count_and_font_mismatch(tmp_path):
+    path = tmp_path / "doc.pdf"
+    make_pdf(path, pages=2, font="ABCDEF+DejaVuSans")
+
+    report = check_pdf(path, expected_pages=3, required_fonts=["Amiri"])
+
+    assert not report.ok
+    assert any("expected 3 pages" in error for error in report.errors)
+    assert any("'amiri' not found" in error for error in report.errors)
+
+
+@pytest.mark.parametrize("cut", [100, 2000])
+def test_truncated_pdf_fails(tmp_path, cut):
+    path = tmp_path / "doc.pdf"
+    make_pdf(path, pages=2, padding=4000)
+    data = path.read_bytes()
+    path.write_bytes(data[:-cut])
+
+    assert not check_pdf(path).ok
+
+
+def test_bad_xref_offset_fails(tmp_path):
+    path = tmp_path / "doc.pdf"
+    make_pdf(path, pages=2)
+    data = path.read_bytes()
+    start = data.rindex(b"startxref")
+    path.write_bytes(data[:start] + b"startxref\n12\n%%EOF\n")
+
+    report = check_pdf(path)
+
+    assert not report.ok
+
+
+def test_empty_and_non_pdf(tmp_path):
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    text = tmp_path / "text.pdf"
+    text.write_text("hello", encoding="utf-8")
+
+    assert check_pdf(empty).errors == ["file is empty"]
+    assert check_pdf(text).errors == ["missing %PDF header"]
+
+
+def test_pdf_written_by_pypdf(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    writer = pypdf.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    path = tmp_path / "blank.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    report = check_pdf(path, expected_pages=3)
+
+    assert report.ok, report.errors
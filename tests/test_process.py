@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.process import run_process_tree, run_watched
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX process groups")
+
+SPAWN_GRANDCHILD = (
+    "import subprocess, sys, time;"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+    "open(sys.argv[1], 'w').write(str(child.pid));"
+    "time.sleep(60)"
+)
+BACKGROUND_GRANDCHILD = (
+    "import subprocess, sys;"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+    "open(sys.argv[1], 'w').write(str(child.pid));"
+    "print('done')"
+)
+
+
+def wait_for_pid(pid_file):
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text():
+            return int(pid_file.read_text())
+        time.sleep(0.05)
+    raise AssertionError("grandchild did not start")
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        # An unreaped zombie still answers signal 0.
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+def test_run_process_tree_returns_output():
+    code, stdout, _ = asyncio.run(run_process_tree([sys.executable, "-c", "print('hi')"], timeout=10))
+
+    assert code == 0
+    assert stdout.strip() == "hi"
+
+
+def test_timeout_kills_grandchildren(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_process_tree([sys.executable, "-c", SPAWN_GRANDCHILD, str(pid_file)], timeout=1.5),
+        )
+        await asyncio.to_thread(wait_for_pid, pid_file)
+        with pytest.raises(asyncio.TimeoutError):
+            await task
+
+    asyncio.run(scenario())
+    time.sleep(0.2)
+    assert not is_alive(wait_for_pid(pid_file))
+
+
+def test_cancellation_kills_grandchildren(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_process_tree([sys.executable, "-c", SPAWN_GRANDCHILD, str(pid_file)], timeout=60),
+        )
+        await asyncio.to_thread(wait_for_pid, pid_file)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    time.sleep(0.2)
+    assert not is_alive(wait_for_pid(pid_file))
+
+
+def test_run_watched_kills_background_grandchildren_after_exit(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    start = time.monotonic()
+    code, stdout, _ = run_watched([sys.executable, "-c", BACKGROUND_GRANDCHILD, str(pid_file)], timeout=30)
+
+    assert time.monotonic() - start < 10
+    assert (code, stdout) == (0, "done\n")
+    time.sleep(0.2)
+    assert not is_alive(wait_for_pid(pid_file))
+
+
+def test_cancelling_async_split_compile_kills_xelatex(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pid"
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "xelatex"
+    stub.write_text(f"#!{sys.executable}\nimport sys\nsys.argv[1:] = [{str(pid_file)!r}]\nexec({SPAWN_GRANDCHILD!r})\n")
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    (tmp_path / "doc.html").write_text("<h1>One</h1><p>a</p><h1>Two</h1><p>b</p>", encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "doc.tex"), log_level="CRITICAL")
+    converter.check_system_requirements = lambda: True
+    converter.split_compile = True
+    converter.scratch_dir = tmp_path / "scratch"
+
+    async def scenario():
+        task = asyncio.create_task(converter.convert_async())
+        await asyncio.to_thread(wait_for_pid, pid_file)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - start < 20
+    time.sleep(0.2)
+    assert not is_alive(wait_for_pid(pid_file))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+import time
+
+from PIL import Image
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.process import run_watched
+from src.utils.progress import CancelToken, ConversionCancelled
+
+# Ships out three pages, leaves a partial PDF, then hangs like a stuck run.
+SLOW_XELATEX = """\
+import os, sys, time
+out = next(a.split("=", 1)[1] for a in sys.argv if a.startswith("-output-directory="))
+stem = os.path.splitext(os.path.basename(sys.argv[-1]))[0]
+open(os.path.join(out, stem + ".pdf"), "w").close()
+print("[1] [2]", flush=True)
+print("[3{/usr/share/fonts.map}]", flush=True)
+time.sleep(60)
+"""
+
+
+def make_converter(tmp_path, html):
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    (tmp_path / "out").mkdir()
+    return HTMLtoTeXConverter(str(html_file), str(tmp_path / "out" / "doc.tex"), log_level="CRITICAL")
+
+
+def test_prepare_reports_nodes_and_images(tmp_path, monkeypatch):
+    for name in ("a.png", "b.png"):
+        Image.new("RGB", (4, 4)).save(tmp_path / name)
+    html = "<h1>t</h1>" + "<p>x <em>y</em></p>" * 300 + '<img src="a.png"><img src="b.png">'
+    converter = make_converter(tmp_path, html)
+    monkeypatch.setattr(converter, "check_system_requirements", lambda: True)
+    events = []
+    converter.progress = events.append
+
+    assert converter._prepare()  # noqa: SLF001
+
+    nodes = [e for e in events if e.stage == "convert"]
+    assert 10 < len(nodes) <= 102
+    assert [e.done for e in nodes] == sorted(e.done for e in nodes)
+    assert nodes[-1].done == nodes[-1].total > 900
+    images = [(e.done, e.total, os.path.basename(e.detail)) for e in events if e.stage == "images"]
+    assert images == [(1, 2, "a.png"), (2, 2, "b.png")]
+
+
+def test_cancel_stops_tree_walk(tmp_path):
+    converter = make_converter(tmp_path, "<p>x</p>" * 2000)
+    seen = []
+
+    def on_progress(event):
+        seen.append(event.done)
+        if event.done > 100:
+            converter.cancel_token.cancel("preempted")
+
+    converter.progress = on_progress
+
+    with pytest.raises(ConversionCancelled, match="preempted"):
+        converter.process_content(converter.load_document())
+    assert seen[-1] < 200
+
+
+def test_cancelling_async_convert_stops_prepare(tmp_path):
+    converter = make_converter(tmp_path, "<p>x <em>y</em></p>" * 2000)
+    converter.check_system_requirements = lambda: time.sleep(0.5) or True
+
+    async def scenario():
+        task = asyncio.create_task(converter.convert_async())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert converter.cancel_token.cancelled
+    time.sleep(0.5)
+    assert not converter.tex_file.exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stub")
+def test_cancel_kills_compile_and_removes_partial_pdf(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "xelatex"
+    stub.write_text(f"#!{sys.executable}\n{SLOW_XELATEX}", encoding="utf-8")
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    converter = make_converter(tmp_path, "<p>x</p>")
+    converter.tex_file.write_text("\\documentclass{article}", encoding="utf-8")
+    converter.sandbox = False
+    converter.expected_pages = 5
+    events = []
+
+    def on_progress(event):
+        events.append(event)
+        if event.done == 3:
+            converter.cancel_token.cancel()
+
+    converter.progress = on_progress
+
+    start = time.monotonic()
+    with pytest.raises(ConversionCancelled):
+        converter.compile_pdf()
+
+    assert time.monotonic() - start < 10
+    assert [(e.done, e.total, e.attempt) for e in events] == [(0, 5, 1), (1, 5, 1), (2, 5, 1), (3, 5, 1)]
+    assert not converter.tex_file.with_suffix(".pdf").exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stub")
+def test_async_compile_reports_pages(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "xelatex"
+    stub.write_text(f"#!{sys.executable}\n{SLOW_XELATEX.replace('time.sleep(60)', '')}", encoding="utf-8")
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    converter = make_converter(tmp_path, "<p>x</p>")
+    converter.tex_file.write_text("\\documentclass{article}", encoding="utf-8")
+    converter.sandbox = False
+    converter.expected_pages = 3
+    events = []
+    converter.progress = events.append
+
+    assert asyncio.run(converter.compile_pdf_async())
+
+    assert [(e.stage, e.done, e.total, e.attempt) for e in events] == [("compile", n, 3, 1) for n in range(4)]
+
+
+def test_run_watched_streams_output_and_times_out():
+    lines = []
+    code = "import time; print('a'); print('b', flush=True); time.sleep(60)"
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_watched([sys.executable, "-c", code], 0.5, CancelToken(), lines.append)
+
+    assert time.monotonic() - start < 10
+    assert lines == ["a\n", "b\n"]
+    assert run_watched([sys.executable, "-c", "print('ok')"], 10) == (0, "ok\n", "")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import subprocess
+
+from src.utils import requirements_probe
+from src.utils.requirements_probe import RequirementsProbe
+
+
+def install_fake_system(monkeypatch, tmp_path, packages_found):
+    tex_dir = tmp_path / "texmf"
+    font_dir = tmp_path / "fonts"
+    tex_dir.mkdir()
+    font_dir.mkdir()
+    (font_dir / "Amiri-Regular.ttf").write_bytes(b"")
+    (font_dir / "NotoSansArabic-Regular.ttf").write_bytes(b"")
+    xelatex = tmp_path / "xelatex"
+    xelatex.write_bytes(b"")
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        found = [str(tex_dir / f"{name}") for name in cmd[1:] if name[:-4] in packages_found]
+        return subprocess.CompletedProcess(cmd, 0 if len(found) == len(cmd) - 1 else 1, "\n".join(found), "")
+
+    monkeypatch.setattr(requirements_probe.shutil, "which", lambda name: str(xelatex) if name == "xelatex" else None)
+    monkeypatch.setattr(requirements_probe.subprocess, "run", fake_run)
+    monkeypatch.setattr(requirements_probe, "font_dirs", lambda: [font_dir])
+    return calls, tex_dir
+
+
+def test_probe_batches_packages_and_caches(monkeypatch, tmp_path):
+    calls, _ = install_fake_system(monkeypatch, tmp_path, {"fontspec", "bidi"})
+    probe = RequirementsProbe(cache_file=tmp_path / "cache.json", packages=("fontspec", "bidi"))
+
+    first = probe.run()
+    second = probe.run()
+
+    assert first.ok and not first.from_cache
+    assert second.ok and second.from_cache
+    assert calls == [["kpsewhich", "fontspec.sty", "bidi.sty"]]
+
+
+def test_probe_cache_invalidated_by_tex_tree_change(monkeypatch, tmp_path):
+    calls, tex_dir = install_fake_system(monkeypatch, tmp_path, {"fontspec"})
+    probe = RequirementsProbe(cache_file=tmp_path / "cache.json", packages=("fontspec",))
+    probe.run()
+
+    stat = tex_dir.stat()
+    os.utime(tex_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert not probe.run().from_cache
+    assert len(calls) == 2
+
+
+def test_probe_failures_are_not_cached(monkeypatch, tmp_path):
+    calls, _ = install_fake_system(monkeypatch, tmp_path, {"fontspec"})
+    probe = RequirementsProbe(cache_file=tmp_path / "cache.json", packages=("fontspec", "bidi"))
+
+    assert probe.run().missing_packages == ["bidi"]
+    assert probe.run().missing_packages == ["bidi"]
+    assert len(calls) == 2
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import stat
+import sys
+
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.sandbox import BuildSandbox, scratch_root
+
+FAKE_XELATEX = """\
+import os, sys
+out = next(a.split("=", 1)[1] for a in sys.argv if a.startswith("-output-directory="))
+stem = os.path.splitext(os.path.basename(sys.argv[-1]))[0]
+for ext in (".aux", ".log", ".out"):
+    open(os.path.join(out, stem + ext), "w").close()
+with open(os.path.join(out, stem + ".pdf"), "w") as f:
+    f.write(os.environ.get("TEXINPUTS", ""))
+"""
+
+
+def test_sandbox_exports_atomically_and_cleans_up(tmp_path):
+    source = tmp_path / "doc.tex"
+    source.write_text("tex", encoding="utf-8")
+
+    with pytest.raises(RuntimeError), BuildSandbox(source, root=tmp_path / "scratch") as box:
+        (box.tex_file.with_suffix(".pdf")).write_bytes(b"%PDF")
+        box.tex_file.with_suffix(".aux").write_text("aux", encoding="utf-8")
+        assert box.export(".pdf") == [source.with_suffix(".pdf")]
+        raise RuntimeError
+
+    assert source.with_suffix(".pdf").read_bytes() == b"%PDF"
+    assert not source.with_suffix(".aux").exists()
+    assert not list((tmp_path / "scratch").iterdir())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["doc.pdf", "doc.tex", "scratch"]
+
+
+def test_sandbox_env_searches_source_directory(tmp_path):
+    source = tmp_path / "doc.tex"
+    source.write_text("tex", encoding="utf-8")
+
+    with BuildSandbox(source, root=tmp_path) as box:
+        env = box.env({"TEXINPUTS": "/extra"})
+
+    assert env["TEXINPUTS"] == f"{tmp_path}//{os.pathsep}/extra"
+    assert env["TEXMFVAR"] == str(box.tex_file.parent)
+
+
+def test_scratch_root_falls_back_without_room(tmp_path):
+    assert scratch_root(1, preferred=tmp_path) == tmp_path
+    assert scratch_root(1 << 62) is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stub")
+def test_compile_leaves_only_pdf_and_tex(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "xelatex"
+    stub.write_text(f"#!{sys.executable}\n{FAKE_XELATEX}", encoding="utf-8")
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "doc.html").write_text("<p>x</p>", encoding="utf-8")
+    (out / "doc.tex").write_text("\\documentclass{article}", encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(out / "doc.html"), str(out / "doc.tex"))
+    converter.scratch_dir = tmp_path / "scratch"
+
+    assert converter.compile_pdf()
+
+    assert sorted(p.name for p in out.iterdir() if p.name.startswith("doc.") and "conversion" not in p.name) == [
+        "doc.html",
+        "doc.pdf",
+        "doc.tex",
+    ]
+    assert (out / "doc.pdf").read_text(encoding="utf-8").startswith(f"{out.resolve()}//")
+    assert not list((tmp_path / "scratch").iterdir())
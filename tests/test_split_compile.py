@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.split_compile import SECTION_MARKER, count_sections, split_document
+
+PREAMBLE = "\\documentclass{article}\n\\begin{document}\n\\begin{arabic}\n"
+
+
+def make_tex(sections):
+    body = "".join(f"{SECTION_MARKER}\\section{{{name}}}\n\n{'x' * 100}\n\n" for name in sections)
+    return PREAMBLE + "intro\n\n" + body + "\n\\end{document}"
+
+
+def test_split_document_keeps_preamble_and_whole_sections():
+    preamble, chunks = split_document(make_tex("abcdef"), parts=3)
+
+    assert preamble == PREAMBLE
+    assert len(chunks) == 3
+    assert "".join(chunks) == make_tex("abcdef")[len(PREAMBLE) : -len("\\end{document}")]
+    assert all(chunk.startswith(SECTION_MARKER + "\\section{") for chunk in chunks[1:])
+
+
+def test_split_document_only_splits_at_top_level_sections(tmp_path):
+    code = f"\\section{{not a heading}}\n{SECTION_MARKER}x = 1\n"
+    text = "<p>" + "b " * 100 + "</p>"
+    html = (
+        f'<h1>One</h1><pre><code class="language-python">{code}</code></pre>'
+        f"<div><h1>Nested</h1></div><h1>ثانية</h1>{text}<h1>Three</h1>{text}"
+    )
+    (tmp_path / "doc.html").write_text(html, encoding="utf-8")
+    converter = HTMLtoTeXConverter(str(tmp_path / "doc.html"), str(tmp_path / "doc.tex"), log_level=None)
+    tex = converter.process_content(converter.load_document())
+
+    _, chunks = split_document(tex, parts=8)
+
+    assert [chunk.split("\n", 2)[1] for chunk in chunks] == [
+        "\\begin{latin}\\section{One}\\end{latin}",
+        "\\section{ثانية}",
+        "\\begin{latin}\\section{Three}\\end{latin}",
+    ]
+    assert chunks[0].count("\\begin{lstlisting}") == chunks[0].count("\\end{lstlisting}") == 1
+    assert [count_sections(chunk) for chunk in chunks] == [2, 1, 1]
+
+
+def test_split_document_with_empty_body():
+    _, chunks = split_document(PREAMBLE + "\\end{document}", parts=4)
+
+    assert chunks == [""]
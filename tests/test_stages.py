@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import stat
+import sys
+
+from PIL import Image
+import pytest
+
+from src.enhanced_converter import HTMLtoTeXConverter
+from src.utils.stages import STAGES, StageManifest
+
+REPO = Path(__file__).resolve().parent.parent
+
+# Writes a valid two-page PDF and logs each run.
+FAKE_XELATEX = f"""\
+import os, sys
+sys.path.insert(0, {str(REPO)!r})
+from benchmarks.corpus import make_pdf
+out = next(a.split("=", 1)[1] for a in sys.argv if a.startswith("-output-directory="))
+stem = os.path.splitext(os.path.basename(sys.argv[-1]))[0]
+make_pdf(os.path.join(out, stem + ".pdf"), pages=2)
+with open(os.environ["XELATEX_RUNS"], "a") as f:
+    f.write("run\\n")
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "xelatex"
+    stub.write_text(f"#!{sys.executable}\n{FAKE_XELATEX}", encoding="utf-8")
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("XELATEX_RUNS", str(tmp_path / "runs.txt"))
+
+    Image.new("RGB", (4, 4)).save(tmp_path / "pic.png")
+    (tmp_path / "doc.html").write_text('<h1>عنوان</h1><p>نص</p><img src="pic.png">', encoding="utf-8")
+    (tmp_path / "out").mkdir()
+    return tmp_path
+
+
+def make_converter(project):
+    converter = HTMLtoTeXConverter(str(project / "doc.html"), str(project / "out" / "doc.tex"), log_level="CRITICAL")
+    converter.check_system_requirements = lambda: True
+    converter.scratch_dir = project / "scratch"
+    return converter
+
+
+def runs(project):
+    path = project / "runs.txt"
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+def test_stages_run_apart_and_skip_unchanged_work(project):
+    tex = project / "out" / "doc.tex"
+    image = project / "out" / "images" / "pic.png"
+
+    for stage in STAGES:
+        assert make_converter(project).run_stages([stage])
+    assert runs(project) == 1
+    manifest = StageManifest(project / "out" / "doc.stages.json")
+    assert manifest.value("tex-only", "images") == ["images/pic.png"]
+    assert manifest.value("compile-only", "pages") is None
+
+    stamps = {path: path.stat().st_mtime_ns for path in (tex, image, tex.with_suffix(".pdf"))}
+    assert make_converter(project).run_stages(STAGES)
+    assert runs(project) == 1
+    assert {path: path.stat().st_mtime_ns for path in stamps} == stamps
+
+    (project / "doc.html").write_text("<h1>عنوان</h1><p>نص جديد</p>", encoding="utf-8")
+    assert make_converter(project).run_stages(STAGES)
+    assert runs(project) == 2
+    assert "جديد" in tex.read_text(encoding="utf-8")
+
+    assert make_converter(project).run_stages(["compile-only"], force=True)
+    assert runs(project) == 3
+
+
+def test_compile_reruns_when_an_asset_changes(project):
+    assert make_converter(project).run_stages(["tex-only", "compile-only"])
+    Image.new("RGB", (8, 8)).save(project / "out" / "images" / "pic.png")
+
+    assert make_converter(project).run_stages(["compile-only"])
+    assert runs(project) == 2
+
+
+def test_editing_an_image_invalidates_tex_and_images(project):
+    assert make_converter(project).run_stages(["tex-only", "images-only"])
+    tex = project / "out" / "doc.tex"
+    assert "natwidth=4.00bp" in tex.read_text(encoding="utf-8")
+
+    Image.new("RGB", (80, 40), "blue").save(project / "pic.png")
+    assert make_converter(project).run_stages(["tex-only", "images-only"])
+
+    assert "natwidth=80.00bp" in tex.read_text(encoding="utf-8")
+    with Image.open(project / "out" / "images" / "pic.png") as placed:
+        assert placed.size == (80, 40)
+
+
+def test_later_stages_work_without_tex_record(project):
+    tex = project / "out" / "doc.tex"
+    tex.write_text("\\documentclass{article}\\begin{document}x\\end{document}", encoding="utf-8")
+    (project / "out" / "images").mkdir()
+    Image.new("RGB", (4, 4)).save(project / "out" / "images" / "pic.png")
+    converter = make_converter(project)
+
+    assert converter.run_stages(["images-only", "compile-only"])
+    assert runs(project) == 1
+    assert converter.image_paths == [project / "out" / "images" / "pic.png"]
+    assert tex.with_suffix(".pdf").exists()
+
+
+def test_failed_validation_is_not_recorded(project):
+    assert make_converter(project).run_stages(["tex-only", "compile-only"])
+    converter = make_converter(project)
+    converter.required_fonts = ["Missing"]
+
+    assert not converter.run_stages(["validate"])
+    assert "validate" not in StageManifest(project / "out" / "doc.stages.json").stages
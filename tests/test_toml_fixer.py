@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import pytest
+
+import toml_fixer
+from toml_fixer import BackupStore, FixCache, RetentionPolicy, TomlFixer, expand_paths, fix_files, main
+
+UNSORTED = 'name = "demo"\n[tool.black]\nline-length = 100\n'
+
+
+@pytest.fixture(autouse=True)
+def _cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+def write(path, content=UNSORTED):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_fix_parses_input_once(tmp_path, monkeypatch):
+    calls = []
+    real_parse = toml_fixer.parse
+    monkeypatch.setattr(toml_fixer, "parse", lambda text: calls.append(text) or real_parse(text))
+    path = write(tmp_path / "pyproject.toml")
+
+    result = TomlFixer(path).fix()
+
+    assert result.status == "fixed"
+    assert calls.count(UNSORTED) == 1
+
+
+def test_fix_is_idempotent(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+    TomlFixer(path).fix()
+
+    assert TomlFixer(path).fix().status == "unchanged"
+
+
+def test_check_mode_reports_without_writing(tmp_path, capsys):
+    path = write(tmp_path / "a" / "pyproject.toml")
+
+    assert main(["--check", str(tmp_path / "**" / "*.toml")]) == 1
+    assert path.read_text(encoding="utf-8") == UNSORTED
+    assert "needs-fix" in capsys.readouterr().out
+
+
+def test_batch_mode_uses_process_pool(tmp_path):
+    for name in "abc":
+        write(tmp_path / name / "pyproject.toml")
+    write(tmp_path / "bad" / "pyproject.toml", "not = [valid")
+
+    code = main(["-j", "2", str(tmp_path / "**" / "pyproject.toml")])
+
+    assert code == 1
+    assert main(["--check", "-j", "2", str(tmp_path / "[abc]" / "pyproject.toml")]) == 0
+
+
+def test_expand_paths_deduplicates(tmp_path):
+    path = write(tmp_path / "x.toml")
+
+    assert expand_paths([str(path), str(tmp_path / "*.toml")]) == [path]
+
+
+def test_normalize_deduplicates_nested_arrays_and_tables(tmp_path):
+    path = write(
+        tmp_path / "pyproject.toml",
+        "xs = [1, 2, 1]  # keep me\n"
+        'deps = [{a = 1, b = 2}, {b = 2, a = 1}, {a = 3}]\n'
+        "nested = [[1, 2], [1, 2], [2, 1]]\n"
+        '[[pkg]]\nname = "x"\n[[pkg]]\nname = "x"\n[[pkg]]\nname = "y"\n',
+    )
+
+    TomlFixer(path).fix()
+    doc = toml_fixer.parse(path.read_text(encoding="utf-8"))
+
+    assert doc["xs"] == [1, 2]
+    assert doc["deps"] == [{"a": 1, "b": 2}, {"a": 3}]
+    assert doc["nested"] == [[1, 2], [2, 1]]
+    assert [p["name"] for p in doc["pkg"]] == ["x", "y"]
+    assert "# keep me" in path.read_text(encoding="utf-8")
+
+
+def test_normalize_sorts_keys_inside_nested_tables(tmp_path):
+    path = write(
+        tmp_path / "pyproject.toml",
+        "[tool.x]\nb = 1  # keep me\na = 2\n"
+        "[tool.x.sub]\nz = 1\ny = 2\n"
+        "[[pkg]]\nname = 'x'\nid = 1\n"
+        "[w]\nc = {q = 1, p = 2}\n",
+    )
+
+    TomlFixer(path).fix()
+    text = path.read_text(encoding="utf-8")
+    doc = toml_fixer.parse(text)
+
+    assert list(doc["tool"]["x"]) == ["a", "b", "sub"]
+    assert list(doc["tool"]["x"]["sub"]) == ["y", "z"]
+    assert list(doc["pkg"][0]) == ["id", "name"]
+    assert list(doc["w"]["c"]) == ["p", "q"]
+    assert "# keep me" in text
+
+
+def test_normalize_distinguishes_types():
+    fixer = TomlFixer("unused.toml")
+    fixer.doc = toml_fixer.parse("xs = [1, 1.0, true, '1']\n")
+    fixer._normalize_lists()
+
+    assert len(fixer.doc["xs"]) == 4
+
+
+def test_cache_skips_unchanged_files_without_parsing(tmp_path, monkeypatch):
+    path = write(tmp_path / "pyproject.toml")
+    cache = FixCache(tmp_path / "cache.json")
+    assert fix_files([path], cache=cache)[0].status == "fixed"
+    cache.save()
+
+    monkeypatch.setattr(toml_fixer, "parse", lambda text: pytest.fail("parsed a cached file"))
+    [result] = fix_files([path], cache=FixCache(tmp_path / "cache.json"))
+
+    assert result.cached
+    assert result.status == "unchanged"
+
+
+def test_cache_misses_on_edit_and_rule_change(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+    cache = FixCache(tmp_path / "cache.json")
+    fix_files([path], cache=cache)
+    cache.save()
+
+    path.write_text(path.read_text(encoding="utf-8") + "extra = 1\n", encoding="utf-8")
+    assert not fix_files([path], cache=FixCache(tmp_path / "cache.json"))[0].cached
+    assert not FixCache(tmp_path / "cache.json", rules="other").entries
+
+
+def test_needs_fix_is_not_cached(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+
+    assert main(["--check", str(path)]) == 1
+    assert main(["--check", str(path)]) == 1
+    assert main([str(path)]) == 0
+    assert main(["--check", str(path)]) == 0
+
+
+def test_no_cache_flag_reprocesses(tmp_path, capsys):
+    path = write(tmp_path / "pyproject.toml")
+    main([str(path)])
+    main([str(path)])
+    assert "[cached]" in capsys.readouterr().out
+
+    main(["--no-cache", str(path)])
+    assert "[cached]" not in capsys.readouterr().out
+
+
+def test_backups_are_deduplicated_and_compressed(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+    store = BackupStore(tmp_path / "store")
+
+    first = store.add(path, now=100)
+    second = store.add(path, now=200)
+    path.write_text("changed = 1\n", encoding="utf-8")
+    store.add(path, now=300)
+
+    assert first == second
+    assert first.suffix == ".gz"
+    assert [entry.time for entry in store.entries(path)] == [100, 300]
+    assert len(list((tmp_path / "store" / "objects").iterdir())) == 2
+
+
+def test_restore_by_timestamp(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+    store = BackupStore(tmp_path / "store")
+    store.add(path, now=100)
+    path.write_text("changed = 1\n", encoding="utf-8")
+    store.add(path, now=200)
+    path.write_text("current = 1\n", encoding="utf-8")
+
+    assert store.restore(path, when=150).time == 100
+    assert path.read_text(encoding="utf-8") == UNSORTED
+    store.restore(path)
+    assert path.read_text(encoding="utf-8") == "current = 1\n"
+
+
+def test_prune_applies_count_age_and_size(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+    store = BackupStore(tmp_path / "store")
+    for i in range(5):
+        path.write_text(f"v = {i}\n", encoding="utf-8")
+        store.add(path, now=1000 + i)
+
+    store.prune(RetentionPolicy(keep=3), now=1010 + store.GRACE_SECONDS)
+    assert [entry.time for entry in store.entries(path)] == [1002, 1003, 1004]
+    assert len(list((tmp_path / "store" / "objects").iterdir())) == 3
+
+    store.prune(RetentionPolicy(max_age=5), now=1010 + store.GRACE_SECONDS)
+    assert [entry.time for entry in store.entries(path)] == [1004]
+
+    path.write_text("v = 9\n", encoding="utf-8")
+    store.add(path, now=2000)
+    store.prune(RetentionPolicy(max_bytes=0), now=2000 + store.GRACE_SECONDS + 1)
+    assert [entry.time for entry in store.entries(path)] == [2000]
+
+
+def test_size_prune_handles_backups_with_the_same_timestamp(tmp_path):
+    store = BackupStore(tmp_path / "store")
+    paths = [write(tmp_path / f"{name}.toml") for name in ("a", "b")]
+    for i in range(2):
+        for path in paths:
+            path.write_text(f"{path.stem} = {i}\n", encoding="utf-8")
+            store.add(path, now=1000)
+
+    store.prune(RetentionPolicy(max_bytes=0), now=1000 + store.GRACE_SECONDS + 1)
+
+    assert [len(store.entries(path)) for path in paths] == [1, 1]
+
+
+def test_cli_keeps_backups_out_of_the_source_directory(tmp_path):
+    path = write(tmp_path / "pyproject.toml")
+
+    assert main([str(path)]) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".toml_fixer_backups", "cache", "pyproject.toml"]
+    assert main(["--restore", "latest", str(path)]) == 0
+    assert path.read_text(encoding="utf-8") == UNSORTED
@@ -2,34 +2,305 @@
 
 from __future__ import annotations
 
-import shutil
+import argparse
+import bisect
+import functools
+import glob
+import gzip
+import hashlib
+import inspect
+import json
+import os
 import sys
-from collections.abc import Mapping
+import time
+from collections.abc import Hashable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
 
-from tomlkit import TOMLDocument, array, dumps, parse, table
-from tomlkit.items import Array, Item, Table
+import tomlkit
+from tomlkit import TOMLDocument, array, dumps, inline_table, parse, table
+from tomlkit.items import AoT, Array, InlineTable, Item, Null, Table, Whitespace
+
+
+@dataclass
+class FixResult:
+    """Outcome of fixing a single file.
+
+    Attributes:
+        path: File that was processed
+        status: One of "unchanged", "fixed", "needs-fix", "invalid" or "error"
+        elapsed: Processing time in seconds
+        message: Error details, if any
+        backup: Backup written before the file was changed
+        digest: Content hash of the normalized file, when it is known to be normalized
+        cached: True if the file was skipped after a cache hit
+
+    """
+
+    path: Path
+    status: str
+    elapsed: float = 0.0
+    message: str = ""
+    backup: Path | None = None
+    digest: str | None = None
+    cached: bool = False
+
+    @property
+    def failed(self) -> bool:
+        """Return True if the file could not be processed."""
+        return self.status in {"invalid", "error"}
+
+
+class _Shape:
+    """Structural key of a TOML value with its hash computed once."""
+
+    __slots__ = ("_hash", "key")
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self._hash = hash(key)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Shape) and self._hash == other._hash and self.key == other.key
+
+
+def _rebuild_array(original: Array, keep: list[int], values: list[Any]) -> Array:
+    """Build an array of the kept values, reusing the original indentation and commas."""
+    keep_set = set(keep)
+    groups: list[list[Item]] = []
+    last_value, trailing_comma = -1, False
+    index = 0
+    # Array has no public API that keeps per-item formatting, so walk its groups.
+    for group in original._value:  # noqa: SLF001
+        if group.value is None or isinstance(group.value, Null):
+            groups.append(list(group))
+            continue
+        trailing_comma = group.comma is not None
+        if index in keep_set:
+            groups.append([values[index] if part is group.value else part for part in group])
+            last_value = len(groups) - 1
+        index += 1
+
+    if last_value >= 0 and not trailing_comma:
+        groups[last_value] = [
+            part for part in groups[last_value] if not (isinstance(part, Whitespace) and "," in part.s)
+        ]
+    parts = [part for group in groups for part in group]
+    return Array(parts, original.trivia, multiline=original._multiline)  # noqa: SLF001
+
+
+BACKUP_DIR_NAME = ".toml_fixer_backups"
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits applied when pruning a backup store.
+
+    The newest backup of each file is always kept.
+
+    Attributes:
+        keep: Maximum backups kept per file
+        max_age: Backups older than this many seconds are dropped
+        max_bytes: Upper bound on the compressed size of all stored content
+
+    """
+
+    keep: int = 20
+    max_age: float = 30 * 24 * 3600
+    max_bytes: int = 50 * 1024 * 1024
+
+
+@dataclass
+class BackupEntry:
+    """One backup of a file: when it was taken and which content it holds."""
+
+    time: float
+    digest: str
+
+
+@dataclass
+class _BackupIndex:
+    source: str
+    entries: list[BackupEntry] = field(default_factory=list)
+
+
+class BackupStore:
+    """Deduplicating, compressed backups in a dedicated directory.
+
+    Content is stored once per hash as ``objects/<sha256>.gz``. Each source
+    file has its own index of (time, digest) entries in ``index/``, sorted
+    by time so a restore by timestamp is a bisection. Objects and indexes
+    are written to a temporary name and renamed into place.
+
+    Attributes:
+        root: Store directory
+
+    """
+
+    # Unreferenced objects younger than this may belong to a backup another
+    # process is still recording, so pruning leaves them alone.
+    GRACE_SECONDS = 60.0
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    @classmethod
+    def for_file(cls, path: Path, root: Path | None = None) -> BackupStore:
+        """Return the given store, or the default one beside path."""
+        return cls(root if root is not None else Path(path).resolve().parent / BACKUP_DIR_NAME)
+
+    def add(self, path: Path, now: float | None = None) -> Path:
+        """Back up path's current content and return the object holding it."""
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        stamp = time.time() if now is None else now
+        obj = self._object(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(obj, gzip.compress(data, mtime=0))
+        # The object's mtime marks its last use, which the prune grace period relies on.
+        os.utime(obj, (stamp, stamp))
+
+        index = self._load_index(path)
+        if not index.entries or index.entries[-1].digest != digest:
+            index.entries.append(BackupEntry(stamp, digest))
+            self._save_index(index)
+        return obj
+
+    def entries(self, path: Path) -> list[BackupEntry]:
+        """Return the backups of path, oldest first."""
+        return self._load_index(path).entries
+
+    def restore(self, path: Path, when: float | None = None) -> BackupEntry:
+        """Restore the newest backup taken at or before `when` (default: latest).
+
+        The current content is backed up first, so a restore can be undone.
+        """
+        entries = self.entries(path)
+        position = len(entries) if when is None else bisect.bisect_right([e.time for e in entries], when)
+        if position == 0:
+            msg = f"No backup of {path} at or before the requested time"
+            raise RuntimeError(msg)
+        entry = entries[position - 1]
+        data = gzip.decompress(self._object(entry.digest).read_bytes())
+        if Path(path).exists():
+            self.add(path)
+        self._write_atomic(Path(path), data)
+        return entry
+
+    def prune(self, policy: RetentionPolicy, now: float | None = None) -> int:
+        """Apply the retention policy and delete unreferenced objects.
+
+        Returns the number of objects removed.
+        """
+        now = time.time() if now is None else now
+        indexes = self._all_indexes()
+        dirty: set[str] = set()
+        for index in indexes:
+            newest = index.entries[-1:]
+            older = [e for e in index.entries[:-1] if now - e.time <= policy.max_age]
+            older = older[max(len(older) - (policy.keep - 1), 0) :] if policy.keep > 1 else []
+            if len(older) + len(newest) != len(index.entries):
+                index.entries = older + newest
+                dirty.add(index.source)
+
+        sizes = {obj.stem: obj.stat().st_size for obj in self._objects()}
+        referenced = {e.digest for index in indexes for e in index.entries}
+        total = sum(size for digest, size in sizes.items() if digest in referenced)
+        if total > policy.max_bytes:
+            # Drop the oldest non-newest entries across all files until under budget.
+            candidates = sorted(
+                ((e.time, index, e) for index in indexes for e in index.entries[:-1]),
+                key=lambda candidate: candidate[0],
+            )
+            for _time, index, entry in candidates:
+                if total <= policy.max_bytes:
+                    break
+                index.entries.remove(entry)
+                dirty.add(index.source)
+                if not any(entry.digest == e.digest for other in indexes for e in other.entries):
+                    total -= sizes.get(entry.digest, 0)
+            referenced = {e.digest for index in indexes for e in index.entries}
+
+        for index in indexes:
+            if index.source in dirty:
+                self._save_index(index)
+
+        removed = 0
+        for obj in self._objects():
+            if obj.stem not in referenced and now - obj.stat().st_mtime > self.GRACE_SECONDS:
+                obj.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _object(self, digest: str) -> Path:
+        return self.root / "objects" / f"{digest}.gz"
+
+    def _objects(self) -> list[Path]:
+        directory = self.root / "objects"
+        return list(directory.glob("*.gz")) if directory.is_dir() else []
+
+    def _index_path(self, source: str) -> Path:
+        return self.root / "index" / f"{hashlib.sha256(source.encode()).hexdigest()[:24]}.json"
+
+    def _load_index(self, path: Path | str) -> _BackupIndex:
+        source = str(Path(path).resolve())
+        return self._read_index(self._index_path(source)) or _BackupIndex(source)
+
+    @staticmethod
+    def _read_index(index_path: Path) -> _BackupIndex | None:
+        try:
+            state = json.loads(index_path.read_text(encoding="utf-8"))
+            entries = [BackupEntry(float(t), str(d)) for t, d in state["entries"]]
+            return _BackupIndex(str(state["source"]), sorted(entries, key=lambda e: e.time))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _all_indexes(self) -> list[_BackupIndex]:
+        directory = self.root / "index"
+        if not directory.is_dir():
+            return []
+        indexes = [self._read_index(path) for path in sorted(directory.glob("*.json"))]
+        return [index for index in indexes if index is not None and index.entries]
+
+    def _save_index(self, index: _BackupIndex) -> None:
+        target = self._index_path(index.source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        state = {"source": index.source, "entries": [[e.time, e.digest] for e in index.entries]}
+        self._write_atomic(target, json.dumps(state).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(target: Path, data: bytes) -> None:
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
 
 
 class TomlFixer:
     """Main class for fixing and formatting TOML files."""
 
-    def __init__(self, file_path: str | Path) -> None:
-        """Initialize with file path."""
+    def __init__(self, file_path: str | Path, backup_dir: Path | None = None) -> None:
+        """Initialize with file path and an optional backup store directory."""
         self.file_path = Path(file_path)
+        self.backups = BackupStore.for_file(self.file_path, backup_dir)
         self.original_content = ""
         self.doc: TOMLDocument | None = None
+        self.backup_path: Path | None = None
+        self.fixed_content = ""
 
     def create_backup(self) -> Path:
-        """Create a timestamped backup of the file."""
-        timestamp = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
-        backup_path = self.file_path.with_name(
-            f"{self.file_path.stem}_{timestamp}{self.file_path.suffix}",
-        )
-        shutil.copy(self.file_path, backup_path)
-        return backup_path
+        """Record a backup of the file in the backup store."""
+        return self.backups.add(self.file_path)
 
     def read_content(self) -> None:
         """Read file content into memory."""
@@ -51,14 +322,15 @@ class TomlFixer:
             raise RuntimeError(msg) from e
 
     def validate_toml(self) -> bool:
-        """Validate TOML syntax."""
-        try:
-            parsed = parse(self.original_content)
-            return bool(parsed)
-        except Exception as e:
-            error_msg = f"Invalid TOML syntax: {e}"
-            print(error_msg)  # noqa: T201
-            return False
+        """Validate TOML syntax, keeping the parsed document for the fixes."""
+        if self.doc is None:
+            try:
+                self.load_file()
+            except RuntimeError as e:
+                error_msg = f"Invalid TOML syntax: {e.__cause__ or e}"
+                print(error_msg)  # noqa: T201
+                return False
+        return bool(self.doc)
 
     def apply_fixes(self) -> None:
         """Apply all fixes to the TOML document."""
@@ -86,7 +358,6 @@ class TomlFixer:
 
         self._manage_per_file_ignores()
         self._normalize_lists()
-        self._sort_keys_recursive(cast(Item, self.doc))
 
     def _ensure_section(self, path: list[str], defaults: dict[str, Any]) -> None:
         """Ensure configuration section exists with defaults."""
@@ -123,72 +394,115 @@ class TomlFixer:
                 if combined != existing_rules:
                     existing[pattern] = combined  # type: ignore[index]
             else:
-                new_entry = table()
-                new_entry[pattern] = rules  # type: ignore[index]
+                new_entry = inline_table()
+                new_entry[pattern] = sorted(rules)  # type: ignore[index]
                 per_file.append(new_entry)
 
         ruff_table["per-file-ignores"] = per_file  # type: ignore[index]
 
     def _normalize_lists(self) -> None:
-        """Normalize and deduplicate lists."""
-
-        def process_item(item: Item) -> Item:
-            if isinstance(item, Table):
-                new_table = table()
-                for k in sorted(item.keys()):
-                    new_table[k] = process_item(item[k])
-                return new_table
-            if isinstance(item, Array):
-                seen: set[str] = set()
-                new_array = array()
-                for element in item:
-                    processed = process_item(element)
-                    key = dumps(
-                        cast(Mapping[str, Any], processed),
-                        sort_keys=True,
-                    )
-                    if key not in seen:
-                        seen.add(key)
-                        new_array.append(processed)
-                return new_array
-            return item
-
-        if self.doc:
-            processed = process_item(self.doc)
-            self.doc = cast(TOMLDocument, processed)
-
-    def _sort_keys_recursive(self, node: Item) -> None:
-        """Recursively sort dictionary keys."""
-        if isinstance(node, Table):
-            keys: list[str] = sorted(node.keys())
-            for key in keys:
-                self._sort_keys_recursive(node[key])
-                value = node.pop(key)
-                node[key] = value
-        elif isinstance(node, Array):
-            for item in node:
-                self._sort_keys_recursive(item)
-
-    def save_changes(self) -> None:
-        """Save changes with validation."""
+        """Deduplicate arrays and sort nested table keys in one bottom-up pass.
+
+        Every node gets a hashable shape built from its children's shapes
+        (tables key-order independent, arrays in order), so duplicates are
+        found without serializing anything. Arrays are only rebuilt when
+        something in them changed, and tables are only reordered when their
+        keys are out of order. The document's own top-level order is left to
+        save_changes, whose dumps(sort_keys=True) sorts only that level.
+        """
+        if self.doc is not None:
+            self._normalize(self.doc)
+
+    def _normalize(self, item: Any) -> tuple[_Shape, Any]:
+        """Return the structural shape of item and its (possibly rebuilt) replacement."""
+        if isinstance(item, Mapping):
+            entries = []
+            for key in list(item.keys()):
+                child = item[key]
+                shape, new_child = self._normalize(child)
+                if new_child is not child:
+                    item[key] = new_child
+                entries.append((str(key), shape))
+            keys = [entry[0] for entry in entries]
+            entries.sort(key=lambda entry: entry[0])
+            if isinstance(item, TOMLDocument) or keys == [entry[0] for entry in entries]:
+                return _Shape(("table", tuple(entries))), item
+            if isinstance(item, InlineTable):
+                sorted_table = inline_table()
+                sorted_table.update({key: item[key] for key in sorted(item.keys())})
+                return _Shape(("table", tuple(entries))), sorted_table
+            for key in sorted(item.keys()):
+                item[key] = item.pop(key)
+            return _Shape(("table", tuple(entries))), item
+
+        if isinstance(item, (Array, AoT)):
+            seen: set[_Shape] = set()
+            shapes: list[_Shape] = []
+            values: list[Any] = []
+            keep: list[int] = []
+            changed = False
+            for index, child in enumerate(item):
+                shape, new_child = self._normalize(child)
+                changed |= new_child is not child
+                values.append(new_child)
+                if shape not in seen:
+                    seen.add(shape)
+                    shapes.append(shape)
+                    keep.append(index)
+            shape = _Shape(("array", tuple(shapes)))
+            if not changed and len(keep) == len(values):
+                return shape, item
+            if isinstance(item, AoT):
+                return shape, AoT([values[i] for i in keep], name=item.name, parsed=True)
+            return shape, _rebuild_array(item, keep, values)
+
+        value = item.unwrap() if isinstance(item, Item) else item
+        return _Shape((type(item).__name__, value)), item
+
+    def save_changes(self, write: bool = True) -> bool:
+        """Save changes with validation and report whether the file differs.
+
+        With write=False nothing is written; the return value says whether a
+        write would have happened.
+        """
         if self.doc is None:
             raise RuntimeError("No document to save")
 
         new_content = dumps(self.doc, sort_keys=True).strip() + "\n"
+        self.fixed_content = new_content
+        if new_content == self.original_content:
+            return False
 
+        # Only changed output needs a check; unchanged output is the validated input.
         try:
             parse(new_content)
         except Exception as e:
             msg = f"Generated invalid TOML: {e}"
             raise RuntimeError(msg) from e
 
-        if new_content != self.original_content:
-            backup = self.create_backup()
-            print(f"Created backup at {backup}")  # noqa: T201
+        if write:
+            self.backup_path = self.create_backup()
             self.file_path.write_text(new_content, encoding="utf-8")
-            print("Changes applied successfully!")  # noqa: T201
-        else:
-            print("No changes required.")  # noqa: T201
+        return True
+
+    def fix(self, check: bool = False) -> FixResult:
+        """Run the fixing process without printing or exiting."""
+        start = time.perf_counter()
+        result = FixResult(self.file_path, "unchanged")
+        try:
+            self.read_content()
+            self.load_file()
+            self.apply_fixes()
+            if self.save_changes(write=not check):
+                result.status = "needs-fix" if check else "fixed"
+                result.backup = self.backup_path
+            if result.status != "needs-fix":
+                result.digest = content_digest(self.fixed_content)
+        except RuntimeError as e:
+            result.status = "invalid" if self.doc is None and self.original_content else "error"
+            result.message = str(e)
+        result.elapsed = time.perf_counter() - start
+        return result
 
     def run(self) -> None:
         """Execute full fixing process."""
@@ -197,26 +511,321 @@ class TomlFixer:
             if not self.validate_toml():
                 return
 
-            self.load_file()
             self.apply_fixes()
-            self.save_changes()
+            if self.save_changes():
+                print(f"Created backup at {self.backup_path}")  # noqa: T201
+                print("Changes applied successfully!")  # noqa: T201
+            else:
+                print("No changes required.")  # noqa: T201
 
         except RuntimeError as e:
             print(f"Error: {e}", file=sys.stderr)  # noqa: T201
             sys.exit(1)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print(  # noqa: T201
-            "Usage: python toml_fixer.py <file.toml>",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+CACHE_VERSION = 1
+
+
+def content_digest(text: str) -> str:
+    """Return the hash the skip cache stores for a file's text."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@functools.cache
+def rule_version() -> str:
+    """Hash the code that decides a file's fixed output.
+
+    Editing any of these rules, or upgrading tomlkit, changes the version and
+    so invalidates every cache entry without a manual bump.
+    """
+    h = hashlib.sha256(f"{CACHE_VERSION}\x00{tomlkit.__version__}".encode())
+    rules = (
+        TomlFixer.apply_fixes,
+        TomlFixer._ensure_section,  # noqa: SLF001
+        TomlFixer._manage_per_file_ignores,  # noqa: SLF001
+        TomlFixer._normalize_lists,  # noqa: SLF001
+        TomlFixer._normalize,  # noqa: SLF001
+        TomlFixer.save_changes,
+        _Shape,
+        _rebuild_array,
+    )
+    for rule in rules:
+        try:
+            source = inspect.getsource(rule)
+        except (OSError, TypeError):
+            source = Path(__file__).read_text(encoding="utf-8")
+        h.update(source.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def default_cache_path() -> Path:
+    """Return the skip cache location in the user cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "toml_fixer" / "cache.json"
+
+
+class FixCache:
+    """Persistent record of files already normalized by the current rules.
+
+    Entries map a resolved path to the content hash it had after its last
+    successful fix. The whole store is dropped when the rule version changes.
+
+    Attributes:
+        path: Cache file location
+        rules: Rule version the entries were produced with
+        entries: Resolved file path mapped to content hash
+
+    """
+
+    def __init__(self, path: Path, rules: str | None = None) -> None:
+        self.path = Path(path)
+        self.rules = rules or rule_version()
+        self.entries: dict[str, str] = {}
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def is_clean(self, path: Path, digest: str) -> bool:
+        """Return True if path is known to be normalized at this content hash."""
+        return self.entries.get(self._key(path)) == digest
+
+    def record(self, path: Path, digest: str) -> None:
+        """Remember that path is normalized at this content hash."""
+        key = self._key(path)
+        if self.entries.get(key) != digest:
+            self.entries[key] = digest
+            self._dirty = True
+
+    def forget(self, path: Path) -> None:
+        """Drop the entry for path."""
+        if self.entries.pop(self._key(path), None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if it changed; failures are ignored."""
+        if not self._dirty:
+            return
+        state = {"version": CACHE_VERSION, "rules": self.rules, "files": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._dirty = False
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(state, dict) and state.get("version") == CACHE_VERSION and state.get("rules") == self.rules:
+            files = state.get("files")
+            if isinstance(files, dict):
+                self.entries = {str(k): str(v) for k, v in files.items()}
+
+
+def fix_file(path: Path, check: bool = False, backup_dir: Path | None = None) -> FixResult:
+    """Fix one file; module-level so it can run in a process pool."""
+    try:
+        return TomlFixer(path, backup_dir).fix(check=check)
+    except Exception as e:  # pylint: disable=broad-except
+        return FixResult(Path(path), "error", message=f"Critical error: {e}")
+
+
+def expand_paths(patterns: Iterable[str]) -> list[Path]:
+    """Expand file paths and glob patterns, dropping duplicates."""
+    paths: dict[Path, None] = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            paths.setdefault(Path(match), None)
+    return list(paths)
+
+
+def fix_files(
+    paths: list[Path],
+    check: bool = False,
+    jobs: int | None = None,
+    cache: FixCache | None = None,
+    backup_dir: Path | None = None,
+) -> list[FixResult]:
+    """Fix many files, in a process pool when there is more than one.
+
+    With a cache, files whose content hash is already recorded are skipped
+    without parsing, and the outcome of every processed file updates it.
+    """
+    results: dict[int, FixResult] = {}
+    pending: list[int] = []
+    for index, path in enumerate(paths):
+        if cache is not None:
+            start = time.perf_counter()
+            try:
+                digest = content_digest(Path(path).read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                digest = None
+            if digest is not None and cache.is_clean(path, digest):
+                results[index] = FixResult(
+                    Path(path), "unchanged", time.perf_counter() - start, digest=digest, cached=True
+                )
+                continue
+        pending.append(index)
+
+    todo = [paths[index] for index in pending]
+    jobs = jobs or os.cpu_count() or 1
+    if len(todo) <= 1 or jobs == 1:
+        done = [fix_file(path, check, backup_dir) for path in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            chunksize = max(1, len(todo) // (jobs * 4))
+            done = list(pool.map(fix_file, todo, [check] * len(todo), [backup_dir] * len(todo), chunksize=chunksize))
+
+    for index, result in zip(pending, done):
+        results[index] = result
+        if cache is not None:
+            if result.digest is not None:
+                cache.record(result.path, result.digest)
+            else:
+                cache.forget(result.path)
+    return [results[index] for index in range(len(paths))]
+
+
+def prune_backups(results: list[FixResult], policy: RetentionPolicy, backup_dir: Path | None = None) -> None:
+    """Apply the retention policy to every store that received a backup."""
+    roots = {BackupStore.for_file(result.path, backup_dir).root for result in results if result.backup}
+    for root in sorted(roots):
+        BackupStore(root).prune(policy)
+
 
+def parse_timestamp(value: str) -> float:
+    """Parse a restore time given as YYYYmmddHHMMSS (UTC) or ISO 8601."""
+    try:
+        moment = datetime.strptime(value, "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError as e:
+            msg = f"invalid timestamp: {value!r}"
+            raise argparse.ArgumentTypeError(msg) from e
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def restore_files(paths: list[Path], when: float | None, backup_dir: Path | None = None) -> int:
+    """Restore each file from its backup store; returns the exit code."""
+    code = 0
+    for path in paths:
+        try:
+            entry = BackupStore.for_file(path, backup_dir).restore(path, when)
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}", file=sys.stderr)  # noqa: T201
+            code = 1
+            continue
+        taken = datetime.fromtimestamp(entry.time, tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        print(f"Restored {path} from backup {taken}")  # noqa: T201
+    return code
+
+
+def print_summary(results: list[FixResult], elapsed: float) -> None:
+    """Print one line per file and the totals."""
+    for result in results:
+        line = f"{result.status:10} {result.elapsed * 1000:8.1f} ms  {result.path}"
+        if result.message:
+            line += f"  ({result.message})"
+        if result.backup:
+            line += f"  [backup: {result.backup}]"
+        if result.cached:
+            line += "  [cached]"
+        print(line, file=sys.stderr if result.failed else sys.stdout)  # noqa: T201
+
+    counts: dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    totals = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{len(results)} file(s) in {elapsed:.2f}s: {totals}")  # noqa: T201
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(description="Fix and normalize TOML files")
+    parser.add_argument("paths", nargs="+", help="TOML files or glob patterns (** is recursive)")
+    parser.add_argument("--check", action="store_true", help="Report files that need fixing without writing")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Process every file instead of skipping ones recorded in {default_cache_path()}",
+    )
+    backups = parser.add_argument_group("backups")
+    backups.add_argument(
+        "--backup-dir",
+        type=Path,
+        default=None,
+        help=f"Backup store directory (default: {BACKUP_DIR_NAME} beside each file)",
+    )
+    backups.add_argument("--backup-keep", type=int, default=RetentionPolicy.keep, help="Backups kept per file")
+    backups.add_argument(
+        "--backup-max-age",
+        type=float,
+        default=RetentionPolicy.max_age / 86400,
+        help="Drop backups older than this many days",
+    )
+    backups.add_argument(
+        "--backup-max-mb",
+        type=float,
+        default=RetentionPolicy.max_bytes / 2**20,
+        help="Compressed size limit of each backup store",
+    )
+    backups.add_argument(
+        "--restore",
+        metavar="TIME",
+        help="Restore files from their newest backup at or before TIME (latest, YYYYmmddHHMMSS UTC or ISO 8601)",
+    )
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No files matched.", file=sys.stderr)  # noqa: T201
+        return 1
+
+    if args.restore is not None:
+        try:
+            when = None if args.restore == "latest" else parse_timestamp(args.restore)
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        return restore_files(paths, when, args.backup_dir)
+
+    start = time.perf_counter()
+    cache = None if args.no_cache else FixCache(default_cache_path())
+    results = fix_files(paths, check=args.check, jobs=args.jobs, cache=cache, backup_dir=args.backup_dir)
+    if cache is not None:
+        cache.save()
+    policy = RetentionPolicy(
+        keep=args.backup_keep,
+        max_age=args.backup_max_age * 86400,
+        max_bytes=int(args.backup_max_mb * 2**20),
+    )
+    prune_backups(results, policy, args.backup_dir)
+    print_summary(results, time.perf_counter() - start)
+
+    if any(result.failed for result in results):
+        return 1
+    if args.check and any(result.status == "needs-fix" for result in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
     try:
-        fixer = TomlFixer(sys.argv[1])
-        fixer.run()
+        sys.exit(main())
     except Exception as e:  # pylint: disable=broad-except
         print(f"Critical error: {e}", file=sys.stderr)  # noqa: T201
         sys.exit(2)